@@ -3,7 +3,6 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 
-from core.antispam import rate_limit_check
 from database import Database
 from util.embeds import ErrorEmbed, PaginatedTextTableEmbed
 from util.guilds import guild_names_from_tags
@@ -23,7 +22,6 @@ class AvgCog(commands.Cog):
         guilds="Filter by guild tags (comma-separated)",
         range="Number of days ago, or a range like '0,7'",
     )
-    @rate_limit_check()
     async def average(
         self,
         interaction: discord.Interaction,
@@ -3,7 +3,6 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 
-from core.antispam import rate_limit_check
 from core.settings import SettingsManager
 from database import Database
 from util.embeds import ErrorEmbed, PaginatedTextTableEmbed
@@ -30,7 +29,6 @@ class Coolness(commands.Cog):
         app_commands.Choice(name="Ascending", value="ASC"),
         app_commands.Choice(name="Descending", value="DESC"),
     ])
-    @rate_limit_check()  # Anti-spam check to limit how often this command can be run
     @app_commands.guild_only() # Make sure this command is only ran inside servers due to its reliance on interaction.guild.id
     async def coolness(
         self,
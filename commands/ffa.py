@@ -1,9 +1,10 @@
 import discord, os
 
 from discord.ext import commands
-from discord import app_commands, File
+from discord import app_commands
 
 from core.config import config
+from util.attachments import CachedAttachment
 
 FFA_MAPS_DIR = "assets/ffa_maps"
 
@@ -63,21 +64,20 @@ class FFAMapSelect(discord.ui.Select):
             return await interaction.response.send_message("Map not found.", ephemeral=True)
 
         label = format_label(selected_file)
-        # Open the map file in binary mode to send as attachment
+        # Read the map file, it is only uploaded if it wasn't uploaded recently
         with open(file_path, "rb") as f:
-            file = File(f, filename=selected_file)
+            image = CachedAttachment(f.read(), selected_file)
 
         embed = discord.Embed(
             title=f"{label} FFA Map",
             color=discord.Color.blue()
         )
-        # Set embed image to the attached file
-        embed.set_image(url=f"attachment://{selected_file}")
-
-        # Edit original message with the new embed and attachment, keep the dropdown visible
-        await interaction.response.edit_message(
+        # Edit original message with the new embed and attachment (or the earlier upload), keep the dropdown visible
+        await image.send(
+            interaction.response.edit_message,
             embed=embed,
-            attachments=[file],
+            edit=True,
+            interaction=interaction,
             view=self.view
         )
 
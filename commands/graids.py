@@ -3,12 +3,13 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 
-from core.antispam import rate_limit_check
 from database import Database
-from util.board import BoardView, build_board
-from util.embeds import ErrorEmbed, TextTableEmbed
+from util.board import BoardView
+from util.embeds import ErrorEmbed
 from util.guilds import guild_names_from_tags
-from util.ranges import get_range_from_string, range_alt
+from util.pagination import ListPageSource
+from util.ranges import get_range_from_string
+from util.results import result_key, shared_result
 
 
 
@@ -29,7 +30,6 @@ class GRaids(commands.Cog):
         players="Filter by player usernames (comma-separated)",
         guild_wise="Show raid totals per guild instead of individual players"
     )
-    @rate_limit_check()
     async def graids(
         self,
         interaction: discord.Interaction,
@@ -57,6 +57,7 @@ class GRaids(commands.Cog):
             return await interaction.followup.send(embed=ErrorEmbed("You cannot use `players` and `guilds` together."))
 
         # Convert the range input to start/end timestamps; no max limit
+        range_input = range
         range = await get_range_from_string(range, max_allowed_range=None)
 
         if not range:
@@ -144,47 +145,37 @@ FROM (
 
         # Fill in the template SQL with dynamic WHERE clauses
         query = template_query.format(**template_query_params)
-        # Execute query with all parameters
-        result = await Database.fetch(query, prepared_params)
 
-        if not result:
-            return await interaction.followup.send(embed=ErrorEmbed("No results for the specified parameters."), ephemeral=True)
+        async def load() -> ListPageSource | None:
+            # Execute query with all parameters
+            result = await Database.fetch(query, prepared_params)
+            if not result:
+                return None
+
+            # Prepare rows for the leaderboard display: [Name/Guild, Raid Count]
+            return ListPageSource([[
+                row["guild" if guild_wise else "name"],
+                str(row["raid_cnt"])
+            ] for row in result], 10)
+
+        # Identical invocations share the query and the rendered pages, the range is keyed as typed
+        key = result_key(interaction, guilds=guilds, range=range_input, players=players, guild_wise=guild_wise)
+        source = await shared_result(key, load)
 
-        # Prepare rows for the leaderboard display: [Name/Guild, Raid Count]
-        rows = [[
-            row["guild" if guild_wise else "name"],
-            str(row["raid_cnt"])
-        ] for row in result]
+        if not source:
+            return await interaction.followup.send(embed=ErrorEmbed("No results for the specified parameters."), ephemeral=True)
 
         # Create a BoardView for interactive paging
         view = BoardView(
             interaction.user.id,
-            rows,
+            source,
             title="Raids",
             stat_counter="Raids",
             is_guild_board=guild_wise
         )
 
-        if view.is_fancy:
-            # If user prefers fancy board, send as an image file with the interactive view
-            board = await build_board(view.data, view.page, is_guild_board=guild_wise)
-            await interaction.followup.send(view=view, file=board)
-        else:
-            # Otherwise send as a simple embed with text table and navigation buttons
-            start = view.page * 10
-            end = start + 10
-            sliced = view.data[start:end]
-
-            for i in range_alt(len(sliced)):
-                sliced[i] = [f"{i+start+1}.", sliced[i][0], sliced[i][1]]
-
-            embed = TextTableEmbed(
-                ["Rank", "Name", "Raids"],
-                sliced,
-                title=view.title,
-                color=0x333333
-            )
-            await interaction.followup.send(embed=embed, view=view)
+        # Image board or text embed table depending on user preferences
+        await view.send_to(interaction)
 
 
 
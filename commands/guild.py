@@ -3,13 +3,11 @@ import discord, datetime
 from discord.ext import commands
 from discord import app_commands
 
-from core.antispam import rate_limit_check
 from database import Database
 from core.settings import SettingsManager
 from util.embeds import ErrorEmbed, TextTableEmbed, PaginatedTextTableEmbed, PaginatedFieldedTextTableEmbed
-from util.guilds import guild_name_from_tag
+from util.guilds import get_guild_data
 from util.mappings import RANK_SYMBOL_MAP
-from util.requests import request
 
 
 
@@ -18,23 +16,18 @@ async def get_data(guild: str, interaction: discord.Interaction):
     Fetch guild data from the Wynncraft API.
 
     If no guild is provided, fetches default guild info set for the discord server settings.
-    Attempts to resolve guild names and prefixes for accurate API querying.
+    Lookups go through the shared guild data cache, so back-to-back subcommands reuse one fetch.
     """
     if not guild:
-        guild_name = SettingsManager("guild", interaction.guild.id).get("guild_name")
-        guild_tag = SettingsManager("guild", interaction.guild.id).get("guild_tag")
+        settings = SettingsManager("guild", interaction.guild.id)
+        guild_name = settings.get("guild_name")
+        guild_tag = settings.get("guild_tag")
 
         if not (guild_name and guild_tag):
             return "warn"  # Warn caller that default guild info is missing
-        return await request(f"https://api.wynncraft.com/v3/guild/{guild_name}")
+        return await get_guild_data(guild_name)
 
-    name = await guild_name_from_tag(guild) or guild
-    res = await request(f"https://api.wynncraft.com/v3/guild/{name}")
-    if not res:
-        # Try querying by prefix if guild name lookup failed
-        res = await request(f"https://api.wynncraft.com/v3/guild/prefix/{guild}")
-
-    return res
+    return await get_guild_data(guild)
 
 
 async def get_online(data):
@@ -87,7 +80,6 @@ class GuildCommands(commands.GroupCog, name="guild"):
 
     @app_commands.command(name="overview", description="View basic guild info")
     @app_commands.describe(guild="The guild name or prefix of the target guild")
-    @rate_limit_check()
     @app_commands.guild_only() # Make sure this command is only ran inside servers due to its reliance on interaction.guild.id
     async def overview(self, interaction: discord.Interaction, guild: str = None):
         """
@@ -146,7 +138,6 @@ Created: {datetime.datetime.fromisoformat(data["created"][:-1]).strftime("%m/%d/
 
     @app_commands.command(name="members", description="View a list of all players in a guild")
     @app_commands.describe(guild="The guild name or prefix of the target guild")
-    @rate_limit_check()
     @app_commands.guild_only() # Make sure this command is only ran inside servers due to its reliance on interaction.guild.id
     async def members(self, interaction: discord.Interaction, guild: str = None):
         """
@@ -185,7 +176,6 @@ Created: {datetime.datetime.fromisoformat(data["created"][:-1]).strftime("%m/%d/
 
     @app_commands.command(name="gxp", description="View the GXP contributions of each player in a guild")
     @app_commands.describe(guild="The guild name or prefix of the target guild")
-    @rate_limit_check()
     @app_commands.guild_only() # Make sure this command is only ran inside servers due to its reliance on interaction.guild.id
     async def gxp(self, interaction: discord.Interaction, guild: str = None):
         """
@@ -229,7 +219,6 @@ Created: {datetime.datetime.fromisoformat(data["created"][:-1]).strftime("%m/%d/
         app_commands.Choice(name="Ascending", value="asc"),
         app_commands.Choice(name="Descending", value="desc")
     ])
-    @rate_limit_check()
     @app_commands.guild_only() # Make sure this command is only ran inside servers due to its reliance on interaction.guild.id
     async def activity(self, interaction: discord.Interaction, guild: str = None, order: app_commands.Choice[str] = "desc"):
         """
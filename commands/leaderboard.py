@@ -1,19 +1,22 @@
-import discord, logging
+import discord
 from discord import app_commands
 from discord.ext import commands
 
-from core.antispam import rate_limit_check
-from database import Database
-from util.board import BoardView, build_board
-from util.embeds import ErrorEmbed, TextTableEmbed
+from util.board import BoardView
+from util.embeds import ErrorEmbed
+from util.pagination import KeysetPageSource, ListPageSource
 from util.ranges import get_current_season
 from util.requests import request
+from util.results import result_key, shared_result
 from util.uuid import get_name_from_uuid
 
 
 LEADERBOARD_STATS = ["sand_swept_tomb", "galleons_graveyard", "firstjoin", "scribing", "chests_found", "woodcutting", "tailoring", "fishing", "eldritch_outlook", "alchemism", "logins", "deaths", "corrupted_decrepit_sewers", "armouring", "corrupted_undergrowth_ruins", "items_identified", "nest_of_the_grootslangs", "blocks_walked", "lost_sanctuary", "mining", "the_canyon_colossus", "undergrowth_ruins", "corrupted_ice_barrows", "jeweling", "woodworking", "uuid", "underworld_crypt", "fallen_factory", "mobs_killed", "infested_pit", "decrepit_sewers", "corrupted_sand_swept_tomb", "corrupted_infested_pit", "farming", "corrupted_lost_sanctuary", "cooking", "guild", "combat", "weaponsmithing", "playtime", "corrupted_underworld_crypt", "ice_barrows", "nexus_of_light", "guild_rank", "the_nameless_anomaly", "raids", "corrupted_galleons_graveyard", "timelost_sanctum", "dungeons"]
 LEADERBOARD_STAT_NAMES = ["Sand-Swept Tomb Completions", "Galleon's Graveyard Completions", "First Join Date", "Scribing Level", "Chests Found", "Woodcutting Level", "Tailoring Level", "Fishing Level", "Eldritch Outlook Completions", "Alchemism Level", "Total Logins", "Total Deaths", "Corrupted Decrepit Sewers Completions", "Armouring Level", "Corrupted Undergrowth Ruins Completions", "Total Items Identified", "Nest Of The Grootslangs Completions", "Total Blocks Walked", "Lost Sanctuary Completions", "Mining Level", "The Canyon Colossus Completions", "Undergrowth Ruins Completions", "Corrupted Ice Barrows Completions", "Jeweling Level", "Woodworking Level", "UUID", "Underworld Crypt Completions", "Fallen Factory Completions", "Total Mobs Killed", "Infested Pit Completions", "Decrepit Sewers Completions", "Corrupted Sand-Swept Tomb Completions", "Corrupted Infested Pit Completions", "Farming Level", "Corrupted Lost Sanctuary Completions", "Cooking Level", "Guild", "Combat", "Weaponsmithing Level", "Total Playtime", "Corrupted Underworld Crypt Completions", "Ice Barrows Completions", "Nexus Of Light Completions", "Guild rank", "The Nameless Anomaly Completions", "Total raid Completions", "Corrupted Galleons Graveyard Completions", "Timelost Sanctum Completions", "Total Dungeon Completions"]
 
+# Deepest leaderboard page that can be shown (10 players per page), the top 50 like before paging
+LEADERBOARD_MAX_PAGES = 5
+
 STATS = {
     "dungeons": {
         "stats": [
@@ -92,69 +95,59 @@ class Leaderboard(commands.GroupCog, name="leaderboard"):
         else:
             return await interaction.followup.send(embed=ErrorEmbed("Invalid statistic"))
 
-        try:
-            # Handle combined raid stat by summing several columns
-            if statistic == "raids":
-                res = await Database.fetch(
-                    "SELECT uuid_name.name, uuid_name.uuid, "
-                    "player_stats.the_canyon_colossus + player_stats.nexus_of_light + "
-                    "player_stats.the_nameless_anomaly + player_stats.nest_of_the_grootslangs as total "
-                    "FROM player_stats LEFT JOIN uuid_name ON uuid_name.uuid=player_stats.uuid "
-                    "ORDER BY total DESC LIMIT 50"
-                )
-            # Handle combined dungeon stat via a large summed query
-            elif statistic == "dungeons":
-                res = await Database.fetch(
-                    "SELECT uuid_name.name, uuid_name.uuid, "
-                    "player_stats.decrepit_sewers + player_stats.corrupted_decrepit_sewers + "
-                    "player_stats.infested_pit + player_stats.corrupted_infested_pit + "
-                    "player_stats.corrupted_underworld_crypt + player_stats.underworld_crypt + "
-                    "player_stats.lost_sanctuary + player_stats.corrupted_lost_sanctuary + "
-                    "player_stats.ice_barrows + player_stats.corrupted_ice_barrows + "
-                    "player_stats.corrupted_undergrowth_ruins + player_stats.undergrowth_ruins + "
-                    "player_stats.corrupted_galleons_graveyard + player_stats.galleons_graveyard + "
-                    "player_stats.fallen_factory + player_stats.eldritch_outlook + "
-                    "player_stats.corrupted_sand_swept_tomb + player_stats.sand_swept_tomb + "
-                    "player_stats.timelost_sanctum as total "
-                    "FROM player_stats LEFT JOIN uuid_name ON uuid_name.uuid=player_stats.uuid "
-                    "ORDER BY total DESC LIMIT 50"
-                )
-            else:
-                # Simple stat query for individual stats
-                res = await Database.fetch(
-                    f"SELECT uuid_name.name, uuid_name.uuid, player_stats.{statistic} as total "
-                    f"FROM player_stats LEFT JOIN uuid_name ON uuid_name.uuid=player_stats.uuid "
-                    f"ORDER BY {statistic} DESC LIMIT 50"
-                )
-            # Prepare results: fallback to UUID lookup if name is None
-            stats = [(m["name"] or await get_name_from_uuid(m["uuid"]), m["total"]) for m in res]
-        except Exception as e:
-            return await interaction.followup.send(f"Error retrieving leaderboard: {e}", ephemeral=True)
-
-        # Create a BoardView for the leaderboard, which supports pagination and formatting
-        view = BoardView(interaction.user.id, stats, title=f"Leaderboard for {STATS[category]['names'][stat_index]}")
-
-        # Use fancy image-based board based on user preferences, otherwise fallback to embed text table
-        if view.is_fancy:
-            board = await build_board(view.data, view.page)
-            await interaction.followup.send(view=view, file=board)
+        # Handle combined raid and dungeon stats by summing several columns
+        if statistic == "raids":
+            total = (
+                "player_stats.the_canyon_colossus + player_stats.nexus_of_light + "
+                "player_stats.the_nameless_anomaly + player_stats.nest_of_the_grootslangs"
+            )
+        elif statistic == "dungeons":
+            total = (
+                "player_stats.decrepit_sewers + player_stats.corrupted_decrepit_sewers + "
+                "player_stats.infested_pit + player_stats.corrupted_infested_pit + "
+                "player_stats.corrupted_underworld_crypt + player_stats.underworld_crypt + "
+                "player_stats.lost_sanctuary + player_stats.corrupted_lost_sanctuary + "
+                "player_stats.ice_barrows + player_stats.corrupted_ice_barrows + "
+                "player_stats.corrupted_undergrowth_ruins + player_stats.undergrowth_ruins + "
+                "player_stats.corrupted_galleons_graveyard + player_stats.galleons_graveyard + "
+                "player_stats.fallen_factory + player_stats.eldritch_outlook + "
+                "player_stats.corrupted_sand_swept_tomb + player_stats.sand_swept_tomb + "
+                "player_stats.timelost_sanctum"
+            )
         else:
-            start = view.page * 10
-            end = start + 10
-            sliced = view.data[start:end]
+            # Simple stat query for individual stats
+            total = f"player_stats.{statistic}"
+
+        async def format_rows(records: list[dict]) -> list[tuple]:
+            # Fallback to UUID lookup if name is None
+            return [(r["name"] or await get_name_from_uuid(r["uuid"]), r["total"]) for r in records]
+
+        async def load() -> KeysetPageSource:
+            # Pages are queried as they are shown instead of loading the whole leaderboard up front.
+            # Players without a value for the stat are left out: they only ever trailed the board, and
+            # NULL keys can't be compared to continue a page after them.
+            return KeysetPageSource(
+                f"uuid_name.name, player_stats.uuid, {total} AS total",
+                f"player_stats LEFT JOIN uuid_name ON uuid_name.uuid=player_stats.uuid WHERE {total} IS NOT NULL",
+                keys=[(total, "total"), ("player_stats.uuid", "uuid")],
+                format_rows=format_rows,
+                max_pages=LEADERBOARD_MAX_PAGES,
+            )
 
-            # Add rank numbering for display
-            for i in range(len(sliced)):
-                sliced[i] = [f"{i+start+1}.", sliced[i][0], sliced[i][1]]
+        # Identical invocations share the source, so its pages are queried and rendered once
+        source = await shared_result(result_key(interaction, statistic=statistic), load)
 
-            embed = TextTableEmbed(["Rank", "Name", "Value"], sliced, title=view.title, color=0x333333)
-            await interaction.followup.send(embed=embed, view=view)
+        # Create a BoardView for the leaderboard, which supports pagination and formatting
+        view = BoardView(interaction.user.id, source, title=f"Leaderboard for {STATS[category]['names'][stat_index]}")
+
+        # Use fancy image-based board based on user preferences, otherwise fallback to embed text table.
+        # Failures (busy render pool, deadline...) are reported by the error handler.
+        await view.send_to(interaction)
 
 
 
     @app_commands.command(name="dungeons", description="Dungeon leaderboards")
     @app_commands.describe(stat="Choose a dungeon to see its leaderboard")
-    @rate_limit_check()
     async def leaderboard_dungeons(self, interaction: discord.Interaction, stat: str):
         """Show dungeon leaderboard for a chosen dungeon stat."""
         await self.display_leaderboard(interaction, "dungeons", stat)
@@ -167,7 +160,6 @@ class Leaderboard(commands.GroupCog, name="leaderboard"):
 
     @app_commands.command(name="raids", description="Raid leaderboards")
     @app_commands.describe(stat="Choose a raid to see its leaderboard")
-    @rate_limit_check()
     async def leaderboard_raids(self, interaction: discord.Interaction, stat: str):
         """Show raid leaderboard for a chosen raid stat."""
         await self.display_leaderboard(interaction, "raids", stat)
@@ -180,7 +172,6 @@ class Leaderboard(commands.GroupCog, name="leaderboard"):
 
     @app_commands.command(name="professions", description="Profession leaderboards")
     @app_commands.describe(stat="Choose a profession to see its leaderboard")
-    @rate_limit_check()
     async def leaderboard_professions(self, interaction: discord.Interaction, stat: str):
         """Show profession leaderboard for a chosen profession stat."""
         await self.display_leaderboard(interaction, "professions", stat)
@@ -193,7 +184,6 @@ class Leaderboard(commands.GroupCog, name="leaderboard"):
 
     @app_commands.command(name="player_stats", description="General player stat leaderboards")
     @app_commands.describe(stat="Choose a player stat to see its leaderboard")
-    @rate_limit_check()
     async def leaderboard_misc(self, interaction: discord.Interaction, stat: str):
         """Show leaderboard for general player stats."""
         await self.display_leaderboard(interaction, "player_stats", stat)
@@ -205,7 +195,6 @@ class Leaderboard(commands.GroupCog, name="leaderboard"):
 
 
     @app_commands.command(name="season_rating", description="Guild Season rating leaderboard")
-    @rate_limit_check()
     async def season_ratings(self, interaction: discord.Interaction):
         """
         Fetch and display the guild season rating leaderboard.
@@ -222,52 +211,40 @@ class Leaderboard(commands.GroupCog, name="leaderboard"):
 
         season_num = season[6:]  # Strip prefix to get season number (like "season26" -> "26")
 
-        # Fetch data from SR API
-        res = await request("https://nori.fish/api/database/guild")
-        if not res:
-            return await interaction.followup.send(embed=ErrorEmbed("Could not fetch season rating data."))
+        async def load() -> ListPageSource | None:
+            # Fetch data from SR API
+            res = await request("https://nori.fish/api/database/guild")
+            if not res:
+                return None
 
-        ratings = []
-        # Convert to list of (guild_name, rating) and sort descending by rating
-        for guild, data in res.items():
-            ratings.append({
-                "guild": data.get("name", "Unknown Guild"),
-                "rating": data.get("sr", 0)
-            })
+            ratings = []
+            # Convert to list of (guild_name, rating) and sort descending by rating
+            for guild, data in res.items():
+                ratings.append({
+                    "guild": data.get("name", "Unknown Guild"),
+                    "rating": data.get("sr", 0)
+                })
 
-        ratings.sort(key=lambda x: x["rating"], reverse=True)
+            ratings.sort(key=lambda x: x["rating"], reverse=True)
 
-        #format rows and use , to separate thousands for better readability
-        rows = [(r["guild"], f"{r['rating']:,}") for r in ratings]
+            #format rows and use , to separate thousands for better readability
+            return ListPageSource([(r["guild"], f"{r['rating']:,}") for r in ratings], 10)
+
+        source = await shared_result(result_key(interaction, season=season), load)
+        if not source:
+            return await interaction.followup.send(embed=ErrorEmbed("Could not fetch season rating data."))
 
         # Create a guild leaderboard BoardView with headers
         view = BoardView(
             interaction.user.id,
-            rows,
+            source,
             title=f"Season Rating Leaderboard for Season {season_num}",
             is_guild_board=True,
             headers=["Guild", "Rating"]
         )
 
-        # Use fancy image board based on user preferences or fallback to text embed table
-        if view.is_fancy:
-            board = await build_board(view.data, view.page, is_guild_board=True)
-            await interaction.followup.send(view=view, file=board)
-        else:
-            start = view.page * 10
-            end = start + 10
-            sliced = view.data[start:end]
-
-            for i in range(len(sliced)):
-                sliced[i] = [f"{i+start+1}.", sliced[i][0], sliced[i][1]]
-
-            embed = TextTableEmbed(
-                ["Rank", "Guild", "Rating"], 
-                sliced, 
-                title=view.title, 
-                color=0x333333
-            )
-            await interaction.followup.send(embed=embed, view=view)
+        # Image board or text embed table depending on user preferences
+        await view.send_to(interaction)
 
 
 async def setup(bot: commands.Bot):
@@ -1,18 +1,16 @@
-import discord, json, logging, io
+import discord
 
 from discord import app_commands
 from discord.ext import commands
-from PIL import Image, ImageDraw, ImageFont
 
-from core.antispam import rate_limit_check
+from core.render_pool import RenderPool
 from util.embeds import ErrorEmbed
+from util.attachments import CachedAttachment
+from util.encoding import file_name
 from util.guilds import guild_names_from_tags
-from util.requests import request
+from util.map_render import map_regions, MapDataError, MapEngine, SharedMapLayers
 
 
-with open("assets/map_regions.json") as f:
-    map_regions = json.load(f)
-
 zone_label_to_key = {data["label"].lower(): key for key, data in map_regions.items()}
 
 
@@ -29,45 +27,8 @@ class Map(commands.Cog):
         return zone_label_to_key.get(zone_lower)
 
 
-    def to_full_map_coord(self, x_ingame, y_ingame, map_width, map_height):
-        # This is from the linear mapping crossing the two extreme points on the map.
-        # Ex: x: -2480 to 1650 (x_neg_ingame to x_pos_ingame)
-        # x_canvas = 0 + ((map_width - 1) - 0) / (x_pos_ingame - x_neg_ingame)) * (x_ingame - x_neg_ingame)
-        x_canvas = (x_ingame + 2480) * (map_width - 1) / 4130
-        y_canvas = (y_ingame + 6578) * (map_height - 1) / 6419
-        return x_canvas, y_canvas
-
-
-    def draw_text_with_outline(self, draw, position, text, font, fill, outline_color=(0, 0, 0), outline_width=1):
-        x, y = position
-        y_pad = -2  # Adjust vertical position for alignment
-        # Draw outline by drawing text shifted in all surrounding pixels except center
-        for dx in range(-outline_width, outline_width + 1):
-            for dy in range(-outline_width, outline_width + 1):
-                if dx != 0 or dy != 0:
-                    draw.text((x + dx, y + dy + y_pad), text, font=font, fill=outline_color)
-        # Draw main text on top
-        draw.text((x, y + y_pad), text, font=font, fill=fill)
-
-    def hex_to_rgb(self, hex_color, fallback=(136, 136, 136)):
-        try:
-            hex_color = hex_color.lstrip('#')
-            if len(hex_color) == 6:
-                return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
-            elif len(hex_color) == 3:
-                return tuple(int(hex_color[i]*2, 16) for i in range(3))
-            elif len(hex_color) < 6:
-                # Pad short hex with zeros for safety
-                padded = (hex_color + "0"*6)[:6]
-                return tuple(int(padded[i:i+2], 16) for i in (0, 2, 4))
-        except Exception:
-            logging.warning(f"Invalid color code: #{hex_color}")
-        return fallback
-
-
     @app_commands.command(name="map", description="Show the live Wynncraft territory map, optionally filtered by guild or zone.")
     @app_commands.describe(guild="Filter by guild tags (comma-separated)", zone="Optional region/zone names to crop to (comma-separated)")
-    @rate_limit_check()
     async def map(self, interaction: discord.Interaction, guild: str = None, zone: str = None):
         await interaction.response.defer()
 
@@ -93,203 +54,37 @@ class Map(commands.Cog):
             zones = normalized_zones
 
         try:
-            terr_res = await request("https://athena.wynntils.com/cache/get/territoryList")
-            guilds_res = await request("https://athena.wynntils.com/cache/get/guildList")
-            guild_color_lookup = {}
-            if isinstance(guilds_res, list):
-                for entry in guilds_res:
-                    try:
-                        color = entry.get("color") or ""
-                        gid = entry.get("_id") or entry.get("id")
-                        prefix = entry.get("prefix")
-                        if gid:
-                            guild_color_lookup[gid] = color
-                        if prefix:
-                            guild_color_lookup[prefix.lower()] = color
-                    except Exception:
-                        continue
-        except Exception:
-            return await interaction.followup.send("Athena is down.", ephemeral=True)
-
-        territories = None
-        if isinstance(terr_res, dict):
-            if "territories" in terr_res and isinstance(terr_res["territories"], dict):
-                territories = terr_res["territories"]
-            elif "data" in terr_res and isinstance(terr_res["data"], dict) and "territories" in terr_res["data"]:
-                territories = terr_res["data"]["territories"]
-            else:
-                if all(isinstance(v, dict) and ("location" in v or "acquired" in v) for v in terr_res.values()):
-                    territories = terr_res
-        elif isinstance(terr_res, list):
-            for item in terr_res:
-                if isinstance(item, dict) and "territories" in item:
-                    territories = item["territories"]
-                    break
-
-        if not territories or not isinstance(territories, dict):
-            logging.error("Unexpected territory response from Athena: %s", terr_res)
-            return await interaction.followup.send("Athena returned unexpected territory data.", ephemeral=True)
-
-        with open("assets/terr_conns.json") as f:
-            terr_conns = json.load(f)
-
-        main_map = Image.open("assets/main_map.png")
-        font = ImageFont.truetype("assets/MinecraftRegular.ttf", 16)
-        map_width, map_height = main_map.size
-
-        base = Image.new("RGBA", main_map.size)
-        terr_layer = Image.new("RGBA", main_map.size)
-        label_layer = Image.new("RGBA", main_map.size)
-        draw_base = ImageDraw.Draw(base)
-        draw_territory = ImageDraw.Draw(terr_layer)
-        draw_label = ImageDraw.Draw(label_layer)
-
-        centers = {}      # Store center coordinates of each territory (for connections)
-        terr_owners = {}  # Store owner prefix for each territory (for filtering connections)
-
-        def extract_coords(loc: dict):
-            if not isinstance(loc, dict):
-                raise ValueError("Invalid location")
-            if "startX" in loc or "startZ" in loc:
-                sx = loc.get("startX")
-                sz = loc.get("startZ")
-                ex = loc.get("endX")
-                ez = loc.get("endZ")
-                return sx, sz, ex, ez
-            if "start" in loc and isinstance(loc["start"], (list, tuple)):
-                sx, sz = loc["start"][0], loc["start"][1]
-                ex, ez = loc["end"][0], loc["end"][1]
-                return sx, sz, ex, ez
-            raise ValueError("Unsupported location format")
-
-        def extract_prefix(data: dict):
-            if "guildPrefix" in data and data.get("guildPrefix"):
-                return data.get("guildPrefix")
-            g = data.get("guild")
-            if isinstance(g, dict):
-                return g.get("prefix") or g.get("name")
-            return None
-
-        for name, data in territories.items():
-            loc = data.get("location") or data
-            try:
-                sx, sz, ex, ez = extract_coords(loc)
-            except Exception:
-                continue
-            x1, y1 = self.to_full_map_coord(sx, sz, map_width, map_height)
-            x2, y2 = self.to_full_map_coord(ex, ez, map_width, map_height)
-            cx = (min(x1, x2) + max(x1, x2)) / 2
-            cy = (min(y1, y2) + max(y1, y2)) / 2
-            centers[name] = (cx, cy)
-        
-
-        if guild_tags:
-            min_x, min_y = float("inf"), float("inf")
-            max_x, max_y = float("-inf"), float("-inf")
-
-        for name, data in territories.items():
-            loc = data.get("location") or data
-            prefix = extract_prefix(data) or ""
-
-            if guild_tags and prefix.lower() not in guild_tags:
-                continue
-
-            terr_owners[name] = prefix
-
-            color = None
-            if data.get("guildColor"):
-                color = data.get("guildColor")
-            elif isinstance(data.get("guild"), dict):
-                color = data.get("guild", {}).get("color")
-            guild_id = None
-            g = data.get("guild")
-            if isinstance(g, dict):
-                guild_id = g.get("uuid") or g.get("_id")
-            elif isinstance(g, str):
-                guild_id = g
-            if not color and guild_id:
-                color = guild_color_lookup.get(guild_id)
-            if not color and prefix:
-                color = guild_color_lookup.get(prefix.lower())
-            if not color:
-                color = "#888888"
-
-            rgb = self.hex_to_rgb(color) if prefix else (255, 255, 255)
-            fill = rgb + (90,)      
-            border = rgb + (255,)   
-
-            try:
-                sx, sz, ex, ez = extract_coords(loc)
-            except Exception:
-                continue
-            x1, y1 = self.to_full_map_coord(sx, sz, map_width, map_height)
-            x2, y2 = self.to_full_map_coord(ex, ez, map_width, map_height)
-            left, right = sorted([x1, x2])
-            top, bottom = sorted([y1, y2])
-            cx, cy = (left + right) / 2, (top + bottom) / 2
-
-            if guild_tags:
-                min_x = min(min_x, left)
-                min_y = min(min_y, top)
-                max_x = max(max_x, right)
-                max_y = max(max_y, bottom)
-
-            draw_territory.rectangle([left, top, right, bottom], fill=fill)
-            draw_label.rectangle([left-1, top-1, right+1, bottom+1], outline=(0, 0, 0), width=3)
-            draw_label.rectangle([left, top, right, bottom], outline=border, width=2)
-
-            bbox = draw_label.textbbox((0, 0), prefix or "None", font=font)
-            tw, th = bbox[2] - bbox[0], bbox[3] - bbox[1]
-            self.draw_text_with_outline(draw_label, (cx - tw/2, cy - th/2), prefix or "None", font, fill=border)
-
-        for start, targets in terr_conns.items():
-            center_start = centers.get(start)
-            if not center_start:
-                continue
-            for target in targets.get("Trading Routes", []):
-                if target not in centers:
-                    continue
-
-                if guild_tags and (terr_owners.get(start) not in guild_tags or terr_owners.get(target) not in guild_tags):
-                    continue
-
-                draw_base.line([center_start, centers[target]], fill=(20, 20, 20), width=2)
-
-        composed = Image.alpha_composite(main_map.convert("RGBA"), base)
-        composed = Image.alpha_composite(composed, terr_layer)
-        final = Image.alpha_composite(composed, label_layer)
+            territories, owners = await MapEngine.get_data()
+        except MapDataError as e:
+            return await interaction.followup.send(e.message, ephemeral=True)
 
         if guild_tags and not zones:
-            if min_x != float("inf"):
-                final = final.crop((min_x - 50, min_y - 50, max_x + 50, max_y + 50))
-            else:
+            on_map = any(prefix.lower() in guild_tags for prefix, _ in owners.values())
+            if not on_map:
                 plural = "s are" if len(guild_tags) > 1 else " is"
                 return await interaction.followup.send(embed=ErrorEmbed(
                         f"Specified guild{plural} not currently on the map."
                     )
                 )
 
-        if zones:
-            crop_min_x, crop_min_y = float("inf"), float("inf")
-            crop_max_x, crop_max_y = float("-inf"), float("-inf")
-            
-            for zone_name in zones:
-                reg = map_regions[zone_name]["pos"]
-                x1, y1 = self.to_full_map_coord(reg[0], reg[1], map_width, map_height)
-                x2, y2 = self.to_full_map_coord(reg[2], reg[3], map_width, map_height)
-                
-                crop_min_x = min(crop_min_x, x1, x2)
-                crop_min_y = min(crop_min_y, y1, y2)
-                crop_max_x = max(crop_max_x, x1, x2)
-                crop_max_y = max(crop_max_y, y1, y2)
-            
-            final = final.crop((crop_min_x - 50, crop_min_y - 50, crop_max_x + 50, crop_max_y + 50))
-
-        
-        with io.BytesIO() as img_binary:
-            final.save(img_binary, 'PNG')
-            img_binary.seek(0)
-            await interaction.followup.send(file=discord.File(fp=img_binary, filename="map.png"))
+        # The unfiltered map is kept encoded and up to date by the map engine
+        image = MapEngine.frame() if not guild_tags and not zones else None
+
+        # Filtered views are drawn and encoded in a render worker process, on top of the shared base map layers
+        if image is None:
+            await SharedMapLayers.ensure_routes(territories)
+            image = await RenderPool.render(
+                "map",
+                territories=territories,
+                owners=owners,
+                guild_tags=guild_tags,
+                zones=zones,
+                layers=SharedMapLayers.layers()
+            )
+
+        # The unfiltered frame only changes once a minute, so most sends reuse an earlier upload
+        image = CachedAttachment(image, file_name("map", "map"))
+        await image.send(interaction.followup.send, wait=True)
 
 
     @map.autocomplete("zone")
@@ -2,7 +2,7 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 
-from core.antispam import rate_limit_check
+from core.interactions import AutoDeferView
 from util.embeds import ErrorEmbed
 from util.mappings import EMOJI_MAP, ITEM_TO_EMOJI_MAP, ASPECT_TO_EMOJI_MAP, WARD_TO_EMOJI_MAP
 from util.requests import request_with_csrf
@@ -164,7 +164,7 @@ class Pools(commands.Cog):
             await interaction.response.edit_message(embed=embed, view=self.view)
 
 
-    class LootPoolView(discord.ui.View):
+    class LootPoolView(AutoDeferView):
         """
         View containing the LootPoolSelect select menu.
         """
@@ -175,7 +175,6 @@ class Pools(commands.Cog):
 
 
     @app_commands.command(name="lootpool", description="View the current loot pool for lootrun camps")
-    @rate_limit_check()
     async def lootpool(self, interaction: discord.Interaction):
         """
         Slash command to display loot pool overview with interactive select menu.
@@ -263,7 +262,7 @@ class Pools(commands.Cog):
             await interaction.response.edit_message(embed=embed, view=self.view)
 
 
-    class AspectPoolView(discord.ui.View):
+    class AspectPoolView(AutoDeferView):
         """
         View containing the AspectPoolSelect select menu.
         """
@@ -273,7 +272,6 @@ class Pools(commands.Cog):
 
 
     @app_commands.command(name="aspectpool", description="View current aspect pool for raids")
-    @rate_limit_check()
     async def aspectpool(self, interaction: discord.Interaction):
         """
         Slash command to display aspect pool overview with interactive select menu.
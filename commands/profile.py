@@ -1,206 +1,409 @@
-import discord, os, time, re, textwrap, io, tempfile, logging, asyncio
+import discord, asyncio, hashlib, os, time, re, textwrap, tempfile
 
-from discord import app_commands, File
+from discord import app_commands
 from discord.ext import commands
-from PIL import Image, ImageFont, ImageDraw
+from PIL import Image, ImageDraw
 
 from datetime import datetime
 from database import Database
 
-from core.antispam import rate_limit_check
+from core.render_pool import RenderPool
+from util.assets import ASSETS_DIR, get_font, get_canvas, get_rank_icon, get_gamemode_icon, get_guild_icon, get_leaderboard_icon, has_guild_icon
+from util.badges import BadgeStore
+from util.cache import TTLCache
 from util.embeds import ErrorEmbed
+from util.attachments import CachedAttachment
+from util.encoding import encode, file_name
 from util.formatting import human_format
 from util.ranks import get_war_rank, get_xp_rank
 from util.requests import request
+from util.results import result_key, shared_result
+from util.guild_icons import ensure_guild_icons
+from util.skins import save_bust
 from util.uuid import get_uuid_from_name, detect_uuid_or_name
 
 
 
-class Profile(commands.Cog):
-    def __init__(self, bot):
-        self.bot = bot
+# Leaderboard types that use a bundled icon instead of the Wynncraft CDN one (temp fix for guild until wynn adds icon)
+GAMEMODE_BADGES = {"craftsman", "hunted", "ironman", "hardcore", "ultimate", "huic", "huich", "hic", "hich", "guild"}
 
+# Ranking types left off the card: legacy ones and NASrPlayers, which is broken atm
+IGNORED_RANKINGS = {"hardcoreLegacyLevel", "NASrPlayers"}
 
-    async def build_profile_image(
-        self, username: str, uuid: str, data: dict, warcount: int,
-        war_ranking: tuple, gxp_contrib: int, gxp_ranking: tuple
-    ) -> Image.Image:
-        warn_api_hidden = False
-
-        black = (0, 0, 0)
-        gray = (129, 129, 129)
-        white = (255, 255, 255)
-        red = (229, 83, 107)
-        green = (87, 234, 128)
-        blue = (47, 63, 210)
-
-        name_font = ImageFont.truetype("assets/MinecraftRegular.ttf", 32)
-        rank_font = ImageFont.truetype("assets/MinecraftRegular.ttf", 28)
-        text_font = ImageFont.truetype("assets/MinecraftRegular.ttf", 15)
-        stat_text_font = ImageFont.truetype("assets/MinecraftRegular.ttf", 12)
-
-        img = Image.open("assets/profile_template.png")
-        draw = ImageDraw.Draw(img)
-
-        offset = 0
-        if data.get("supportRank"):
-            rank_badge_path = f"assets/icons/ranks/{data['supportRank']}.png"
-            if os.path.exists(rank_badge_path):
-                rank_badge = Image.open(rank_badge_path)
-                img.paste(rank_badge, (21, 25), rank_badge)
-                offset = {
-                    "vip": 84,
-                    "vipplus": 105,
-                    "hero": 110,
-                    "heroplus": 130,
-                    "champion": 175
-                }.get(data['supportRank'], 0)
-        draw.text((21 + offset, 24), data["username"], white, name_font)
-
-        tmp_path = os.path.join(tempfile.gettempdir(), f"{username}_model.png")
-        if not os.path.exists(tmp_path) or time.time() - os.path.getmtime(tmp_path) > 604800:
-            headers = {"User-Agent": "valor-bot/1.0"}
-            model = await request(f"https://visage.surgeplay.com/bust/{uuid}.png", headers=headers, return_type="image")
-            with open(tmp_path, "wb") as f:
-                f.write(model)
-        model_img = Image.open(tmp_path).resize((203, 190))
-        img.paste(model_img, (26, 79), model_img)
-
-        draw.text((342, 161), war_ranking[0], red, rank_font, anchor="mm")
-        draw.text((342, 230), f"{warcount} / {war_ranking[1]}", white, text_font, anchor="ma")
-        value = min(round((warcount / war_ranking[1]) * 142), 142)
-        draw.rectangle([(269, 221), (value + 269, 224)], red)
-
-        if data["restrictions"]["characterDataAccess"]:
-            section = img.crop((254, 83, 426, 266))
-            section = section.convert("L")
-            img.paste(section, (254, 83))
-            warn_api_hidden = True
-
-        draw.text((542, 161), gxp_ranking[0], green, rank_font, anchor="mm")
-        draw.text((542, 230), f"{human_format(gxp_contrib)} / {human_format(gxp_ranking[1])}", white, text_font, anchor="ma")
-        value = min(round((gxp_contrib / gxp_ranking[1]) * 142), 142)
-        draw.rectangle([(469, 221), (value + 469, 224)], green)
-
-        recent = await Database.fetch(
-            "SELECT COUNT(*) FROM activity_members WHERE uuid=%s AND timestamp >= %s",
-            (uuid, int(time.time()) - 7 * 86400)
-        )
-        cool = min(recent[0]["COUNT(*)"] / 100, 1)
-        draw.rectangle([(668, 124), (round(cool * 142) + 668, 127)], blue)
-        draw.text((740, 140), f"{round(cool * 100)}% Cool", white, text_font, anchor="ma")
-
-        if data.get("online"):
-            draw.text((740, 209), "Player Online:", green, text_font, anchor="ma")
-            draw.text((740, 229), data.get("server", "Unknown"), white, text_font, anchor="ma")
-        else:
-            if data["lastJoin"]:
-                draw.text((740, 209), "Player last seen:", white, text_font, anchor="ma")
-                draw.text((740, 229), datetime.fromisoformat(data["lastJoin"][:-1]).strftime("%H:%M  %m/%d/%Y"), white, text_font, anchor="ma")
-            else:
-                draw.text((740, 209), "Last join date has", gray, text_font, anchor="ma")
-                draw.text((740, 229), "been API hidden", gray, text_font, anchor="ma")
-                warn_api_hidden = True
-
-        rankings = data["ranking"]
-        if rankings:
-            for rank in dict(rankings):
-                if rank in {"hardcoreLegacyLevel"}:
-                    rankings.pop(rank)
-
-            sorted_rank_keys = sorted(rankings, key=rankings.get)
-            # temporariy drop NASrPlayers because its broken atm
-            sorted_rank_keys = [key for key in sorted_rank_keys if key != "NASrPlayers"]
-            top_rank_keys = sorted_rank_keys[:3]
-            top_rankings = {}
-            for key in top_rank_keys:
-                top_rankings[key] = rankings[key]
-
-            for i, key in enumerate(top_rank_keys):
-                temp = [s for s in re.split("([A-Z][^A-Z]*)", key) if s]
-                rank_badge_link = f"https://cdn.wynncraft.com/nextgen/leaderboard/icons/{temp[0]}.webp?height=50"
-                rank_place = rankings[key]
-
-                rank_word_list = []
-                for word in temp:
-                    if word in {"tcc", "nol", "nog", "tna", "huic", "huich", "hic", "hich"}:
-                        rank_word_list.append(word.upper())
-                    else:
-                        rank_word_list.append(word.title())
-                rank = " ".join(rank_word_list)
-
-                wrapper = textwrap.TextWrapper(width=13, max_lines=2, placeholder="")
-                rank = wrapper.wrap(text=rank)
-
-                # temp fix for guild until wynn adds icon.
-                if temp[0] in {"craftsman", "hunted", "ironman", "hardcore", "ultimate", "huic", "huich", "hic", "hich", "guild"}:
-                    rank_badge = Image.open(f"assets/icons/gamemodes/{temp[0]}.png")
+# Seconds a player's static card layer is reused, and how many layers each render worker keeps
+PROFILE_LAYER_TTL = 600
+PROFILE_LAYER_CACHE_SIZE = 64
+
+# (uuid, inputs hash) -> static card layer, per render worker process
+_static_layers = TTLCache(ttl=PROFILE_LAYER_TTL, max_size=PROFILE_LAYER_CACHE_SIZE)
+
+
+def split_ranking_key(key: str) -> list[str]:
+    """Split a camelCase ranking key into its words, e.g. "ironmanContent" -> ["ironman", "Content"]."""
+    return [s for s in re.split("([A-Z][^A-Z]*)", key) if s]
+
+
+def get_top_rankings(rankings: dict) -> list[tuple[str, int]]:
+    """
+    Get the player's three best leaderboard placements.
+
+    Args:
+        rankings (dict): The "ranking" object of a Wynncraft player payload.
+
+    Returns:
+        list[tuple[str, int]]: Up to three (ranking key, place) pairs, best first.
+    """
+    ranked = {key: place for key, place in rankings.items() if key not in IGNORED_RANKINGS}
+    return [(key, ranked[key]) for key in sorted(ranked, key=ranked.get)[:3]]
+
+
+def get_featured_stats(data: dict) -> list | None:
+    """
+    Get the playtime, levels, mobs, chests and quests shown on the card.
+
+    Returns:
+        list | None: The five stats, or None if all of them are API hidden.
+    """
+    stats = data.get("featuredStats") or {}
+    global_data = data.get("globalData") or {}
+
+    playtime = stats.get("playtime") or data.get("playtime")
+    total_level = stats.get("globalData.totalLevel") or global_data.get("totalLevel")
+    mobs_killed = stats.get("globalData.mobsKilled") or global_data.get("mobsKilled")
+    chests_found = stats.get("globalData.chestsFound") or global_data.get("chestsFound")
+    completed_quests = stats.get("globalData.completedQuests") or global_data.get("completedQuests")
+
+    if playtime or total_level or mobs_killed or chests_found or completed_quests:
+        return [playtime, total_level, mobs_killed, chests_found, completed_quests]
+    return None
+
+
+def is_api_hidden(data: dict) -> bool:
+    """Check whether any part of the profile card is hidden by the player's API settings."""
+    return bool(
+        data["restrictions"]["characterDataAccess"]
+        or (not data.get("online") and not data["lastJoin"])
+        or not data["ranking"]
+        or get_featured_stats(data) is None
+    )
+
+
+def get_rank_badge(badge_type: str) -> Image.Image | None:
+    """Bundled gamemode icon or downloaded leaderboard badge of a ranking type."""
+    return get_gamemode_icon(badge_type) if badge_type in GAMEMODE_BADGES else get_leaderboard_icon(badge_type)
+
+
+def profile_static_key(uuid: str, data: dict, bust_path: str) -> tuple[str, str]:
+    """
+    Cache key of a player's static card layer: their uuid and a hash of everything the layer is drawn from.
+
+    Returns:
+        tuple[str, str]: The uuid and the hex digest of the layer's inputs.
+    """
+    top_rankings = get_top_rankings(data["ranking"] or {})
+    guild = data["guild"]
+    inputs = (
+        data["username"],
+        data.get("supportRank"),
+        os.path.getmtime(bust_path),
+        bool(data["ranking"]),
+        top_rankings,
+        # Badges and guild banners can appear after a layer was drawn without them
+        [get_rank_badge(split_ranking_key(key)[0]) is not None for key, _ in top_rankings],
+        (guild["prefix"], guild["rank"], guild["name"], has_guild_icon(guild["prefix"])) if guild else None,
+    )
+    return uuid, hashlib.sha1(repr(inputs).encode()).hexdigest()
+
+
+def render_profile_static(data: dict, bust_path: str) -> Image.Image:
+    """
+    Draws the parts of a profile card that rarely change: template, name and support rank, bust,
+    top rankings and guild.
+    """
+    white = (255, 255, 255)
+    gray = (129, 129, 129)
+
+    name_font = get_font(32)
+    text_font = get_font(15)
+
+    img = get_canvas("profile_template.png")
+    draw = ImageDraw.Draw(img)
+
+    offset = 0
+    if data.get("supportRank"):
+        rank_badge = get_rank_icon(data["supportRank"])
+        if rank_badge:
+            img.paste(rank_badge, (21, 25), rank_badge)
+            offset = {
+                "vip": 84,
+                "vipplus": 105,
+                "hero": 110,
+                "heroplus": 130,
+                "champion": 175
+            }.get(data['supportRank'], 0)
+    draw.text((21 + offset, 24), data["username"], white, name_font)
+
+    model_img = Image.open(bust_path).resize((203, 190))
+    img.paste(model_img, (26, 79), model_img)
+
+    rankings = data["ranking"]
+    if rankings:
+        for i, (key, rank_place) in enumerate(get_top_rankings(rankings)):
+            temp = split_ranking_key(key)
+
+            rank_word_list = []
+            for word in temp:
+                if word in {"tcc", "nol", "nog", "tna", "huic", "huich", "hic", "hich"}:
+                    rank_word_list.append(word.upper())
                 else:
-                    image = await request(rank_badge_link, return_type="stream")
-                    if image:
-                        rank_badge = Image.open(image)
-                    else:
-                        rank_badge = Image.new("RGBA", (48, 48), (0, 0, 0, 0)) # transparent placeholder
+                    rank_word_list.append(word.title())
+            rank = " ".join(rank_word_list)
 
-                for x, line in enumerate(rank):
-                    draw.text((91 + (i * 120), 335 + (x * 20)), line, white, text_font, anchor="ma")
+            wrapper = textwrap.TextWrapper(width=13, max_lines=2, placeholder="")
+            rank = wrapper.wrap(text=rank)
 
-                img.paste(rank_badge, (66 + (i * 120), 380), rank_badge)
-                draw.text((91 + (i * 120), 445), f"#{rank_place}", white, text_font, anchor="ma")
-        else:
-            draw.text((207, 389), "All rankings are API hidden.", gray, text_font, anchor="ma")
-            warn_api_hidden = True
-
-        offset = 53
-        if data["guild"]:
-            try:
-                guild_badge = Image.open(f'assets/icons/guilds/{data["guild"]["prefix"]}.png')
-                if guild_badge.mode != 'RGBA':
-                    guild_badge = guild_badge.convert('RGBA')
-                guild_badge = guild_badge.resize((90, 90))
-                await asyncio.sleep(0.005)
-                img.paste(guild_badge, (459, 329), guild_badge)
-            except Exception as e:
-                logging.warning(f"Failed to load guild icon for {data['guild']['prefix']}: {type(e).__name__}: {e}")
-                offset = 0
-
-            draw.text((505, 380 + offset), f'{data["guild"]["rank"]} of', white, text_font, anchor="ma")
-            draw.text((505, 400 + offset), data["guild"]["name"], white, text_font, anchor="ma")
+            rank_badge = get_rank_badge(temp[0])
+            if rank_badge is None:
+                rank_badge = Image.new("RGBA", (48, 48), (0, 0, 0, 0)) # transparent placeholder
+
+            for x, line in enumerate(rank):
+                draw.text((91 + (i * 120), 335 + (x * 20)), line, white, text_font, anchor="ma")
+
+            img.paste(rank_badge, (66 + (i * 120), 380), rank_badge)
+            draw.text((91 + (i * 120), 445), f"#{rank_place}", white, text_font, anchor="ma")
+    else:
+        draw.text((207, 389), "All rankings are API hidden.", gray, text_font, anchor="ma")
+
+    offset = 53
+    if data["guild"]:
+        guild_badge = get_guild_icon(data["guild"]["prefix"], 90)
+        if guild_badge:
+            img.paste(guild_badge, (459, 329), guild_badge)
         else:
-            draw.text((505, 390), "No Guild", white, text_font, anchor="ma")
-
-        stats = data.get("featuredStats") or {}
-        global_data = data.get("globalData") or {}
-
-        playtime = stats.get("playtime") or data.get("playtime")
-        total_level = stats.get("globalData.totalLevel") or global_data.get("totalLevel")
-        mobs_killed = stats.get("globalData.mobsKilled") or global_data.get("mobsKilled")
-        chests_found = stats.get("globalData.chestsFound") or global_data.get("chestsFound")
-        completed_quests = stats.get("globalData.completedQuests") or global_data.get("completedQuests")
-
-        if playtime or total_level or mobs_killed or chests_found or completed_quests:
-            player_stats = [
-                f'{playtime} Hours',
-                f'{total_level} Levels',
-                f'{mobs_killed} Mobs',
-                f'{chests_found} Chests',
-                f'{completed_quests} Quests'
-            ]
-            i = 0
-            for stat in player_stats:
-                draw.text((819, 333 + (i * 29)), stat, white, stat_text_font, anchor="ra")
-                i += 1
+            offset = 0
+
+        draw.text((505, 380 + offset), f'{data["guild"]["rank"]} of', white, text_font, anchor="ma")
+        draw.text((505, 400 + offset), data["guild"]["name"], white, text_font, anchor="ma")
+    else:
+        draw.text((505, 390), "No Guild", white, text_font, anchor="ma")
+
+    return img
+
+
+def render_profile_overlay(
+    img: Image.Image, data: dict, warcount: int, war_ranking: tuple, gxp_contrib: int, gxp_ranking: tuple,
+    recent_activity: int
+):
+    """
+    Draws the parts of a profile card that change often onto a copy of its static layer:
+    war and XP progress, coolness, online status and featured stats.
+    """
+    black = (0, 0, 0)
+    gray = (129, 129, 129)
+    white = (255, 255, 255)
+    red = (229, 83, 107)
+    green = (87, 234, 128)
+    blue = (47, 63, 210)
+
+    rank_font = get_font(28)
+    text_font = get_font(15)
+    stat_text_font = get_font(12)
+
+    draw = ImageDraw.Draw(img)
+
+    draw.text((342, 161), war_ranking[0], red, rank_font, anchor="mm")
+    draw.text((342, 230), f"{warcount} / {war_ranking[1]}", white, text_font, anchor="ma")
+    value = min(round((warcount / war_ranking[1]) * 142), 142)
+    draw.rectangle([(269, 221), (value + 269, 224)], red)
+
+    if data["restrictions"]["characterDataAccess"]:
+        section = img.crop((254, 83, 426, 266))
+        section = section.convert("L")
+        img.paste(section, (254, 83))
+
+    draw.text((542, 161), gxp_ranking[0], green, rank_font, anchor="mm")
+    draw.text((542, 230), f"{human_format(gxp_contrib)} / {human_format(gxp_ranking[1])}", white, text_font, anchor="ma")
+    value = min(round((gxp_contrib / gxp_ranking[1]) * 142), 142)
+    draw.rectangle([(469, 221), (value + 469, 224)], green)
+
+    cool = min(recent_activity / 100, 1)
+    draw.rectangle([(668, 124), (round(cool * 142) + 668, 127)], blue)
+    draw.text((740, 140), f"{round(cool * 100)}% Cool", white, text_font, anchor="ma")
+
+    if data.get("online"):
+        draw.text((740, 209), "Player Online:", green, text_font, anchor="ma")
+        draw.text((740, 229), data.get("server", "Unknown"), white, text_font, anchor="ma")
+    else:
+        if data["lastJoin"]:
+            draw.text((740, 209), "Player last seen:", white, text_font, anchor="ma")
+            draw.text((740, 229), datetime.fromisoformat(data["lastJoin"][:-1]).strftime("%H:%M  %m/%d/%Y"), white, text_font, anchor="ma")
         else:
-            draw.rectangle([(623, 326), (823, 476)], black)
-            draw.text((723, 389), "Stats are API hidden.", gray, text_font, anchor="ma")
-            warn_api_hidden = True
+            draw.text((740, 209), "Last join date has", gray, text_font, anchor="ma")
+            draw.text((740, 229), "been API hidden", gray, text_font, anchor="ma")
+
+    featured_stats = get_featured_stats(data)
+    if featured_stats:
+        playtime, total_level, mobs_killed, chests_found, completed_quests = featured_stats
+        player_stats = [
+            f'{playtime} Hours',
+            f'{total_level} Levels',
+            f'{mobs_killed} Mobs',
+            f'{chests_found} Chests',
+            f'{completed_quests} Quests'
+        ]
+        i = 0
+        for stat in player_stats:
+            draw.text((819, 333 + (i * 29)), stat, white, stat_text_font, anchor="ra")
+            i += 1
+    else:
+        draw.rectangle([(623, 326), (823, 476)], black)
+        draw.text((723, 389), "Stats are API hidden.", gray, text_font, anchor="ma")
+
+
+def render_profile_card(
+    uuid: str, data: dict, warcount: int, war_ranking: tuple, gxp_contrib: int, gxp_ranking: tuple,
+    bust_path: str, recent_activity: int
+) -> bytes:
+    """
+    Renders a profile card. Runs inside a render worker process.
+
+    The static layer is cached per worker, so repeat cards of a player only redraw the overlay.
+
+    Args:
+        uuid (str): The player's uuid.
+        data (dict): Wynncraft player payload.
+        warcount (int): Total wars of the player.
+        war_ranking (tuple): War rank name and the warcount needed for the next rank.
+        gxp_contrib (int): Guild XP contributed by the player.
+        gxp_ranking (tuple): XP rank name and the XP needed for the next rank.
+        bust_path (str): Path of the downloaded player bust.
+        recent_activity (int): Activity samples of the player in the last 7 days.
+
+    Returns:
+        bytes: The encoded card.
+    """
+    key = profile_static_key(uuid, data, bust_path)
+    static = _static_layers.get(key)
+    if static is None:
+        static = render_profile_static(data, bust_path)
+        _static_layers.set(key, static)
+
+    img = static.copy()
+    render_profile_overlay(img, data, warcount, war_ranking, gxp_contrib, gxp_ranking, recent_activity)
+    return encode(img, "profile")
+
+
+
+async def fetch_bust(username: str, uuid: str) -> str:
+    """
+    Renders the player's bust from their skin unless a recent copy exists.
+
+    Returns:
+        str: Path of the bust image, the unknown model if the player has no skin.
+    """
+    tmp_path = os.path.join(tempfile.gettempdir(), f"{username}_model.png")
+    if await save_bust(uuid, tmp_path):
+        return tmp_path
+    return os.path.join(ASSETS_DIR, "unknown_model.png")
+
+
+async def fetch_warcount(uuid: str) -> int:
+    res = await Database.fetch("SELECT SUM(warcount) FROM cumu_warcounts WHERE uuid=%s", (uuid,))
+    return res[0]["SUM(warcount)"] if res and res[0]["SUM(warcount)"] is not None else 0
+
+
+async def fetch_stored_contrib(uuid: str) -> int:
+    """Guild XP contributed by the player according to the database."""
+    res = await Database.fetch("""
+        SELECT MAX(xp)
+        FROM ((SELECT xp FROM user_total_xps WHERE uuid=%s)
+              UNION ALL
+              (SELECT SUM(delta) FROM player_delta_record WHERE uuid=%s AND label='gu_gxp')) A;
+    """, (uuid, uuid))
+    return res[0]["MAX(xp)"] if res and res[0]["MAX(xp)"] else 0
+
+
+async def fetch_recent_activity(uuid: str) -> int:
+    """Activity samples of the player in the last 7 days."""
+    res = await Database.fetch(
+        "SELECT COUNT(*) FROM activity_members WHERE uuid=%s AND timestamp >= %s",
+        (uuid, int(time.time()) - 7 * 86400)
+    )
+    return res[0]["COUNT(*)"] if res else 0
+
+
+async def fetch_guild_contrib(data: dict) -> int:
+    """Guild XP contributed by the player according to the Wynncraft guild API."""
+    if not data.get("guild"):
+        return 0
+    guild = await request(f"https://api.wynncraft.com/v3/guild/prefix/{data['guild']['prefix']}")
+    try:
+        return guild["members"][data["guild"]["rank"].lower()][data["username"]]["contributed"]
+    except (KeyError, TypeError):
+        return 0
+
+
+async def fetch_rank_badges(data: dict):
+    """Makes sure the badges of the player's top leaderboard placements are on disk (normally prefetched at startup)."""
+    badge_types = {split_ranking_key(key)[0] for key, _ in get_top_rankings(data["ranking"] or {})} - GAMEMODE_BADGES
+    await BadgeStore.ensure(badge_types)
+
+
+async def gather_profile(username: str, uuid: str) -> dict | None:
+    """
+    Collects everything shown on a player's profile card.
+
+    Everything that only needs the uuid starts right away alongside the player request,
+    the guild request and any missing badge or banner work start as soon as the player payload arrives.
+
+    Returns:
+        dict | None: Keyword arguments of `render_profile_card`, None if the player couldn't be fetched.
+    """
+    player = request(f"https://api.wynncraft.com/v3/player/{uuid}?fullResult", use_wynn_auth=True)
+    by_uuid = asyncio.gather(
+        fetch_warcount(uuid),
+        fetch_stored_contrib(uuid),
+        fetch_recent_activity(uuid),
+        fetch_bust(username, uuid),
+    )
+
+    try:
+        data = await player
+    except BaseException:
+        by_uuid.cancel()
+        raise
+    if not data:
+        by_uuid.cancel()
+        return None
+
+    (warcount, stored_contrib, recent_activity, bust_path), api_contrib, _, _ = await asyncio.gather(
+        by_uuid,
+        fetch_guild_contrib(data),
+        fetch_rank_badges(data),
+        ensure_guild_icons([data["guild"]["prefix"]] if data.get("guild") else []),
+    )
+
+    gxp_contrib = max(stored_contrib, api_contrib)
+    return {
+        "uuid": uuid,
+        "data": data,
+        "warcount": warcount,
+        "war_ranking": get_war_rank(warcount),
+        "gxp_contrib": gxp_contrib,
+        "gxp_ranking": get_xp_rank(gxp_contrib),
+        "bust_path": bust_path,
+        "recent_activity": recent_activity,
+    }
+
 
-        return img, warn_api_hidden
+
+class Profile(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
 
 
     @app_commands.command(name="profile", description="Display a profile card for a player")
     @app_commands.describe(username="Username or uuid of targeted player")
-    @rate_limit_check()
     async def profile(self, interaction: discord.Interaction, username: str):
         await interaction.response.defer()
 
@@ -215,41 +418,22 @@ class Profile(commands.Cog):
         if not uuid:
             return await interaction.followup.send(embed=ErrorEmbed("Player not found."))
 
-        data = await request(f"https://api.wynncraft.com/v3/player/{uuid}?fullResult", use_wynn_auth=True)
-        if not data:
+        async def load() -> tuple[bytes, bool] | None:
+            card = await gather_profile(username, uuid)
+            if not card:
+                return None
+            return await RenderPool.render("profile", **card), is_api_hidden(card["data"])
+
+        # Everyone looking up the same player at once shares one gather and one render
+        result = await shared_result(result_key(interaction, uuid=uuid), load)
+        if not result:
             return await interaction.followup.send(embed=ErrorEmbed("Error fetching player data."))
-        guild = await request(f"https://api.wynncraft.com/v3/guild/prefix/{data['guild']['prefix']}") if data.get("guild") else None
-
-        res = await Database.fetch("SELECT SUM(warcount) FROM cumu_warcounts WHERE uuid=%s", (uuid,))
-        warcount = res[0]["SUM(warcount)"] if res and res[0]["SUM(warcount)"] is not None else 0
-        war_ranking = get_war_rank(warcount)
-
-        res = await Database.fetch("""
-            SELECT MAX(xp)
-            FROM ((SELECT xp FROM user_total_xps WHERE uuid=%s)
-                  UNION ALL
-                  (SELECT SUM(delta) FROM player_delta_record WHERE uuid=%s AND label='gu_gxp')) A;
-        """, (uuid, uuid))
-        res_contrib = res[0]["MAX(xp)"] if res and res[0]["MAX(xp)"] else 0
-        try:
-            api_contrib = guild["members"][data["guild"]["rank"].lower()][data["username"]]["contributed"] if data.get("guild") else 0
-        except KeyError:
-            api_contrib = 0
-        gxp_contrib = max(res_contrib, api_contrib)
-        gxp_ranking = get_xp_rank(gxp_contrib)
-
-        img, warn_api_hidden = await self.build_profile_image(username, uuid, data, warcount, war_ranking, gxp_contrib, gxp_ranking)
-        if not img:
-            return await interaction.followup.send(embed=ErrorEmbed("Hidden player profile."))
-
-        with io.BytesIO() as img_binary:
-            img.save(img_binary, 'PNG')
-            img_binary.seek(0)
-            file = File(fp=img_binary, filename="profile.png")
-
-            message = "Unhide your API!!!!!!!!!" if warn_api_hidden else ""
-
-            await interaction.followup.send(file=file, content=message)
+
+        image, api_hidden = result
+        image = CachedAttachment(image, file_name("profile", "profile"))
+        content = "Unhide your API!!!!!!!!!" if api_hidden else ""
+
+        await image.send(interaction.followup.send, content=content, wait=True)
 
 async def setup(bot: commands.Bot):
     await bot.add_cog(Profile(bot))
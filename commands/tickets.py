@@ -3,7 +3,6 @@ import discord, math
 from discord import app_commands
 from discord.ext import commands
 
-from core.antispam import rate_limit_check
 from core.config import config
 from database import Database
 from util.embeds import ErrorEmbed, PaginatedTextTableEmbed
@@ -100,7 +99,6 @@ class Tickets(commands.Cog):
         self.bot = bot
 
     @app_commands.command(name="tickets", description="View or update this week's ticket leaderboard.")
-    @rate_limit_check() # Prevent spam by rate limiting command usage per user
     async def tickets(self, interaction: discord.Interaction):
         """
         Slash command handler for viewing the Titans Valor ticket leaderboard.
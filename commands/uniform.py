@@ -1,12 +1,64 @@
-import discord, ast, base64
-from discord import app_commands, File
+import discord, io
+from discord import app_commands
 from discord.ext import commands
 from PIL import Image
 
 from core.config import config
+from core.render_pool import RenderPool
+from util.assets import get_image
 from util.embeds import ErrorEmbed
+from util.encoding import encode, to_file
 from util.roles import is_ANO_member
-from util.requests import request
+from util.skins import get_skin
+from util.uuid import get_uuid_from_name
+
+
+def render_uniform(skin: bytes, variant: str) -> bytes:
+    """
+    Applies the ANO uniform overlay to a Minecraft skin. Runs inside a render worker process.
+
+    Args:
+        skin (bytes): The raw PNG skin downloaded from Mojang.
+        variant (str): The uniform variant, either 'male' or 'female'.
+
+    Returns:
+        bytes: The PNG encoded skin with the uniform applied.
+    """
+    player_skin = Image.open(io.BytesIO(skin)).convert("RGBA")
+
+    # Handle legacy 32-pixel tall skins by converting them to 64-pixel tall format
+    if player_skin.height == 32:
+        # Extract body parts
+        leg = player_skin.crop((0, 16, 16, 32))
+        arm = player_skin.crop((40, 16, 56, 32))
+        body = player_skin.crop((16, 16, 40, 32))
+        head = player_skin.crop((0, 0, 64, 16))
+
+        # Create a new transparent 64x64 canvas for the updated skin
+        player_skin = Image.new("RGBA", (64, 64), (0, 0, 0, 0))
+
+        # Paste extracted body parts in new 64x64 layout positions
+        player_skin.paste(leg, (16, 48))
+        player_skin.paste(leg, (0, 16))
+        player_skin.paste(arm, (40, 16))
+        player_skin.paste(arm, (32, 48))
+        player_skin.paste(body, (16, 16))
+        player_skin.paste(head, (0, 0))
+
+    # Clear specific rectangular areas on the skin by pasting transparent rectangles,
+    # likely to remove legacy overlay artifacts before applying uniform overlay
+    rect1 = Image.new("RGBA", (64, 16), (0, 0, 0, 0))
+    rect2 = Image.new("RGBA", (16, 16), (0, 0, 0, 0))
+
+    player_skin.paste(rect1, (0, 32))
+    player_skin.paste(rect2, (0, 48))
+    player_skin.paste(rect2, (48, 48))
+
+    # Combine the player's skin with the uniform overlay, preserving transparency
+    final_skin = Image.alpha_composite(player_skin, get_image(f"{variant}_uniform_overlay.png"))
+
+    return encode(final_skin, "uniform")
+
 
 
 class Uniform(commands.Cog):
@@ -38,7 +90,7 @@ class Uniform(commands.Cog):
 
         Workflow:
         - Verifies user is an ANO member (except if in testing mode).
-        - Fetches the player's UUID and skin data from Mojang APIs.
+        - Resolves the player's UUID and skin through the cached lookups.
         - Converts legacy 32-pixel skins to 64-pixel format.
         - Applies a transparent uniform overlay PNG (male/female).
         - Sends the final composited skin image back as a file attachment.
@@ -51,67 +103,23 @@ class Uniform(commands.Cog):
                 embed=ErrorEmbed("Only ANO members can wear this uniform!")
             )
 
-        # Fetch UUID for the given username from Mojang API
-        uuid = (await request(f"https://api.mojang.com/users/profiles/minecraft/{username}")).get("id", "")
+        # Defensive fallback if somehow an invalid variant is provided
+        if skin_variant.value not in ("male", "female"):
+            return await interaction.followup.send(embed=ErrorEmbed("Invalid skin variant"), ephemeral=True)
+
+        # Resolve the UUID through the database backed resolver
+        uuid = await get_uuid_from_name(username, interaction)
         if not uuid:
             return await interaction.followup.send(embed=ErrorEmbed("Player not found."))
 
-        # Fetch skin data JSON, decode the base64 texture property, and parse it
-        data = await request(f"https://sessionserver.mojang.com/session/minecraft/profile/{uuid}")
-        skindata = ast.literal_eval(base64.b64decode(data["properties"][0]["value"]).decode("UTF-8"))
-
-        # Download player skin image as a PIL image from the skin URL
-        player_skin = Image.open(await request(skindata["textures"]["SKIN"]["url"], return_type="stream"))
-
-        # Handle legacy 32-pixel tall skins by converting them to 64-pixel tall format
-        if player_skin.height == 32:
-            # Extract body parts
-            leg = player_skin.crop((0, 16, 16, 32))
-            arm = player_skin.crop((40, 16, 56, 32))
-            body = player_skin.crop((16, 16, 40, 32))
-            head = player_skin.crop((0, 0, 64, 16))
-
-            # Create a new transparent 64x64 canvas for the updated skin
-            player_skin = Image.new("RGBA", (64, 64), (0, 0, 0, 0))
-
-            # Paste extracted body parts in new 64x64 layout positions
-            player_skin.paste(leg, (16, 48))
-            player_skin.paste(leg, (0, 16))
-            player_skin.paste(arm, (40, 16))
-            player_skin.paste(arm, (32, 48))
-            player_skin.paste(body, (16, 16))
-            player_skin.paste(head, (0, 0))
-
-        # Clear specific rectangular areas on the skin by pasting transparent rectangles,
-        # likely to remove legacy overlay artifacts before applying uniform overlay
-        rect1 = Image.new("RGBA", (64, 16), (0, 0, 0, 0))
-        rect2 = Image.new("RGBA", (16, 16), (0, 0, 0, 0))
-
-        player_skin.paste(rect1, (0, 32))
-        player_skin.paste(rect2, (0, 48))
-        player_skin.paste(rect2, (48, 48))
-
-        # Load the appropriate uniform overlay PNG image for the selected variant
-        if skin_variant.value == "male":
-            uniform_skin = Image.open("assets/male_uniform_overlay.png").convert("RGBA")
-        elif skin_variant.value == "female":
-            uniform_skin = Image.open("assets/female_uniform_overlay.png").convert("RGBA")
-        else:
-            # Defensive fallback if somehow an invalid variant is provided
-            await interaction.followup.send(embed=ErrorEmbed("Invalid skin variant"), ephemeral=True)
-            return
-
-        # Combine the player's skin with the uniform overlay, preserving transparency
-        final_skin = Image.alpha_composite(player_skin, uniform_skin)
-
-        # Save the composited image temporarily to disk
-        final_skin.save("/tmp/uniform_skin.png")
-
-        # Create a Discord file object for sending the image
-        file = File("/tmp/uniform_skin.png", filename="uniform_skin.png")
+        # Get the raw player skin (cached by texture hash), compositing happens in a render worker process
+        skin = await get_skin(uuid)
+        if not skin:
+            return await interaction.followup.send(embed=ErrorEmbed("Couldn't fetch the player's skin."))
+        image = await RenderPool.render("uniform", skin=skin, variant=skin_variant.value)
 
         # Send the final image as a follow-up message attachment
-        await interaction.followup.send(file=file)
+        await interaction.followup.send(file=to_file(image, "uniform_skin", "uniform"))
 
 
 
@@ -3,13 +3,14 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 
-from core.antispam import rate_limit_check
 from database import Database
-from util.board import BoardView, build_board, WarcountBoardView, build_warcount_board
+from util.board import BoardView, WarcountBoardView
 from util.embeds import ErrorEmbed, PaginatedTextTableEmbed
 from util.guilds import guild_names_from_tags
 from util.mappings import CLASS_RESKINS_MAP
-from util.ranges import get_range_from_string, range_alt
+from util.pagination import ListPageSource
+from util.ranges import get_range_from_string
+from util.results import result_key, shared_result
 
 
 class Warcount(commands.Cog):
@@ -28,7 +29,6 @@ class Warcount(commands.Cog):
         classes="Filter by classes (comma-separated)",
         guild_wise="Show wars total per guild instead of individual players"
     )
-    @rate_limit_check()
     async def warcount(
         self,
         interaction: discord.Interaction,
@@ -47,6 +47,7 @@ class Warcount(commands.Cog):
             ))
 
         # Parse and validate the 'range' argument if provided
+        range_input = range
         if range:
             if range.strip().lower() == "all":
                 range = None # Uses rangeless logic to be correct
@@ -54,7 +55,6 @@ class Warcount(commands.Cog):
                 range = await get_range_from_string(range, max_allowed_range=None)
                 if not range:
                     return await interaction.followup.send(embed=ErrorEmbed("Invalid range input"))
-                left, right = range
 
         # Parse filters from comma-separated strings into lists
         guild_filter = [g.strip() for g in guilds.split(",")] if guilds else []
@@ -62,48 +62,108 @@ class Warcount(commands.Cog):
         # Default classes to all 5 valid classes if none specified
         listed_classes = [c.strip().upper() for c in classes.split(",")] if classes else ["ARCHER", "WARRIOR", "MAGE", "ASSASSIN", "SHAMAN"]
 
+        # Identical invocations (e.g. a season board everyone is told to check) share the rows and rendered pages.
+        # The range is keyed as typed, relative ranges move by at most the short result TTL.
+        key = result_key(
+            interaction,
+            guilds=guilds,
+            range=range_input,
+            players=players,
+            classes=",".join(listed_classes),
+            guild_wise=guild_wise,
+        )
+
         # If guild-wise aggregation is requested, query aggregated wars per guild directly
         if guild_wise:
-            query = f"""
-SELECT guild, SUM(delta) AS wars
-FROM player_delta_record
-WHERE label = 'g_wars' {"AND time BETWEEN %s AND %s" if range else ""}
-GROUP BY guild
-ORDER BY wars DESC
-LIMIT 100;
-"""
-            
-            res = await Database.fetch(query, (left, right) if range else ())
-
-            # Prepare header and rows for leaderboard table
             headers = ["Guild", "Wars"]
-            rows = []
-            for result in res:
-                rows.append((
-                    result["guild"],
-                    int(result["wars"])
-                ))
+            source = await shared_result(key, lambda: self.load_guild_warcounts(range))
+
+            # Return early if the query failed or no guild warred in the range
+            if not source:
+                return await interaction.followup.send(embed=ErrorEmbed("No wars found in specified range."))
 
             # Initialize BoardView with guild data
-            view = BoardView(interaction.user.id, rows, is_guild_board=True, headers=headers)
+            view = BoardView(interaction.user.id, source, is_guild_board=True, headers=headers)
 
             if view.is_fancy:
                 # If user supports "fancy" boards, send graphical leaderboard
-                board = await build_board(view.data, view.page, view.is_guild_board)
-                return await interaction.followup.send(view=view, file=board)
+                return await view.send_to(interaction)
             else:
                 # Otherwise, send a simple paginated text table
-                start = view.page * 10
-                end = start + 10
-                sliced = view.data[start:end]
-                # Add ranking number to each row
-                for i in range_alt(len(sliced)):
-                    sliced[i] = [f"{i+start+1}.", sliced[i][0], sliced[i][1]]
-
-                return await PaginatedTextTableEmbed.send(interaction, headers, rows, "Warcount sum for guilds")
+                return await PaginatedTextTableEmbed.send(interaction, headers, source, "Warcount sum for guilds")
 
         # Player warcount logic below
+        source = await shared_result(key, lambda: self.load_player_warcounts(range, guild_filter, names, listed_classes))
+
+        # Return early if no matching players found
+        if not source:
+            return await interaction.followup.send(embed=ErrorEmbed("No matching players found or no wars in specified range."))
+
+        # Prepare headers for the leaderboard display
+        headers = ["Rank", "Name", "Guild", *[f"{x}" for x in listed_classes], "Total"]
+
+        # Initialize WarcountBoardView for interactive pagination and display
+        view = WarcountBoardView(interaction.user.id, headers, source, listed_classes)
+
+        # Graphical leaderboard or formatted text table depending on user preferences
+        await view.send_to(interaction)
+
+
+    async def load_guild_warcounts(self, range: tuple[int, int] | None) -> ListPageSource | None:
+        """
+        Query the war totals per guild.
+
+        Args:
+            range (tuple[int, int] | None): Time range to sum wars over, None for all time.
+
+        Returns:
+            ListPageSource | None: Rows of (guild, wars), descending, or None if the query failed or found nothing.
+        """
+        query = f"""
+SELECT guild, SUM(delta) AS wars
+FROM player_delta_record
+WHERE label = 'g_wars' {"AND time BETWEEN %s AND %s" if range else ""}
+GROUP BY guild
+ORDER BY wars DESC
+LIMIT 100;
+"""
+        
+        res = await Database.fetch(query, range or ())
+        # Not shared, so the next invocation queries again
+        if not res:
+            return None
+
+        # Prepare rows for leaderboard table
+        rows = []
+        for result in res:
+            rows.append((
+                result["guild"],
+                int(result["wars"])
+            ))
+
+        return ListPageSource(rows, 10)
 
+
+    async def load_player_warcounts(
+        self,
+        range: tuple[int, int] | None,
+        guild_filter: list[str],
+        names: list[str] | None,
+        listed_classes: list[str],
+    ) -> ListPageSource | None:
+        """
+        Query the warcount of every player matching the filters, per listed class.
+
+        Args:
+            range (tuple[int, int] | None): Time range to count wars in, None for all time.
+            guild_filter (list[str]): Guild tags players must be in, empty for any guild.
+            names (list[str] | None): Lowercase player names to keep, None for every player.
+            listed_classes (list[str]): Classes to count, in column order.
+
+        Returns:
+            ListPageSource | None: Rows of (rank, name, guild tag, *class warcounts, total), descending,
+                or None if no player matches or the query failed.
+        """
         # Choose correct database table and column based on whether range filtering is used
         table_type = "cumu_warcounts" if not range else "delta_warcounts"
         table_count_column = "warcount" if not range else "warcount_diff"
@@ -133,13 +193,16 @@ ORDER BY all_wars DESC;"""
         
         # Parse and validate the 'range' argument if provided
         if range:
+            left, right = range
             query = query.replace(
                 "GROUP BY",
                 f"AND {table_type}.time >= {left} AND {table_type}.time <= {right} GROUP BY"
             )
 
-        # Execute the query
+        # Execute the query, a failed query isn't shared so the next invocation tries again
         res = await Database.fetch(query)
+        if not res:
+            return None
 
         # Map guild tags to guild names for filtering
         guild_names, _ = await guild_names_from_tags(guild_filter)
@@ -163,9 +226,8 @@ ORDER BY all_wars DESC;"""
             player_to_guild[name] = guild
             player_warcounts[name] = classes_count
 
-        # Return early if no matching players found
         if not player_warcounts:
-            return await interaction.followup.send(embed=ErrorEmbed("No matching players found or no wars in specified range."))
+            return None
 
         # Fetch guild tags for display, resolving priority if multiple tags per guild
         guild_to_tag = {}
@@ -176,13 +238,11 @@ ORDER BY all_wars DESC;"""
             res = await Database.fetch(
                 f"SELECT guild, tag, priority FROM guild_tag_name WHERE guild IN ({expanded_guilds_str})"
             )
-            for entry in res:
+            for entry in res or []:
                 current_priority = guild_to_tag.get(entry["guild"], ("", -1))[1]
                 if entry["priority"] > current_priority:
                     guild_to_tag[entry["guild"]] = (entry["tag"], entry["priority"])
 
-        # Prepare headers and rows for the leaderboard display
-        headers = ["Rank", "Name", "Guild", *[f"{x}" for x in listed_classes], "Total"]
         rows = []
 
         # Assemble rows with rank, player name, guild tag, class warcounts, and total warcount
@@ -199,34 +259,7 @@ ORDER BY all_wars DESC;"""
         # Sort rows descending by total warcount
         rows.sort(key=lambda x: x[-1], reverse=True)
 
-        # Initialize WarcountBoardView for interactive pagination and display
-        view = WarcountBoardView(interaction.user.id, headers, rows, listed_classes)
-
-        if view.is_fancy:
-            # If user supports "fancy" boards, send graphical leaderboard
-            content = await build_warcount_board(view.data, view.page, view.listed_classes)
-            await interaction.followup.send(view=view, file=content)
-        else:
-            # Otherwise, send a nicely formatted paginated text table with separators
-            start, end = view.page * 10, (view.page + 1) * 10
-            sliced = view.data[start:end]
-
-            widths = [len(h) for h in view.headers]
-            fmt = ' ┃ '.join(f'%{w}s' for w in widths)
-
-            lines = [fmt % tuple(view.headers)]
-            separator = ''.join('╋' if c == '┃' else '━' for c in lines[0])
-            lines.append(separator)
-
-            # Format each row, left-justifying cells to column widths
-            for row in sliced:
-                lines.append(' ┃ '.join(str(cell).ljust(widths[i]) for i, cell in enumerate(row)))
-
-            lines.append(separator)
-
-            # Send formatted text table inside a code block with syntax highlighting
-            content = '```isbl\n' + '\n'.join(lines) + '```'
-            await interaction.followup.send(content=content, view=view)
+        return ListPageSource(rows, 10)
 
 
 
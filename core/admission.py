@@ -0,0 +1,227 @@
+import asyncio, collections, discord, logging, time
+
+from discord import app_commands
+
+from core.config import config
+from core.interactions import acknowledge, managed_response
+
+
+# Lane name -> (commands running at once, commands allowed to wait for a slot)
+ADMISSION_LANES = {
+    "render": (config.RENDER_WORKERS * 2, 12),   # Commands rendering images in the render pool
+    "db": (6, 12),                               # Commands running heavy SQL
+    "upstream": (6, 12),                         # Commands waiting on Wynncraft / other APIs
+    "cheap": (16, 16),                           # Everything else
+}
+
+# Lane of each command, keyed by qualified command name or its root group. Unlisted commands run in the cheap lane.
+COMMAND_LANES = {
+    "map": "render",
+    "profile": "render",
+    "completion": "render",
+    "warcount": "render",
+    "graids": "render",
+    "leaderboard": "render",
+    "uniform": "render",
+    "history": "db",
+    "tickets": "db",
+    "average": "db",
+    "coolness": "db",
+    "blacklist": "db",
+    "guild": "upstream",
+    "sus": "upstream",
+    "lootpool": "upstream",
+    "aspectpool": "upstream",
+}
+
+# Seconds a queued command waits for a slot before it is shed
+ADMISSION_QUEUE_TIMEOUT = 60
+
+# Seconds between updates of the "queued, position N" message
+QUEUE_UPDATE_INTERVAL = 2
+
+# Seconds after which a slot is reclaimed even if its command never reported back
+ADMISSION_LEASE = 15 * 60
+
+BUSY_MESSAGE = "The bot is very busy right now, please try again in a minute."
+
+
+
+class AdmissionRejected(app_commands.CheckFailure):
+    """Raised when a command is shed because its lane and its queue are full."""
+    def __init__(self, message: str):
+        super().__init__(message)
+        self.message = message
+
+
+
+class Lane:
+    """
+    A concurrency limit with a bounded FIFO wait queue.
+
+    Args:
+        name (str): Lane name, for logging.
+        limit (int): Number of commands that may run at once.
+        queue_size (int): Number of commands that may wait for a slot.
+    """
+    def __init__(self, name: str, limit: int, queue_size: int):
+        self.name = name
+        self.limit = limit
+        self.queue_size = queue_size
+        self.active = 0
+        self._waiters: collections.deque[asyncio.Future] = collections.deque()
+
+
+    def try_acquire(self) -> bool:
+        """Take a slot if one is free and nobody is queued ahead."""
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            return True
+        return False
+
+
+    def enqueue(self) -> asyncio.Future | None:
+        """
+        Join the wait queue.
+
+        Returns:
+            asyncio.Future | None: Resolved once a slot is handed over, None if the queue is full.
+        """
+        if len(self._waiters) >= self.queue_size:
+            return None
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        return waiter
+
+
+    def position(self, waiter: asyncio.Future) -> int:
+        """1-based position of a waiter in the queue, 0 once it left the queue."""
+        try:
+            return self._waiters.index(waiter) + 1
+        except ValueError:
+            return 0
+
+
+    def abandon(self, waiter: asyncio.Future):
+        """Leave the queue, giving the slot back if it was handed over in the meantime."""
+        if waiter in self._waiters:
+            self._waiters.remove(waiter)
+            waiter.cancel()
+        elif waiter.done() and not waiter.cancelled():
+            self.release()
+
+
+    def release(self):
+        """Free a slot, handing it straight to the first waiter if there is one."""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(True)
+                return
+        self.active -= 1
+
+
+LANES = {name: Lane(name, limit, queue_size) for name, (limit, queue_size) in ADMISSION_LANES.items()}
+
+
+
+class Admission:
+    """A slot held by a running command, released exactly once."""
+    def __init__(self, lane: Lane):
+        self.lane = lane
+        self._released = False
+        # Reclaim the slot if the command never reports completion or failure
+        self._lease = asyncio.get_running_loop().call_later(ADMISSION_LEASE, self._expire)
+
+
+    def _expire(self):
+        if not self._released:
+            logging.warning(f"Admission lease of a {self.lane.name} command expired, reclaiming its slot")
+            self.release()
+
+
+    def release(self):
+        if self._released:
+            return
+        self._released = True
+        self._lease.cancel()
+        self.lane.release()
+
+
+
+def command_lane(interaction: discord.Interaction) -> Lane:
+    """Get the lane of the command being invoked, see `COMMAND_LANES`."""
+    command = interaction.command
+    name = command.qualified_name if command else ""
+    return LANES[COMMAND_LANES.get(name, COMMAND_LANES.get(name.split(" ")[0], "cheap"))]
+
+
+def release_admission(interaction: discord.Interaction):
+    """Free the slot held by an interaction's command, if any. Safe to call more than once."""
+    admission = interaction.extras.pop("admission", None)
+    if admission:
+        admission.release()
+
+
+async def _wait_in_queue(interaction: discord.Interaction, lane: Lane, waiter: asyncio.Future):
+    # The wait may exceed Discord's 3 second window, acknowledge on the command's behalf first
+    # (ephemerally if the command declared so, see `core.interactions.responds_ephemerally`)
+    await acknowledge(interaction)
+
+    deadline = time.monotonic() + ADMISSION_QUEUE_TIMEOUT
+    shown = None
+    while True:
+        position = lane.position(waiter)
+        if position and position != shown:
+            try:
+                await interaction.edit_original_response(content=f"⏳ Queued, position {position}...")
+                shown = position
+            except discord.HTTPException:
+                pass
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            await _clear_notice(interaction, shown)
+            raise AdmissionRejected(BUSY_MESSAGE)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), min(QUEUE_UPDATE_INTERVAL, remaining))
+            break
+        except asyncio.TimeoutError:
+            continue
+
+    await _clear_notice(interaction, shown)
+
+
+async def _clear_notice(interaction: discord.Interaction, shown: int | None):
+    # Remove the queue notice, the command (or the error handler) answers with its own followups
+    if shown:
+        try:
+            await managed_response(interaction).delete_placeholder()
+        except discord.HTTPException:
+            pass
+
+
+async def admit(interaction: discord.Interaction):
+    """
+    Take a slot in the lane of the command being invoked, limiting how many commands of each lane run at once.
+
+    Commands over their lane's limit wait in a bounded queue, showing their position, and are shed with
+    a friendly message when the queue is full or the wait takes too long. Called for every command by
+    `core.tree.ValorCommandTree`, after the rate limit so users over it never take a queue spot.
+
+    Raises:
+        AdmissionRejected: If the lane's queue is full or the wait timed out.
+    """
+    lane = command_lane(interaction)
+
+    if not lane.try_acquire():
+        waiter = lane.enqueue()
+        if waiter is None:
+            raise AdmissionRejected(BUSY_MESSAGE)
+        try:
+            await _wait_in_queue(interaction, lane, waiter)
+        except BaseException:
+            lane.abandon(waiter)
+            raise
+
+    interaction.extras["admission"] = Admission(lane)
@@ -1,23 +1,32 @@
 import discord, time
 
 from discord import app_commands
-from collections import defaultdict, deque
 
 
-# Max number of allowed calls per user per minute
+# Max number of allowed calls per user per minute, for commands of cost 1
 MAX_CALLS_PER_MINUTE = 10
 
+# Length of the sliding window (in seconds)
+RATE_WINDOW = 60
+
 # Duration for which a user is locked out after exceeding the limit (in seconds)
 LOCK_DURATION = 180  # 3 minutes
 
-# Tracks timestamps of recent command calls per user (deque to keep last 11 timestamps)
-command_usage = defaultdict(lambda: deque(maxlen=11))
+# How often idle users and expired locks are dropped (in seconds)
+SWEEP_INTERVAL = 300
 
-# List of users currently locked out from using commands
-locked_users = []
+# How much of the per-minute budget a command uses, keyed by qualified command name or its root group.
+# Commands rendering images or hitting several APIs cost more than cheap lookups; anything unlisted costs 1.
+COMMAND_COSTS = {
+    "map": 3,
+    "profile": 2,
+    "completion": 2,
+    "warcount": 2,
+    "graids": 2,
+    "leaderboard": 2,
+    "uptime": 0.5,
+}
 
-# Maps user_id to the lock expiry timestamp
-lock_expiry = {}
 
 
 class RateLimitExceeded(app_commands.CheckFailure):
@@ -27,46 +36,124 @@ class RateLimitExceeded(app_commands.CheckFailure):
         self.message = message
 
 
-def rate_limit_check():
-    """Decorator factory for Discord app commands that rate-limits usage per user."""
-    
-    def predicate(interaction: discord.Interaction) -> bool:
-        user_id = interaction.user.id
-        now = time.time()
-
-        # Unlock user if lock has expired
-        if user_id in lock_expiry and now > lock_expiry[user_id]:
-            locked_users.remove(user_id)
-            del lock_expiry[user_id]
-
-        # If user is locked, raise error with remaining lock time
-        if user_id in locked_users:
-            remaining = int(lock_expiry[user_id] - now)
-            minutes, seconds = divmod(remaining, 60)
-            formatted = f"{minutes}m {seconds}s" if minutes else f"{seconds}s"
-            raise RateLimitExceeded(
-                f"You're currently locked out due to too many commands. Try again in {formatted}."
-            )
-
-        # Record current command usage timestamp for user
-        usage = command_usage[user_id]
-        usage.append(now)
-
-        # Clean up timestamps older than 1 hour
-        while usage and now - usage[0] > 3600:
-            usage.popleft()
-
-        # Count how many calls were made in the last 60 seconds
-        calls_last_minute = [t for t in usage if now - t <= 60]
-
-        # If user exceeded max calls per minute, lock them out
-        if len(calls_last_minute) > MAX_CALLS_PER_MINUTE:
-            locked_users.append(user_id)
-            lock_expiry[user_id] = now + LOCK_DURATION
-            raise RateLimitExceeded(
-                f"Too many commands — you've been locked out for {LOCK_DURATION // 60} minutes."
-            )
-
-        return True
-
-    return app_commands.check(predicate)
+
+class RateLimiter:
+    """
+    Per-user sliding window limiter with lockouts, using constant time and memory per user.
+
+    Instead of keeping every call timestamp, each user has the cost spent in the current and the previous
+    fixed window. The sliding window estimate weighs the previous window by how much of it still overlaps
+    the last `window` seconds. Users idle for two windows and expired locks are swept periodically, so memory
+    only grows with the number of recently active users.
+
+    Args:
+        limit (float): Cost allowed per window.
+        window (float): Window length in seconds.
+        lock_duration (float): Seconds a user is locked out after exceeding the limit.
+        sweep_interval (float): Seconds between sweeps of idle users.
+    """
+    def __init__(
+        self,
+        limit: float,
+        window: float = RATE_WINDOW,
+        lock_duration: float = LOCK_DURATION,
+        sweep_interval: float = SWEEP_INTERVAL,
+    ):
+        self.limit = limit
+        self.window = window
+        self.lock_duration = lock_duration
+        self.sweep_interval = sweep_interval
+
+        self._usage: dict[int, list] = {}    # user_id -> [window index, current cost, previous cost]
+        self._locks: dict[int, float] = {}   # user_id -> lock expiry timestamp
+        self._next_sweep = 0.0
+
+
+    def lock_remaining(self, user_id: int, now: float) -> float:
+        """
+        Seconds left on a user's lockout, 0 if they aren't locked (an expired lock is lifted).
+        """
+        expiry = self._locks.get(user_id)
+        if expiry is None:
+            return 0
+        if now >= expiry:
+            del self._locks[user_id]
+            return 0
+        return expiry - now
+
+
+    def hit(self, user_id: int, cost: float, now: float) -> bool:
+        """
+        Record a call and lock the user out if it takes them over the limit.
+
+        Returns:
+            bool: True if the call exceeded the limit (the user is now locked).
+        """
+        if now >= self._next_sweep:
+            self.sweep(now)
+
+        index = int(now // self.window)
+        usage = self._usage.get(user_id)
+        if usage is None:
+            usage = self._usage[user_id] = [index, 0.0, 0.0]
+        elif usage[0] != index:
+            # Roll the windows forward, anything older than the previous window no longer counts
+            usage[2] = usage[1] if usage[0] == index - 1 else 0.0
+            usage[1] = 0.0
+            usage[0] = index
+
+        usage[1] += cost
+        overlap = 1 - (now % self.window) / self.window
+        if usage[2] * overlap + usage[1] > self.limit:
+            self._locks[user_id] = now + self.lock_duration
+            return True
+        return False
+
+
+    def sweep(self, now: float):
+        """Drop users without calls in the last two windows and locks that have expired."""
+        index = int(now // self.window)
+        self._usage = {user_id: usage for user_id, usage in self._usage.items() if usage[0] >= index - 1}
+        self._locks = {user_id: expiry for user_id, expiry in self._locks.items() if expiry > now}
+        self._next_sweep = now + self.sweep_interval
+
+
+# Shared by every command, see `check_rate_limit`
+limiter = RateLimiter(MAX_CALLS_PER_MINUTE)
+
+
+
+def command_cost(interaction: discord.Interaction) -> float:
+    """Get the budget cost of the command being invoked, see `COMMAND_COSTS`."""
+    command = interaction.command
+    if command is None:
+        return 1
+    name = command.qualified_name
+    return COMMAND_COSTS.get(name, COMMAND_COSTS.get(name.split(" ")[0], 1))
+
+
+def check_rate_limit(interaction: discord.Interaction):
+    """
+    Charge the invoking user for a command, rate-limiting usage per user.
+    Called for every command by `core.tree.ValorCommandTree`.
+
+    Raises:
+        RateLimitExceeded: If the user is locked out, or this command took them over the limit.
+    """
+    user_id = interaction.user.id
+    now = time.time()
+
+    # If user is locked, raise error with remaining lock time
+    remaining = limiter.lock_remaining(user_id, now)
+    if remaining:
+        minutes, seconds = divmod(int(remaining), 60)
+        formatted = f"{minutes}m {seconds}s" if minutes else f"{seconds}s"
+        raise RateLimitExceeded(
+            f"You're currently locked out due to too many commands. Try again in {formatted}."
+        )
+
+    # Record the call, locking the user out if it takes them over the limit
+    if limiter.hit(user_id, command_cost(interaction), now):
+        raise RateLimitExceeded(
+            f"Too many commands — you've been locked out for {LOCK_DURATION // 60} minutes."
+        )
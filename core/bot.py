@@ -3,7 +3,12 @@ from discord.ext import commands
 
 from core.config import config
 from core.logging import setup_logging
+from core.render_pool import RenderPool
+from core.tree import ValorCommandTree
 from database import Database
+from util.assets import preload as preload_assets
+from util.badges import BadgeStore
+from util.map_render import SharedMapLayers
 
 
 
@@ -32,6 +37,7 @@ class ValorBot(commands.Bot):
             command_prefix=None,  # Slash-only, no text prefix at all
             intents=intents,
             help_command=None,  # Disables the default text help command
+            tree_cls=ValorCommandTree,  # Defers slow commands automatically
             log_handler=None,   # Logging handled externally
             allowed_mentions=discord.AllowedMentions(roles=True)  # Only allow role mentions
         )
@@ -45,10 +51,17 @@ class ValorBot(commands.Bot):
         - Loads all extensions (command modules and listeners).
         - Syncs slash commands globally.
         - Initializes the database connection pool.
+        - Downloads missing leaderboard badges.
+        - Preloads static render assets (fonts, templates, icons).
+        - Shares the decoded base map with render workers and starts them.
         """
         await self.load_extensions()
         await self.tree.sync()
         await Database.init_pool()
+        await BadgeStore.prefetch()
+        preload_assets()
+        SharedMapLayers.init()
+        await RenderPool.init_pool()
 
 
     async def load_extensions(self):
@@ -84,11 +97,14 @@ class ValorBot(commands.Bot):
             "commands.utilities",
             "commands.warcount",
             # Event listeners
+            "listeners.admission",
             "listeners.command_logger",
             "listeners.errors",
             # Background services
             "services.weekly_ticket_post",
-            "services.territory_tracker"
+            "services.territory_tracker",
+            "services.guild_prefetch",
+            "services.map_refresh"
         ]
 
         for ext in extensions:
@@ -126,9 +142,11 @@ class ValorBot(commands.Bot):
         """
         Gracefully closes the bot.
         
-        - Closes the database pool before shutting down the bot.
+        - Closes the database pool, render workers and shared map layers before shutting down the bot.
         """
         await Database.close_pool()
+        await RenderPool.close_pool()
+        SharedMapLayers.close()
         await super().close()
 
 
@@ -16,6 +16,12 @@ class Config:
     # Boolean flag to indicate if the bot is in testing mode
     TESTING = os.getenv("TESTING", "false").lower() == "true"
 
+    # Number of worker processes used for image rendering, defaults to one less than the CPU count
+    RENDER_WORKERS = int(os.getenv("RENDER_WORKERS", max(1, (os.cpu_count() or 2) - 1)))
+
+    # Per image kind encoder profile overrides, e.g. {"map": "png_quantized"} (JSON object in env)
+    IMAGE_ENCODING = json.loads(os.getenv("IMAGE_ENCODING", "{}"))
+
     # Database connection parameters
     DB_HOST = os.getenv("DATABASE_HOST")
     DB_PORT = int(os.getenv("DATABASE_PORT", 3306))  # default MySQL port
@@ -0,0 +1,109 @@
+import asyncio, contextvars, discord, time
+
+from discord import app_commands
+
+
+# Seconds a command may run before its remaining work is abandoned. Users give up long before that.
+COMMAND_DEADLINE = 180
+
+# Seconds an interaction token stays valid, nothing can be sent for the interaction afterwards
+INTERACTION_LIFETIME = 15 * 60
+
+DEADLINE_MESSAGE = "This command took too long and was cancelled, please try again later."
+
+# Monotonic timestamp by which the current command must be done, None outside commands
+_deadline: contextvars.ContextVar[float | None] = contextvars.ContextVar("deadline", default=None)
+
+
+
+class DeadlineExceeded(app_commands.AppCommandError):
+    """Raised when a command's deadline passes before its work is done."""
+    def __init__(self, message: str = DEADLINE_MESSAGE):
+        super().__init__(message)
+        self.message = message
+
+
+
+def set_deadline(seconds: float) -> contextvars.Token:
+    """
+    Set the deadline of the current context, i.e. the running command and every task it starts.
+
+    Returns:
+        contextvars.Token: Pass to `reset_deadline` to restore the previous deadline.
+    """
+    return _deadline.set(time.monotonic() + seconds)
+
+
+def reset_deadline(token: contextvars.Token):
+    """Restore the deadline that was in place before `set_deadline`."""
+    _deadline.reset(token)
+
+
+def interaction_deadline(interaction: discord.Interaction) -> float:
+    """Seconds a command invoked by `interaction` may run: `COMMAND_DEADLINE`, or less if its token expires sooner."""
+    age = (discord.utils.utcnow() - interaction.created_at).total_seconds()
+    return min(COMMAND_DEADLINE, INTERACTION_LIFETIME - age)
+
+
+def remaining() -> float | None:
+    """Seconds left until the current deadline, None if there is none."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def expired() -> bool:
+    """Whether the current deadline has passed."""
+    left = remaining()
+    return left is not None and left <= 0
+
+
+def timeout(default: float | None = None) -> float | None:
+    """
+    Get the timeout for an operation: its own `default`, shortened to what is left of the current deadline.
+
+    Raises:
+        DeadlineExceeded: If the deadline has already passed, so no new work is started.
+    """
+    left = remaining()
+    if left is None:
+        return default
+    if left <= 0:
+        raise DeadlineExceeded()
+    return left if default is None else min(default, left)
+
+
+async def bounded(aw, default: float | None = None):
+    """
+    Await `aw`, cancelling it after `timeout(default)` seconds.
+
+    Raises:
+        DeadlineExceeded: If it was cancelled because the current deadline passed.
+        asyncio.TimeoutError: If it was cancelled because `default` passed first.
+    """
+    try:
+        limit = timeout(default)
+    except DeadlineExceeded:
+        if asyncio.iscoroutine(aw):
+            aw.close()
+        raise
+
+    try:
+        return await asyncio.wait_for(aw, limit)
+    except asyncio.TimeoutError:
+        # The limit was the deadline's rather than the operation's own
+        if default is None or limit < default:
+            raise DeadlineExceeded() from None
+        raise
+
+
+def detached(coro) -> asyncio.Task:
+    """
+    Start a task outside of the current deadline, for work shared with other commands
+    (e.g. single-flight loads) that must not be cut short when the command starting it gives up.
+    """
+    context = contextvars.copy_context()
+    context.run(_deadline.set, None)
+    # Tasks copy the context they are created in
+    return context.run(asyncio.ensure_future, coro)
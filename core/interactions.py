@@ -0,0 +1,204 @@
+import asyncio, discord, logging
+
+
+# Seconds a handler gets to respond before the interaction is deferred on its behalf.
+# Discord drops interactions that aren't acknowledged within 3 seconds, this leaves room for the round trip.
+AUTO_DEFER_AFTER = 2.0
+
+# Auto-defers in flight, referenced so they aren't garbage collected mid-request
+_auto_defers: set[asyncio.Task] = set()
+
+
+class ManagedResponse(discord.InteractionResponse):
+    """
+    Interaction response that can be acknowledged by bot-wide middleware before the handler responds.
+
+    Once `acknowledge` deferred an interaction on the handler's behalf, the handler's own `defer()`
+    becomes a no-op, `send_message()` is sent as a followup and `edit_message()` edits the original
+    message, so handlers work unchanged whether or not something acknowledged them first. Both return
+    the message that was sent or edited.
+
+    Commands declaring an ephemeral response are deferred ephemerally (see `responds_ephemerally`),
+    and a reply whose visibility differs from the deferral's is sent as a new message instead of
+    replacing the "thinking" one, so e.g. ephemeral errors of public commands stay ephemeral.
+    """
+    __slots__ = ("_acknowledged", "_lock", "_ephemeral", "_placeholder")
+
+    def __init__(self, parent: discord.Interaction):
+        super().__init__(parent)
+        self._acknowledged = False
+        # Held while the initial response is being sent, so the handler and middleware never both send one
+        self._lock = asyncio.Lock()
+        # Visibility of the deferred response, and whether its "thinking" message is still waiting to be replaced
+        self._ephemeral = False
+        self._placeholder = False
+
+
+    @property
+    def acknowledged(self) -> bool:
+        """Whether the interaction was deferred by middleware rather than by the handler."""
+        return self._acknowledged
+
+
+    @property
+    def settled(self) -> bool:
+        """Whether a response was sent or is being sent, i.e. middleware must not acknowledge anymore."""
+        return self.is_done() or self._lock.locked()
+
+
+    async def delete_placeholder(self):
+        """
+        Delete the "thinking" message left by `acknowledge`, if the handler didn't replace it yet.
+        The next followup is then sent as a new message, with its own visibility.
+        """
+        if self._placeholder:
+            self._placeholder = False
+            await self._parent.delete_original_response()
+
+
+    async def defer(self, **kwargs):
+        async with self._lock:
+            if not self._acknowledged:
+                return await super().defer(**kwargs)
+            # Handlers that defer answer through `followup` directly, which replaces the "thinking" message
+            self._placeholder = False
+
+
+    async def send_message(self, content=None, **kwargs):
+        async with self._lock:
+            if not self._acknowledged:
+                return await super().send_message(content, **kwargs)
+
+        # The first followup takes over the "thinking" message along with its visibility,
+        # drop it when the handler asked for the other one (e.g. an ephemeral error of a public command)
+        if kwargs.get("ephemeral", False) != self._ephemeral:
+            await self.delete_placeholder()
+        self._placeholder = False
+
+        # Followups don't support delete_after, delete the message ourselves
+        delete_after = kwargs.pop("delete_after", None)
+        message = await self._parent.followup.send(content, wait=True, **kwargs)
+        if delete_after is not None:
+            await message.delete(delay=delete_after)
+        return message
+
+
+    async def edit_message(self, **kwargs):
+        async with self._lock:
+            if not self._acknowledged:
+                return await super().edit_message(**kwargs)
+
+        # A deferred component interaction edits its message through the original response
+        delete_after = kwargs.pop("delete_after", None)
+        kwargs.pop("suppress_embeds", None)
+        message = await self._parent.edit_original_response(**kwargs)
+        if delete_after is not None:
+            await message.delete(delay=delete_after)
+        return message
+
+
+    async def send_modal(self, modal: discord.ui.Modal, /):
+        async with self._lock:
+            return await super().send_modal(modal)
+
+
+
+def managed_response(interaction: discord.Interaction) -> ManagedResponse:
+    """
+    Get the interaction's response as a `ManagedResponse`, swapping it in if needed.
+
+    Must be called before the handler reads `interaction.response`, e.g. from a check.
+    """
+    response = interaction.response
+    if isinstance(response, ManagedResponse):
+        return response
+
+    managed = ManagedResponse(interaction)
+    managed._response_type = response._response_type
+    interaction._cs_response = managed
+    return managed
+
+
+def responds_ephemerally(interaction: discord.Interaction) -> bool:
+    """
+    Whether the invoked command declared that it answers ephemerally.
+
+    Usage:
+        @app_commands.command(name="...", description="...", extras={"ephemeral": True})
+    """
+    command = interaction.command
+    return bool(command and command.extras.get("ephemeral"))
+
+
+async def acknowledge(interaction: discord.Interaction, ephemeral: bool | None = None) -> bool:
+    """
+    Defer an interaction on behalf of the handler that will answer it.
+
+    Commands get a "thinking" response, components a silent deferred update of their message.
+
+    Args:
+        interaction (discord.Interaction): The interaction to acknowledge.
+        ephemeral (bool, optional): Whether the deferred command response is ephemeral,
+            defaults to what the command declared (see `responds_ephemerally`).
+
+    Returns:
+        bool: True if it was deferred, False if a response was already sent or is being sent.
+    """
+    response = managed_response(interaction)
+    if response.settled:
+        return False
+
+    async with response._lock:
+        if response.is_done():
+            return False
+        if ephemeral is None:
+            ephemeral = responds_ephemerally(interaction)
+        await discord.InteractionResponse.defer(response, ephemeral=ephemeral)
+        response._acknowledged = True
+        response._ephemeral = ephemeral
+        response._placeholder = response.type is discord.InteractionResponseType.deferred_channel_message
+    return True
+
+
+async def _auto_defer(interaction: discord.Interaction):
+    try:
+        if await acknowledge(interaction):
+            logging.debug(f"Auto-deferred interaction {interaction.id}")
+    except discord.HTTPException as e:
+        # The interaction expired or was answered in the meantime, the handler's own response reports that
+        logging.debug(f"Failed to auto-defer interaction {interaction.id}: {e}")
+
+
+def schedule_auto_defer(interaction: discord.Interaction, delay: float = AUTO_DEFER_AFTER) -> asyncio.TimerHandle:
+    """
+    Defer an interaction if its handler hasn't started responding within `delay` seconds.
+
+    The interaction's response is swapped for a `ManagedResponse` right away, so whatever the
+    handler sends afterwards is routed to the deferred response.
+
+    Returns:
+        asyncio.TimerHandle: Cancel it once the handler returned.
+    """
+    managed_response(interaction)
+
+    def fire():
+        if interaction.response.settled:
+            return
+        task = asyncio.create_task(_auto_defer(interaction))
+        _auto_defers.add(task)
+        task.add_done_callback(_auto_defers.discard)
+
+    return asyncio.get_running_loop().call_later(delay, fire)
+
+
+
+class AutoDeferView(discord.ui.View):
+    """
+    View whose component callbacks are deferred automatically when they take too long to respond,
+    see `schedule_auto_defer`. Deferring a component interaction is invisible to the user, so the
+    timer is simply left running.
+    """
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        schedule_auto_defer(interaction)
+        return True
@@ -0,0 +1,166 @@
+import asyncio, importlib, logging, multiprocessing
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+from core import deadline
+from core.config import config
+from core.deadline import DeadlineExceeded
+
+
+# Renderer names mapped to "module:function" paths, resolved lazily inside the worker processes.
+# Every renderer takes plain serializable keyword arguments and returns encoded image bytes
+# (a list of them for batched jobs, or nothing for jobs that only update shared memory).
+RENDERERS = {
+    "board": "util.board:render_board",
+    "warcount_board": "util.board:render_warcount_board",
+    "profile": "commands.profile:render_profile_card",
+    "map": "util.map_render:render_map",
+    "map_routes": "util.map_render:render_map_routes",
+    "map_frame": "util.map_render:render_map_frame",
+    "uniform": "commands.uniform:render_uniform",
+    "busts": "util.skins:render_busts",
+    "guild_banners": "util.guild_icons:render_guild_banners",
+}
+
+# Seconds a single render may take before the caller gives up on it
+RENDER_TIMEOUT = 30
+
+# How many jobs may be waiting per worker before new jobs are rejected
+QUEUED_JOBS_PER_WORKER = 4
+
+
+
+class RenderError(Exception):
+    """Base class for errors raised by the render pool. The message is safe to show to users."""
+    def __init__(self, message: str):
+        super().__init__(message)
+        self.message = message
+
+
+class RenderQueueFull(RenderError):
+    """Raised when too many renders are already waiting for a worker."""
+    pass
+
+
+class RenderTimeout(RenderError):
+    """Raised when a render doesn't finish within its timeout."""
+    pass
+
+
+
+def _init_worker():
+    """
+    Initializer run once in every worker process.
+
+    Preloads all static assets so jobs never have to decode fonts, templates or icons.
+    """
+    from util.assets import preload
+    preload()
+
+
+def _warm_up() -> bool:
+    # No-op job used to force every worker process to start (and preload) at boot
+    return True
+
+
+def _run_job(renderer: str, payload: dict) -> Any:
+    """
+    Resolve a renderer by name and run it with the given payload.
+
+    This is the entry point executed inside the worker processes.
+    """
+    module_name, func_name = RENDERERS[renderer].split(":")
+    func = getattr(importlib.import_module(module_name), func_name)
+    return func(**payload)
+
+
+
+class RenderPool:
+    _executor = None  # Class-level variable to hold the process pool
+    _workers = 0
+    _pending = 0      # Jobs submitted but not yet finished
+
+
+    @classmethod
+    async def init_pool(cls, workers: int | None = None):
+        """
+        Start the render worker processes and wait for all of them to be warm.
+        This should be called once when the bot starts.
+
+        Args:
+            workers (int, optional): Number of worker processes (defaults to `config.RENDER_WORKERS`).
+        """
+        cls._workers = workers or config.RENDER_WORKERS
+        logging.info(f"Starting {cls._workers} render workers...")
+
+        cls._executor = ProcessPoolExecutor(
+            max_workers=cls._workers,
+            mp_context=multiprocessing.get_context(),  # Follows the start method chosen in main.py
+            initializer=_init_worker,
+        )
+
+        # Workers are spawned on demand, so submit one warm-up job per worker up front
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(cls._executor, _warm_up) for _ in range(cls._workers)))
+        logging.info("Render workers ready.")
+
+
+    @classmethod
+    async def close_pool(cls):
+        """
+        Shut the worker processes down.
+        This should be called when the bot is shutting down.
+        """
+        if cls._executor:
+            cls._executor.shutdown(wait=False, cancel_futures=True)
+            cls._executor = None
+            logging.info("Render workers stopped.")
+
+
+    @classmethod
+    async def render(cls, renderer: str, timeout: float = RENDER_TIMEOUT, **payload) -> bytes:
+        """
+        Run a renderer in a worker process and return its encoded output.
+
+        Args:
+            renderer (str): Name of the renderer, see `RENDERERS`.
+            timeout (float): Seconds to wait before giving up on the job, shortened to the command's deadline.
+            **payload: Plain serializable keyword arguments passed to the renderer.
+
+        Returns:
+            bytes: The encoded image.
+
+        Raises:
+            RenderQueueFull: If the pool's queue is already full.
+            RenderTimeout: If the job didn't complete in time.
+            DeadlineExceeded: If the command's deadline passed first.
+        """
+        if renderer not in RENDERERS:
+            raise KeyError(f"Unknown renderer '{renderer}'")
+
+        if cls._executor is None:
+            # No pool (e.g. scripts or tests), still keep the work off the event loop
+            return await asyncio.to_thread(_run_job, renderer, payload)
+
+        if cls._pending >= cls._workers * (QUEUED_JOBS_PER_WORKER + 1):
+            raise RenderQueueFull("The bot is busy rendering images right now, please try again in a moment.")
+
+        # Don't queue work for a command that already gave up
+        deadline.timeout()
+
+        cls._pending += 1
+        future = cls._executor.submit(_run_job, renderer, payload)
+        try:
+            return await deadline.bounded(asyncio.wrap_future(future), timeout)
+        except asyncio.TimeoutError:
+            # Drops the job if it never started, a running job finishes in the background
+            future.cancel()
+            logging.warning(f"Render job '{renderer}' timed out after {timeout}s")
+            raise RenderTimeout("Rendering the image took too long, please try again later.")
+        except (DeadlineExceeded, asyncio.CancelledError):
+            # The command was abandoned, free the worker for others if the job is still queued
+            future.cancel()
+            raise
+        finally:
+            cls._pending -= 1
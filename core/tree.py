@@ -0,0 +1,50 @@
+import discord
+
+from discord import app_commands
+
+from core.admission import admit
+from core.antispam import check_rate_limit
+from core.deadline import bounded, interaction_deadline, reset_deadline, set_deadline
+from core.interactions import schedule_auto_defer
+
+
+
+class ValorCommandTree(app_commands.CommandTree):
+    """
+    Command tree that defers slash commands automatically when their handler doesn't respond in time,
+    and cancels them once their deadline passes.
+
+    Handlers may do slow network or database work before their first response, the tree makes sure
+    Discord is acknowledged within its 3 second window and their later `interaction.response` calls
+    are routed to followups, see `core.interactions.ManagedResponse`.
+
+    Every command runs under a deadline (see `core.deadline`) that HTTP requests, queries and renders
+    shorten their own timeouts to. A command still running when it passes is cancelled, so abandoned
+    commands stop holding connections, render jobs and admission slots.
+
+    Every command is also rate limited per user (see `core.antispam`) and admitted into its lane
+    (see `core.admission`) before it runs, so no command can skip either by forgetting a decorator.
+    """
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.type is not discord.InteractionType.application_command:
+            return True
+
+        # Rate limit first, so users over their limit never take a queue spot
+        check_rate_limit(interaction)
+        await admit(interaction)
+        return True
+
+    async def _call(self, interaction: discord.Interaction):
+        # Autocomplete requests can't be deferred, they have to answer by themselves
+        if interaction.type is not discord.InteractionType.application_command:
+            return await super()._call(interaction)
+
+        timer = schedule_auto_defer(interaction)
+        token = set_deadline(interaction_deadline(interaction))
+        try:
+            # Raises DeadlineExceeded when the command is cancelled, reported by the error handler
+            await bounded(super()._call(interaction))
+        finally:
+            reset_deadline(token)
+            timer.cancel()
@@ -1,8 +1,10 @@
-import aiomysql, logging
+import aiomysql, asyncio, contextlib, logging
 
 from pymysql.err import OperationalError
 
+from core import deadline
 from core.config import config
+from core.deadline import DeadlineExceeded
 
 
 
@@ -42,6 +44,21 @@ class Database:
             logging.info("Database connection pool closed.")
 
 
+    @classmethod
+    @contextlib.asynccontextmanager
+    async def _connection(cls):
+        """
+        Acquire a connection from the pool, closing it instead of returning it if its query was cancelled.
+        """
+        async with cls._pool.acquire() as conn:
+            try:
+                yield conn
+            except (asyncio.CancelledError, DeadlineExceeded):
+                # The query may still be running and its result would be read by the next user of the connection
+                conn.close()
+                raise
+
+
     @classmethod
     async def fetch(cls, query, args=None, retry: bool = True):
         """
@@ -55,11 +72,15 @@ class Database:
         Returns:
             List[Dict]: List of rows, each row is a dictionary mapping column names to values.
         """
-        try:
-            async with cls._pool.acquire() as conn:
+        async def run():
+            async with cls._connection() as conn:
                 async with conn.cursor(aiomysql.DictCursor) as cur:
                     await cur.execute(query, args or ())
                     return await cur.fetchall()
+
+        try:
+            # Commands give up waiting for a connection or the result at their deadline
+            return await deadline.bounded(run())
         except OperationalError:
             if retry:
                 logging.warning(f"Retrying SQL query: {query}")
@@ -82,10 +103,13 @@ class Database:
         Returns:
             Dict or None: A single row as a dictionary or None if no row found.
         """
-        async with cls._pool.acquire() as conn:
-            async with conn.cursor(aiomysql.DictCursor) as cur:
-                await cur.execute(query, args or ())
-                return await cur.fetchone()
+        async def run():
+            async with cls._connection() as conn:
+                async with conn.cursor(aiomysql.DictCursor) as cur:
+                    await cur.execute(query, args or ())
+                    return await cur.fetchone()
+
+        return await deadline.bounded(run())
 
 
     @classmethod
@@ -100,8 +124,11 @@ class Database:
         Returns:
             int: The last inserted row ID (if applicable), or 0.
         """
-        async with cls._pool.acquire() as conn:
-            async with conn.cursor() as cur:
-                await cur.execute(query, args or ())
-                return cur.lastrowid
+        async def run():
+            async with cls._connection() as conn:
+                async with conn.cursor() as cur:
+                    await cur.execute(query, args or ())
+                    return cur.lastrowid
+
+        return await deadline.bounded(run())
 
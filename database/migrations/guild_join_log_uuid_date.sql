@@ -0,0 +1,4 @@
+-- Index used to look up the latest guild of players (util.guilds.player_guild_from_uuid and
+-- player_guilds_from_uuids). Both read only the newest join log row of each player through it,
+-- instead of scanning and sorting every row the player ever logged.
+ALTER TABLE guild_join_log ADD INDEX idx_guild_join_log_uuid_date (uuid, date);
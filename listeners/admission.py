@@ -0,0 +1,29 @@
+import discord
+
+from discord.ext import commands
+from discord import app_commands
+
+from core.admission import release_admission
+
+
+class AdmissionListener(commands.Cog):
+    """
+    Frees the admission slot of every command that completes. Failed commands are handled by the error handler.
+    """
+
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+
+    @commands.Cog.listener()
+    async def on_app_command_completion(
+        self,
+        interaction: discord.Interaction,
+        command: app_commands.Command
+    ):
+        release_admission(interaction)
+
+
+
+# Cog setup function for bot
+async def setup(bot: commands.Bot):
+    await bot.add_cog(AdmissionListener(bot))
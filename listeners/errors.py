@@ -1,6 +1,9 @@
 import discord, logging, traceback
 
+from core.admission import AdmissionRejected, release_admission
 from core.antispam import RateLimitExceeded
+from core.deadline import DeadlineExceeded
+from core.render_pool import RenderError
 from discord.ext import commands
 from util.embeds import ErrorEmbed
 
@@ -14,9 +17,23 @@ async def on_app_command_error(interaction: discord.Interaction, error: discord.
         interaction (discord.Interaction): The interaction that caused the error.
         error (discord.app_commands.AppCommandError): The error raised during command execution.
     """
-    # Handle known RateLimitExceeded errors with a user-friendly message
-    if isinstance(error, RateLimitExceeded):
+    # The command is over, let the next queued one run
+    release_admission(interaction)
+
+    # Errors raised inside a command body arrive wrapped in CommandInvokeError
+    original = getattr(error, "original", error)
+
+    # Handle known RateLimitExceeded and AdmissionRejected errors with a user-friendly message
+    if isinstance(error, (RateLimitExceeded, AdmissionRejected)):
         embed = ErrorEmbed(error.message)
+    # The command was cancelled at its deadline, usually because an upstream API or the database is stuck
+    elif isinstance(original, DeadlineExceeded):
+        logging.warning(f"A {interaction.command.qualified_name if interaction.command else 'unknown'} command exceeded its deadline")
+        embed = ErrorEmbed(original.message)
+    # Render pool busy or timed out, nothing to report as a bug
+    elif isinstance(original, RenderError):
+        logging.warning(f"Render failed for a {error.command} command: {original.message}")
+        embed = ErrorEmbed(original.message)
     else:
         # Log full traceback of unexpected errors for debugging
         logging.error(f"An error occurred while executing a {error.command} command:")
@@ -28,12 +45,16 @@ async def on_app_command_error(interaction: discord.Interaction, error: discord.
             footer="Please contact ANO and report this bug"
         )
 
-    # Send the error embed as a followup if the original response was already sent
-    if interaction.response.is_done():
-        await interaction.followup.send(embed=embed)
-    else:
-        # Otherwise send the response message with the error embed, ephemeral for privacy
-        await interaction.response.send_message(embed=embed, ephemeral=True)
+    try:
+        # Send the error embed as a followup if the original response was already sent
+        if interaction.response.is_done():
+            await interaction.followup.send(embed=embed)
+        else:
+            # Otherwise send the response message with the error embed, ephemeral for privacy
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+    except discord.NotFound:
+        # The interaction expired, there is nobody left to tell
+        pass
 
 
 
@@ -32,7 +32,8 @@ if __name__ == "__main__":
     directories = [
         "storages",                  # Root storage folder
         "storages/user_settings",    # Per-user configuration/settings
-        "storages/guild_settings"    # Per-guild configuration/settings
+        "storages/guild_settings",   # Per-guild configuration/settings
+        "storages/guild_icons"       # Banners rendered for guilds without a bundled icon
     ]
 
     # Create directories
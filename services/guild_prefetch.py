@@ -0,0 +1,58 @@
+import logging, asyncio
+
+from discord.ext import commands, tasks
+
+from core.settings import SettingsManager
+from util.guilds import get_guild_data, GUILD_DATA_TTL
+
+
+# Refresh a bit before cached payloads expire so default-guild lookups never miss
+PREFETCH_INTERVAL = GUILD_DATA_TTL - 30
+
+
+
+class GuildPrefetchService(commands.Cog):
+    """
+    Keeps the guild data cache warm for the default guild configured in each Discord server,
+    so `/guild` subcommands run without arguments return without waiting on the Wynncraft API.
+    """
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+        # Start the repeating prefetch task
+        self.guild_prefetch_loop.start()
+
+
+    def cog_unload(self):
+        # Cancel the task when the cog is unloaded (bot shutdown/reload)
+        self.guild_prefetch_loop.cancel()
+
+
+    @tasks.loop(seconds=PREFETCH_INTERVAL)
+    async def guild_prefetch_loop(self):
+        # Collect the distinct default guilds across every server the bot is in
+        guild_names = set()
+        for server in self.bot.guilds:
+            settings = SettingsManager("guild", server.id)
+            if settings.get("guild_name") and settings.get("guild_tag"):
+                guild_names.add(settings.get("guild_name"))
+
+        results = await asyncio.gather(
+            *(get_guild_data(name, refresh=True) for name in guild_names),
+            return_exceptions=True
+        )
+
+        for name, result in zip(guild_names, results):
+            if isinstance(result, Exception):
+                logging.warning(f"Guild Prefetch: failed to refresh {name}: {result}")
+
+
+    @guild_prefetch_loop.before_loop
+    async def before_guild_prefetch_loop(self):
+        # Wait for the bot to be fully ready so the server list is populated
+        await self.bot.wait_until_ready()
+
+
+
+# Cog setup function for bot
+async def setup(bot: commands.Bot):
+    await bot.add_cog(GuildPrefetchService(bot))
@@ -0,0 +1,45 @@
+import logging
+
+from discord.ext import commands, tasks
+
+from core.render_pool import RenderError
+from util.map_render import MapEngine, MapDataError, MAP_REFRESH_INTERVAL
+
+
+
+class MapRefreshService(commands.Cog):
+    """
+    Refreshes the territory data behind `/map` on a fixed interval, so the live map frame is
+    redrawn incrementally in the background instead of from scratch on every command.
+    """
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+        # Start the repeating refresh task
+        self.map_refresh_loop.start()
+
+
+    def cog_unload(self):
+        # Cancel the task when the cog is unloaded (bot shutdown/reload)
+        self.map_refresh_loop.cancel()
+
+
+    @tasks.loop(seconds=MAP_REFRESH_INTERVAL)
+    async def map_refresh_loop(self):
+        try:
+            await MapEngine.refresh()
+        except MapDataError as e:
+            logging.warning(f"Map Refresh: {e.message}")
+        except RenderError as e:
+            logging.warning(f"Map Refresh: failed to redraw the live map: {e.message}")
+
+
+    @map_refresh_loop.before_loop
+    async def before_map_refresh_loop(self):
+        # Wait for the bot to be fully ready so the render workers are running
+        await self.bot.wait_until_ready()
+
+
+
+# Cog setup function for bot
+async def setup(bot: commands.Bot):
+    await bot.add_cog(MapRefreshService(bot))
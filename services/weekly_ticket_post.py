@@ -52,10 +52,8 @@ class WeeklyTicketPostService(commands.Cog):
             rows_per_page=20,
             timeout=3600
         )
-        embed = view.format_page(0)  # Format first page
-
-        # Send embed with pagination controls
-        view.message = await channel.send(embed=embed, view=view)
+        # Send the first page with pagination controls
+        view.message = await channel.send(view=view, **await view.start())
 
 
     @ticket_post_loop.before_loop
@@ -0,0 +1,300 @@
+import os, logging, time
+
+from functools import lru_cache
+from PIL import Image, ImageFont
+
+
+ASSETS_DIR = "assets"
+FONT_PATH = os.path.join(ASSETS_DIR, "MinecraftRegular.ttf")
+
+GUILD_ICONS_DIR = os.path.join(ASSETS_DIR, "icons", "guilds")
+RANK_ICONS_DIR = os.path.join(ASSETS_DIR, "icons", "ranks")
+GAMEMODE_ICONS_DIR = os.path.join(ASSETS_DIR, "icons", "gamemodes")
+# Banners rendered by `util.guild_icons` for guilds without a bundled icon
+GUILD_BANNERS_DIR = os.path.join("storages", "guild_icons")
+# Seconds before a guild tag without a rendered banner is looked up on disk again
+GUILD_BANNER_RECHECK = 600
+# Leaderboard badges downloaded from the Wynncraft CDN by `util.badges`
+LEADERBOARD_ICONS_DIR = os.path.join(ASSETS_DIR, "icons", "leaderboard")
+# Seconds before a badge that wasn't downloaded is looked up on disk again
+LEADERBOARD_ICON_RECHECK = 600
+
+# Font sizes used by the renderers, loaded up front by `preload`
+FONT_SIZES = (12, 15, 16, 18, 20, 28, 32)
+
+# Guild icon sizes used by the renderers (board rows, warcount rows, profile badge)
+GUILD_ICON_SIZES = (64, 90)
+WARCOUNT_GUILD_ICON_SIZE = 54
+
+# Static images every renderer may need, decoded once by `preload`
+TEMPLATES = (
+    "profile_template.png",
+    "warcount_template.png",
+    "board_segment.png",
+    "board_segment_dark.png",
+    "unknown_model.png",
+    "male_uniform_overlay.png",
+    "female_uniform_overlay.png",
+    "main_map.png",
+)
+
+# Every loader below is memoized, so each font size and image is read from disk and decoded
+# only once per process. Images returned by `get_image` and the icon getters are shared between
+# renders, so they are frozen: pasting them, cropping or resizing them is fine, changing them in place
+# raises. Use `get_canvas` to draw on an asset.
+
+
+
+class FrozenImage(Image.Image):
+    """
+    A shared asset image that refuses in-place changes (paste, putalpha, putpixel, ImageDraw...).
+
+    Derived images (copy, crop, resize, convert...) are regular, mutable images.
+    """
+
+    def _ensure_mutable(self):
+        # Every in-place operation of Pillow goes through here
+        raise TypeError("Shared assets are read-only, draw on a copy (see `get_canvas`)")
+
+
+    def thumbnail(self, *args, **kwargs):
+        raise TypeError("Shared assets are read-only, resize a copy instead")
+
+
+
+def _freeze(img: Image.Image) -> FrozenImage:
+    img.load()
+    img.__class__ = FrozenImage
+    # Also makes the pixel access returned by `load()` read-only
+    img.readonly = 1
+    return img
+
+
+@lru_cache(maxsize=None)
+def get_font(size: int) -> ImageFont.FreeTypeFont:
+    """
+    Get the Minecraft font at the given size.
+
+    Args:
+        size (int): Font size in points.
+
+    Returns:
+        ImageFont.FreeTypeFont: The loaded font.
+    """
+    return ImageFont.truetype(FONT_PATH, size)
+
+
+@lru_cache(maxsize=None)
+def get_image(name: str, mode: str | None = "RGBA") -> Image.Image:
+    """
+    Get a decoded image from the assets directory.
+
+    Args:
+        name (str): Path relative to the assets directory, e.g. "board_segment.png".
+        mode (str, optional): Mode to convert to, or None to keep the file's mode.
+
+    Returns:
+        FrozenImage: The shared decoded image.
+    """
+    with Image.open(os.path.join(ASSETS_DIR, name)) as file:
+        img = file.convert(mode) if mode and file.mode != mode else file.copy()
+    return _freeze(img)
+
+
+def get_canvas(name: str, mode: str | None = None) -> Image.Image:
+    """
+    Get a private copy of an asset that is safe to draw on (e.g. a card template).
+
+    Args:
+        name (str): Path relative to the assets directory.
+        mode (str, optional): Mode to convert to, or None to keep the file's mode.
+
+    Returns:
+        Image.Image: A fresh copy of the decoded asset.
+    """
+    return get_image(name, mode).copy()
+
+
+@lru_cache(maxsize=1)
+def _guild_icon_tags() -> frozenset[str]:
+    # Index of the guild tags that have an icon on disk, so misses never touch the filesystem
+    return frozenset(os.path.splitext(f)[0] for f in os.listdir(GUILD_ICONS_DIR) if f.endswith(".png"))
+
+
+@lru_cache(maxsize=1)
+def _guild_banner_tags() -> set[str]:
+    # Index of the rendered banners on disk, grown by `register_guild_banner` as banners are rendered
+    if not os.path.isdir(GUILD_BANNERS_DIR):
+        return set()
+    return {os.path.splitext(f)[0] for f in os.listdir(GUILD_BANNERS_DIR) if f.endswith(".png")}
+
+
+# Tag -> time a rendered banner was last found missing, so each miss only hits the disk once per interval
+_guild_banner_misses: dict[str, float] = {}
+
+
+def register_guild_banner(tag: str):
+    """Record that a banner was rendered for a guild tag, making it available to `get_guild_icon`."""
+    _guild_banner_tags().add(tag)
+    _guild_banner_misses.pop(tag, None)
+
+
+def _has_guild_banner(tag: str) -> bool:
+    banners = _guild_banner_tags()
+    if tag in banners:
+        return True
+
+    # Banners are rendered by the bot process while workers are running, so misses are rechecked now and then
+    last_miss = _guild_banner_misses.get(tag)
+    if last_miss is not None and time.monotonic() - last_miss < GUILD_BANNER_RECHECK:
+        return False
+    if os.path.exists(os.path.join(GUILD_BANNERS_DIR, f"{tag}.png")):
+        register_guild_banner(tag)
+        return True
+    _guild_banner_misses[tag] = time.monotonic()
+    return False
+
+
+def has_guild_icon(tag: str | None) -> bool:
+    """Check whether a guild tag has a bundled icon or a rendered banner."""
+    return bool(tag) and (tag in _guild_icon_tags() or _has_guild_banner(tag))
+
+
+@lru_cache(maxsize=None)
+def _load_guild_icon(tag: str, size: int, trim: bool) -> FrozenImage:
+    if tag in _guild_icon_tags():
+        icon = get_image(f"icons/guilds/{tag}.png")
+        if trim and icon.getbbox():
+            icon = icon.crop(icon.getbbox())
+        return _freeze(icon.resize((size, size)))
+
+    # Rendered banners are pixel art centered in a square, they are never trimmed or smoothed
+    with Image.open(os.path.join(GUILD_BANNERS_DIR, f"{tag}.png")) as file:
+        icon = file.convert("RGBA")
+    return _freeze(icon.resize((size, size), Image.Resampling.NEAREST))
+
+
+def get_guild_icon(tag: str, size: int = 64, trim: bool = False) -> Image.Image | None:
+    """
+    Get a guild icon resized to a square of the given size.
+
+    Bundled icons are used when available, otherwise the banner rendered by `util.guild_icons`.
+
+    Args:
+        tag (str): Guild tag.
+        size (int): Width and height of the returned icon.
+        trim (bool): Crop transparent borders before resizing (bundled icons only).
+
+    Returns:
+        FrozenImage | None: The shared RGBA icon, or None if the guild has no icon.
+    """
+    if not has_guild_icon(tag):
+        return None
+    return _load_guild_icon(tag, size, trim)
+
+
+@lru_cache(maxsize=None)
+def get_rank_icon(rank: str) -> FrozenImage | None:
+    """
+    Get the badge for a Wynncraft support rank (vip, hero, champion...).
+
+    Returns:
+        FrozenImage | None: The shared RGBA badge, or None if the rank has no badge.
+    """
+    if not os.path.exists(os.path.join(RANK_ICONS_DIR, f"{rank}.png")):
+        return None
+    return get_image(f"icons/ranks/{rank}.png")
+
+
+@lru_cache(maxsize=None)
+def get_gamemode_icon(name: str) -> FrozenImage | None:
+    """
+    Get a bundled gamemode/leaderboard icon (ironman, hic, guild...).
+
+    Returns:
+        FrozenImage | None: The shared RGBA icon, or None if there is no such icon.
+    """
+    if not os.path.exists(os.path.join(GAMEMODE_ICONS_DIR, f"{name}.png")):
+        return None
+    return get_image(f"icons/gamemodes/{name}.png")
+
+
+@lru_cache(maxsize=1)
+def _leaderboard_icon_names() -> set[str]:
+    # Index of the downloaded badges, grown by `register_leaderboard_icon` as badges are downloaded
+    if not os.path.isdir(LEADERBOARD_ICONS_DIR):
+        return set()
+    return {os.path.splitext(f)[0] for f in os.listdir(LEADERBOARD_ICONS_DIR) if f.endswith(".webp")}
+
+
+# Badge -> time it was last found missing, so each miss only hits the disk once per interval
+_leaderboard_icon_misses: dict[str, float] = {}
+
+
+def register_leaderboard_icon(name: str):
+    """Record that a leaderboard badge was downloaded, making it available to `get_leaderboard_icon`."""
+    _leaderboard_icon_names().add(name)
+    _leaderboard_icon_misses.pop(name, None)
+
+
+def _has_leaderboard_icon(name: str) -> bool:
+    if name in _leaderboard_icon_names():
+        return True
+
+    # Badges are downloaded by the bot process while workers are running, so misses are rechecked now and then
+    last_miss = _leaderboard_icon_misses.get(name)
+    if last_miss is not None and time.monotonic() - last_miss < LEADERBOARD_ICON_RECHECK:
+        return False
+    if os.path.exists(os.path.join(LEADERBOARD_ICONS_DIR, f"{name}.webp")):
+        register_leaderboard_icon(name)
+        return True
+    _leaderboard_icon_misses[name] = time.monotonic()
+    return False
+
+
+@lru_cache(maxsize=None)
+def _load_leaderboard_icon(name: str) -> FrozenImage:
+    return get_image(f"icons/leaderboard/{name}.webp")
+
+
+def get_leaderboard_icon(name: str) -> FrozenImage | None:
+    """
+    Get a downloaded leaderboard badge (wars, tcc, mining...).
+
+    Returns:
+        FrozenImage | None: The shared RGBA badge, or None if it wasn't downloaded (yet).
+    """
+    if not _has_leaderboard_icon(name):
+        return None
+    return _load_leaderboard_icon(name)
+
+
+def preload():
+    """
+    Load and decode every static asset up front.
+
+    Called once at startup so no render has to touch the disk for fonts, templates or icons.
+    """
+    for size in FONT_SIZES:
+        get_font(size)
+
+    for name in TEMPLATES:
+        get_image(name)
+    # Card templates are drawn on in their original mode
+    get_image("profile_template.png", None)
+    get_image("warcount_template.png", None)
+
+    for tag in _guild_icon_tags() | _guild_banner_tags():
+        for size in GUILD_ICON_SIZES:
+            get_guild_icon(tag, size)
+        get_guild_icon(tag, WARCOUNT_GUILD_ICON_SIZE, trim=True)
+
+    for folder, getter in ((RANK_ICONS_DIR, get_rank_icon), (GAMEMODE_ICONS_DIR, get_gamemode_icon)):
+        for f in os.listdir(folder):
+            if f.endswith(".png"):
+                getter(os.path.splitext(f)[0])
+
+    for name in _leaderboard_icon_names():
+        get_leaderboard_icon(name)
+
+    logging.info("Render assets preloaded.")
@@ -0,0 +1,139 @@
+import discord, hashlib, io, time
+
+from typing import Any, Awaitable, Callable
+from urllib.parse import urlparse, parse_qs
+
+from util.cache import TTLCache
+from util.requests import resource_exists
+
+
+# Discord signs attachment URLs with an expiry (`ex` query parameter), this is assumed when it is missing
+DEFAULT_URL_LIFETIME = 12 * 3600
+# Stop reusing a URL this long before it expires, so messages sent just before expiry still load
+EXPIRY_MARGIN = 15 * 60
+# Maximum number of remembered uploads
+ATTACHMENT_CACHE_SIZE = 512
+# Seconds a URL is reused without checking it. Deleting the message of an upload kills its URL early,
+# so a reused URL is checked again with a HEAD request once this passed.
+URL_CHECK_INTERVAL = 60
+# Seconds a URL check may take, the image is uploaded again if it takes longer
+URL_CHECK_TIMEOUT = 3
+
+# Content hash -> CDN URL of a previous upload of that content
+_urls = TTLCache(ttl=DEFAULT_URL_LIFETIME, max_size=ATTACHMENT_CACHE_SIZE)
+# CDN URL -> True while it is known to be alive
+_alive = TTLCache(ttl=URL_CHECK_INTERVAL, max_size=ATTACHMENT_CACHE_SIZE)
+
+
+
+def content_key(data: bytes) -> str:
+    return hashlib.sha1(data).hexdigest()
+
+
+def url_lifetime(url: str) -> float:
+    """
+    Seconds left until a signed Discord CDN URL expires, minus the safety margin.
+    """
+    try:
+        expires = int(parse_qs(urlparse(url).query)["ex"][0], 16)
+    except (KeyError, IndexError, ValueError):
+        return DEFAULT_URL_LIFETIME - EXPIRY_MARGIN
+    return expires - time.time() - EXPIRY_MARGIN
+
+
+
+class CachedAttachment:
+    """
+    An image that is only uploaded to Discord if the same content wasn't uploaded recently.
+
+    Repeat sends show the image through the CDN URL of the earlier upload instead of attaching it again,
+    so the image has to be shown inside an embed.
+
+    Usage:
+        image = CachedAttachment(data, "map.webp")
+        message = await image.send(interaction.followup.send, wait=True)
+
+    Args:
+        data (bytes): The encoded image.
+        filename (str): File name used when the image has to be uploaded.
+    """
+    def __init__(self, data: bytes, filename: str):
+        self.data = data
+        self.filename = filename
+        self.key = content_key(data)
+
+
+    async def _reusable_url(self) -> str | None:
+        url = _urls.get(self.key)
+        if url is None or _alive.get(url):
+            return url
+
+        # Concurrent sends of the same image share one check
+        if await _alive.get_or_load(url, lambda: self._check(url)):
+            return url
+        return None
+
+
+    async def _check(self, url: str) -> bool | None:
+        if await resource_exists(url, URL_CHECK_TIMEOUT):
+            return True
+        # Its message was deleted (or the CDN can't be reached), upload again
+        if _urls.get(self.key) == url:
+            _urls.invalidate(self.key)
+        return None
+
+
+    def _remember(self, message: discord.Message | None):
+        # Store the CDN URL of the upload made by a sent message so later sends can reuse it
+        if message is None:
+            return
+        # Discord may sanitize the file name, a lone attachment is always ours
+        matches = [a for a in message.attachments if a.filename == self.filename or len(message.attachments) == 1]
+        if matches:
+            lifetime = url_lifetime(matches[0].url)
+            if lifetime > 0:
+                _urls.set(self.key, matches[0].url, lifetime)
+                _alive.set(matches[0].url, True)
+
+
+    async def send(
+        self,
+        send: Callable[..., Awaitable[Any]],
+        embed: discord.Embed | None = None,
+        edit: bool = False,
+        interaction: discord.Interaction | None = None,
+        **kwargs,
+    ) -> Any:
+        """
+        Send or edit a message to show the image, reusing an earlier upload of the same content if there is one.
+
+        The reused URL is looked up once, so the embed and the attachments always agree, and checked
+        if it wasn't seen alive within `URL_CHECK_INTERVAL`. Uploads are remembered for later sends.
+
+        Usage:
+            message = await image.send(interaction.followup.send, view=view, wait=True)
+            await image.send(interaction.edit_original_response, edit=True, view=view)
+
+        Args:
+            send (Callable): The send or edit method, called with the embed, the files and `kwargs`.
+            embed (discord.Embed, optional): The embed to show the image in, a blank one is created if omitted.
+            edit (bool): Whether `send` edits a message, i.e. takes `attachments` rather than `files`.
+            interaction (discord.Interaction, optional): Interaction whose original response `send` sends or
+                edits, needed to remember an upload when `send` doesn't return the message
+                (e.g. `interaction.response.edit_message`).
+            **kwargs: Passed on to `send`.
+
+        Returns:
+            Whatever `send` returned.
+        """
+        url = await self._reusable_url()
+        files = [] if url else [discord.File(fp=io.BytesIO(self.data), filename=self.filename)]
+
+        embed = embed or discord.Embed(color=0x333333)
+        embed.set_image(url=url or f"attachment://{self.filename}")
+
+        result = await send(embed=embed, **{"attachments" if edit else "files": files}, **kwargs)
+        if not url:
+            message = result if isinstance(result, discord.Message) or interaction is None else await interaction.original_response()
+            self._remember(message)
+        return result
@@ -0,0 +1,120 @@
+import asyncio, logging, os, time
+
+from core import deadline
+from util.assets import LEADERBOARD_ICONS_DIR, register_leaderboard_icon
+from util.requests import request
+
+
+BADGE_URL = "https://cdn.wynncraft.com/nextgen/leaderboard/icons/{}.webp?height=50"
+
+# Badge types of the Wynncraft leaderboards (first word of a ranking key), downloaded by `prefetch`.
+# Types missing here are still downloaded the first time a profile needs them.
+LEADERBOARD_BADGES = (
+    "wars", "tcc", "nol", "nog", "tna",
+    "combat", "total", "professions", "global", "player",
+    "alchemism", "armouring", "cooking", "farming", "fishing", "jeweling", "mining",
+    "scribing", "tailoring", "weaponsmithing", "woodcutting", "woodworking",
+)
+
+# Seconds before a badge that failed to download is tried again
+BADGE_RETRY_INTERVAL = 3600
+
+# Seconds startup waits for the prefetch before moving on (downloads keep going in the background)
+BADGE_PREFETCH_TIMEOUT = 20
+
+
+
+class BadgeStore:
+    """
+    Leaderboard badges downloaded once from the Wynncraft CDN and kept in `LEADERBOARD_ICONS_DIR`.
+
+    The renderers read the badges from disk through `util.assets.get_leaderboard_icon`,
+    which keeps decoded copies in memory, so profile renders never touch the network for them.
+    """
+    _downloads: dict[str, asyncio.Task] = {}  # Downloads in flight by badge type
+    _failed: dict[str, float] = {}            # Time of the last failed download by badge type
+
+
+    @staticmethod
+    def path(badge_type: str) -> str:
+        return os.path.join(LEADERBOARD_ICONS_DIR, f"{badge_type}.webp")
+
+
+    @classmethod
+    def has(cls, badge_type: str) -> bool:
+        return os.path.exists(cls.path(badge_type))
+
+
+    @classmethod
+    async def _download(cls, badge_type: str) -> bool:
+        data = await request(BADGE_URL.format(badge_type), return_type="image")
+        if not data:
+            cls._failed[badge_type] = time.time()
+            return False
+
+        os.makedirs(LEADERBOARD_ICONS_DIR, exist_ok=True)
+        # Write next to the target and swap it in, so a render never reads a partial file
+        tmp_path = cls.path(badge_type) + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, cls.path(badge_type))
+
+        register_leaderboard_icon(badge_type)
+        cls._failed.pop(badge_type, None)
+        return True
+
+
+    @classmethod
+    async def fetch(cls, badge_type: str) -> bool:
+        """
+        Make sure a badge is on disk, downloading it if needed.
+
+        Concurrent calls for the same badge share one download, and a failed badge
+        isn't retried before `BADGE_RETRY_INTERVAL` has passed.
+
+        Returns:
+            bool: Whether the badge is available.
+        """
+        if cls.has(badge_type):
+            return True
+        if time.time() - cls._failed.get(badge_type, 0) < BADGE_RETRY_INTERVAL:
+            return False
+
+        task = cls._downloads.get(badge_type)
+        if task is None:
+            task = deadline.detached(cls._download(badge_type))
+            task.add_done_callback(lambda _: cls._downloads.pop(badge_type, None))
+            cls._downloads[badge_type] = task
+        return await asyncio.shield(task)
+
+
+    @classmethod
+    async def ensure(cls, badge_types):
+        """
+        Download whichever of the given badges aren't on disk yet, concurrently.
+        """
+        missing = [t for t in set(badge_types) if not cls.has(t)]
+        if missing:
+            await asyncio.gather(*(cls.fetch(t) for t in missing))
+
+
+    @classmethod
+    async def prefetch(cls):
+        """
+        Download every known badge that isn't on disk yet.
+        This should be called once at startup, before the render assets are preloaded.
+        """
+        missing = [t for t in LEADERBOARD_BADGES if not cls.has(t)]
+        if not missing:
+            return
+
+        logging.info(f"Downloading {len(missing)} leaderboard badges...")
+        try:
+            await asyncio.wait_for(asyncio.shield(cls.ensure(missing)), BADGE_PREFETCH_TIMEOUT)
+        except asyncio.TimeoutError:
+            logging.warning("Leaderboard badge prefetch timed out, continuing in the background.")
+            return
+
+        failed = [t for t in missing if not cls.has(t)]
+        if failed:
+            logging.warning(f"Failed to download leaderboard badges: {', '.join(failed)}")
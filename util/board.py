@@ -1,43 +1,174 @@
-import discord, io, math
-from PIL import Image, ImageDraw, ImageFont
+import asyncio, discord, logging
+from PIL import Image, ImageDraw
+from typing import Any, Awaitable, Callable, Hashable
 
+from core import deadline
+from core.render_pool import RenderPool
 from core.settings import SettingsManager
+from util.assets import get_font, get_image, get_canvas, get_guild_icon, WARCOUNT_GUILD_ICON_SIZE
+from util.attachments import CachedAttachment
+from util.cache import TTLCache
 from util.embeds import TextTableEmbed, PaginatedTextTable
+from util.encoding import encode, file_name
+from util.guild_icons import ensure_guild_icons
 from util.guilds import guild_tags_from_names
-from util.mappings import UI_EMOJI_MAP
-from util.requests import fetch_player_busts
+from util.pagination import ListPageSource, PageSource, Paginator
+from util.results import RESULT_TTL
+from util.skins import fetch_player_busts
 
 
-FONT_PATH = "assets/fonts/MinecraftRegular.ttf"
 
+# Maximum number of pages shared between views of the same board
+SHARED_PAGES_SIZE = 256
 
-class BoardView(discord.ui.View):
+# (board, page, output type) -> rendered page, shared by every view showing that board
+_shared_pages = TTLCache(ttl=RESULT_TTL, max_size=SHARED_PAGES_SIZE)
+# (board, page, output type) -> shared render still in flight
+_shared_renders: dict[Hashable, "_SharedRender"] = {}
+
+
+
+class _SharedRender:
+    """A page render joined by every view showing the page, cancelled once none of them waits for it anymore."""
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+
+async def _render_shared(key: Hashable, render: Callable[[], Awaitable[Any]]) -> Any:
+    page = _shared_pages.get(key)
+    if page is not None:
+        return page
+
+    shared = _shared_renders.get(key)
+    if shared is None:
+        # Detached, so it isn't cut short by the deadline of whichever command happened to start it
+        shared = _shared_renders[key] = _SharedRender(deadline.detached(render()))
+
+        def done(task: asyncio.Task):
+            if _shared_renders.get(key) is shared:
+                del _shared_renders[key]
+            # Also marks the exception as retrieved when every waiter left before it was raised
+            if not task.cancelled() and task.exception() is None and task.result() is not None:
+                _shared_pages.set(key, task.result())
+
+        shared.task.add_done_callback(done)
+
+    shared.waiters += 1
+    try:
+        return await asyncio.shield(shared.task)
+    finally:
+        shared.waiters -= 1
+        if shared.waiters == 0 and not shared.task.done():
+            # The last view gave up on the page (discarded or closed), free the render worker
+            shared.task.cancel()
+            if _shared_renders.get(key) is shared:
+                del _shared_renders[key]
+
+
+
+class PageCache:
+    """
+    Rendered pages of one board view, keyed by (page, output type).
+
+    Every page is rendered by a single task, so clicking onto a page that is still being prerendered
+    waits for that render instead of starting another one. Failed renders are dropped and retried on the next request.
+
+    Views given the same `board` key also share their pages for `RESULT_TTL` seconds, so identical
+    commands (sharing their rows through `util.results`) render and upload each page only once.
+    A shared render still in flight keeps running as long as one of the views waits for it, and is
+    cancelled once all of them discarded the page.
+
+    Args:
+        render (Callable): Coroutine function taking (page, output type) and returning the page content.
+        board (Hashable, optional): Identifies what is rendered, views of one board must render identical pages.
+    """
+    def __init__(self, render: Callable[[int, str], Awaitable[Any]], board: Hashable | None = None):
+        self.render = render
+        self.board = board
+        self._pages: dict[tuple[int, str], asyncio.Task] = {}
+
+
+    async def _render(self, page: int, output: str) -> Any:
+        if self.board is None:
+            return await self.render(page, output)
+        return await _render_shared((self.board, page, output), lambda: self.render(page, output))
+
+
+    def _task(self, page: int, output: str) -> asyncio.Task:
+        key = (page, output)
+        task = self._pages.get(key)
+        if task is None:
+            task = self._pages[key] = asyncio.ensure_future(self._render(page, output))
+            task.add_done_callback(lambda done: self._drop_failed(key, done))
+        return task
+
+
+    def _drop_failed(self, key: tuple[int, str], task: asyncio.Task):
+        # Also marks the exception as retrieved, so failed prerenders nobody awaited aren't logged as unhandled
+        if (task.cancelled() or task.exception()) and self._pages.get(key) is task:
+            del self._pages[key]
+
+
+    async def get(self, page: int, output: str) -> Any:
+        """
+        Get a page, rendering it if it isn't cached or being rendered already.
+        """
+        # Shielded so a cancelled interaction doesn't cancel a render other clicks may be waiting for
+        return await asyncio.shield(self._task(page, output))
+
+
+    def prefetch(self, pages: list[int], output: str):
+        """
+        Start rendering pages in the background, without waiting for them.
+        """
+        for page in pages:
+            self._task(page, output)
+
+
+    def discard(self, page: int, output: str):
+        """Cancel a page's render if it is still running, keeping it if it already finished."""
+        task = self._pages.get((page, output))
+        if task and not task.done():
+            task.cancel()
+
+
+    def cancel(self):
+        """Cancel every running render and forget every page."""
+        for task in self._pages.values():
+            task.cancel()
+        self._pages.clear()
+
+
+
+class BoardView(Paginator):
     """
-    A custom Discord UI View to display a simple paginated leaderboard.
+    A paginated leaderboard.
 
     Supports two display modes:
-    - Fancy image-based leaderboard using `build_board`
+    - Fancy image-based leaderboard using `build_board_image`
     - Plain text embed leaderboard
 
-    Pagination controls allow navigating between pages of leaderboard data.
-
     Attributes:
         user_id (int): Discord user ID to fetch personal settings.
-        data (list of tuples): Leaderboard data as (name, value).
+        source (PageSource): Leaderboard entries as (name, value), loaded per page.
         title (str): Title of the leaderboard embed.
-        max_page (int): Maximum page number for pagination.
         stat_counter (str): Label for the stat column.
         is_guild_board (bool): Whether this is a guild leaderboard (affects image).
         use_text_embed (bool): Whether to use text embed fallback.
         headers (list): Column headers for the leaderboard.
         page (int): Current page index.
         is_fancy (bool): Whether to use the image mode based on user setting.
+        pages (PageCache): Pages rendered so far, neighbours of the shown page are rendered ahead of time.
     """
 
     def __init__(
         self,
         user_id,
-        data: list[tuple[str, int]],
+        data: list[tuple[str, int]] | PageSource,
         title: str = "Leaderboard",
         max_page: int = None,
         stat_counter: str = "Value",
@@ -45,10 +176,9 @@ class BoardView(discord.ui.View):
         use_text_embed: bool = True,
         headers: list[str] = None,
     ):
-        super().__init__()
+        max_pages = max_page + 1 if max_page is not None else None
+        super().__init__(data if isinstance(data, PageSource) else ListPageSource(data, 10, max_pages), timeout=180)
         self.user_id = user_id
-        self.data = data
-        self.max_page = max_page if max_page is not None else math.ceil(len(data) / 10)
         self.title = title
         if headers:
             # Use custom headers prepended by "Rank"
@@ -61,105 +191,121 @@ class BoardView(discord.ui.View):
         self.is_guild_board = is_guild_board
         self.use_text_embed = use_text_embed
 
-        self.page = 0  # Start on first page
-
         # Fetch user setting to decide if image mode or text embed is used
         setting = SettingsManager("user", user_id).get("preferred_leaderboard_output_type")
         self.is_fancy = True if setting == "image" else False
+        self.output = "image" if self.is_fancy else "text"
 
+        # Views over the same source (a result shared by identical commands) share their rendered pages
+        self.pages = PageCache(self.build_page, board=self.source)
 
-    @discord.ui.button(emoji=UI_EMOJI_MAP["left_arrow"], row=1)
-    async def previous(self, interaction: discord.Interaction, button: discord.ui.Button):
+
+    async def build_page(self, page: int, output: str) -> CachedAttachment | discord.Embed:
         """
-        Handler for the 'previous page' button.
-        Moves to the previous page if possible; else sends an ephemeral warning.
+        Render one page of the leaderboard.
+
+        Args:
+            page (int): Page index.
+            output (str): "image" for the image board, "text" for the text table embed.
         """
-        self.page -= 1
-        if self.page < 0:
-            self.page = 0
-            await interaction.response.send_message("You are at the first page!", ephemeral=True)
+        rows = await self.source.get_page(page)
+        start = page * self.source.rows_per_page
+
+        if output == "image":
+            image = await build_board_image(rows, start, is_guild_board=self.is_guild_board)
+            return CachedAttachment(image, file_name("board", "board"))
+
+        # Entries with their rank as string prefix
+        rows = [[f"{start + i + 1}.", row[0], row[1]] for i, row in enumerate(rows)]
+        return TextTableEmbed(self.headers, rows, title=self.title, color=0x333333)
+
+
+    async def render_page(self, page: int) -> CachedAttachment | discord.Embed:
+        return await self.pages.get(page, self.output)
+
+
+    def discard_page(self, page: int):
+        self.pages.discard(page, self.output)
+
+
+    def prefetch(self):
+        """
+        Start rendering the image pages next to the current one, so pagination clicks can be answered immediately.
+        """
+        if self.is_fancy:
+            self.pages.prefetch([p for p in (self.page + 1, self.page - 1) if 0 <= p < self.total_pages], "image")
         else:
-            await self.update(interaction)
+            super().prefetch()
 
 
-    @discord.ui.button(emoji=UI_EMOJI_MAP["right_arrow"], row=1)
-    async def next(self, interaction: discord.Interaction, button: discord.ui.Button):
+    async def send_to(self, interaction: discord.Interaction):
         """
-        Handler for the 'next page' button.
-        Moves to the next page if possible; else sends an ephemeral warning.
+        Send the first page as a followup to a deferred interaction.
         """
-        self.page += 1
-        if self.page > self.max_page:
-            self.page = self.max_page
-            await interaction.response.send_message("You are at the last page!", ephemeral=True)
+        content = await self.start()
+        if self.is_fancy:
+            self.message = await content.send(interaction.followup.send, view=self, wait=True)
         else:
-            await self.update(interaction)
+            self.message = await interaction.followup.send(view=self, embed=content, wait=True)
+        self.prefetch()
 
 
-    async def update(self, interaction: discord.Interaction):
+    async def show_page(self, interaction: discord.Interaction, page: int, content: CachedAttachment | discord.Embed):
         """
-        Updates the message with the current page of leaderboard data.
+        Updates the message with a rendered page of leaderboard data.
 
-        Chooses to send either a fancy image board or a text embed based on user settings.
+        Shows either a fancy image board or a text embed based on user settings.
         """
-        await interaction.response.defer()
+        self._set_page(page)
 
         if self.is_fancy:
-            # Build the image leaderboard for the current page and send it
-            board = await build_board(self.data, self.page, is_guild_board=self.is_guild_board)
-            await interaction.edit_original_response(embed=None, view=self, attachments=[board])
+            # Send the image leaderboard, reusing an earlier upload of the same page
+            await content.send(interaction.edit_original_response, edit=True, view=self)
+        elif self.use_text_embed:
+            # Send paginated text embed leaderboard
+            await interaction.edit_original_response(embed=content, view=self, attachments=[])
         else:
-            # Prepare slice of data for current page (10 entries per page)
-            start = self.page * 10
-            end = start + 10
-            sliced = self.data[start:end]
+            # Alternate fallback (rarely used)
+            await PaginatedTextTable.send(interaction, self.headers, self.source, "Warcount sum for guilds")
+        self.prefetch()
 
-            # Add ranks as string prefix to each row
-            for i in range(len(sliced)):
-                sliced[i] = [f"{i+start+1}.", sliced[i][0], sliced[i][1]]
 
-            if self.use_text_embed:
-                # Send paginated text embed leaderboard
-                embed = TextTableEmbed(self.headers, sliced, title=self.title, color=0x333333)
-                await interaction.edit_original_response(embed=embed, view=self, attachments=[])
-            else:
-                # Alternate fallback (rarely used)
-                await PaginatedTextTable.send(interaction, self.headers, self.data, "Warcount sum for guilds")
+    async def on_timeout(self):
+        await super().on_timeout()
+        self.pages.cancel()
 
 
 
-class WarcountBoardView(discord.ui.View):
+class WarcountBoardView(Paginator):
     """
-    A custom Discord UI View for a detailed warcount leaderboard supporting multiple class columns.
+    A paginated warcount leaderboard supporting multiple class columns.
 
     Supports paginated image or text table display, based on user settings.
 
     Attributes:
         user_id (int): Discord user ID to fetch personal settings.
         headers (list): Column headers, including rank, name, guild, class counts, total.
-        rows (list of tuples): Data rows containing player warcounts.
+        source (PageSource): Rows containing player warcounts, loaded per page.
         listed_classes (list of str): Classes to show (ARCHER, WARRIOR, etc.).
         is_guild_board (bool): Whether this is a guild leaderboard (affects image).
         page (int): Current page index.
         is_fancy (bool): Whether to use image output mode.
-        max_pages (int): Maximum page count based on data length.
+        pages (PageCache): Pages rendered so far, neighbours of the shown page are rendered ahead of time.
     """
 
     def __init__(
         self,
         user_id,
         headers,
-        rows,
+        rows: list[tuple] | PageSource,
         listed_classes,
         is_guild_board: bool = False,
         timeout=60,
     ):
-        super().__init__(timeout=timeout)
+        # Moving past either end is silently ignored
+        super().__init__(rows if isinstance(rows, PageSource) else ListPageSource(rows, 10), timeout=timeout, warn_at_edges=False)
         self.listed_classes = listed_classes
-
-        self.page = 0
         self.headers = headers
-        self.data = rows
         self.user_id = user_id
 
         self.is_guild_board = is_guild_board
@@ -167,219 +313,252 @@ class WarcountBoardView(discord.ui.View):
         # User preference for image or text output
         setting = SettingsManager("user", user_id).get("preferred_leaderboard_output_type")
         self.is_fancy = True if setting == "image" else False
+        self.output = "image" if self.is_fancy else "text"
 
-        # Compute max pages needed for pagination (10 rows per page)
-        self.max_pages = math.ceil(len(rows) / 10)
+        # Views over the same source (a result shared by identical commands) share their rendered pages
+        self.pages = PageCache(self.build_page, board=self.source)
 
 
-    async def update_message(self, interaction: discord.Interaction):
+    async def build_page(self, page: int, output: str) -> CachedAttachment | str:
         """
-        Updates the leaderboard message with the current page content.
+        Render one page of the warcount leaderboard.
 
-        Sends either an image-based warcount board or a formatted text table.
+        Args:
+            page (int): Page index.
+            output (str): "image" for the image board, "text" for the formatted text table.
         """
-        if self.is_fancy:
-            await interaction.response.defer()
-            content = await build_warcount_board(self.data, self.page, self.listed_classes)
-            await interaction.edit_original_response(content="", view=self, attachments=[content])
-        else:
-            # Slice rows for current page
-            start, end = self.page * 10, (self.page + 1) * 10
-            sliced = self.data[start:end]
+        rows = await self.source.get_page(page)
+
+        if output == "image":
+            image = await build_warcount_board_image(rows, self.listed_classes)
+            return CachedAttachment(image, file_name("board", "warcount_board"))
+
+        # Sized for the whole leaderboard when every row is known, otherwise for this page
+        widths = await self.source.column_widths(self.headers, rows)
 
-            # Calculate widths for each column based on headers
-            widths = [len(h) for h in self.headers]
-            fmt = ' ┃ '.join(f'%{w}s' for w in widths)
+        lines = [' ┃ '.join(str(h).ljust(widths[i]) for i, h in enumerate(self.headers))]  # header line
+        # Create a separator line replacing '┃' with '╋' and others with '━'
+        separator = ''.join('╋' if c == '┃' else '━' for c in lines[0])
+        lines.append(separator)
 
-            lines = [fmt % tuple(self.headers)]  # header line
-            # Create a separator line replacing '┃' with '╋' and others with '━'
-            separator = ''.join('╋' if c == '┃' else '━' for c in lines[0])
-            lines.append(separator)
+        # Append each row formatted with left-justified columns
+        for row in rows:
+            lines.append(' ┃ '.join(str(cell).ljust(widths[i]) for i, cell in enumerate(row)))
+        lines.append(separator)
 
-            # Append each row formatted with left-justified columns
-            for row in sliced:
-                lines.append(' ┃ '.join(str(cell).ljust(widths[i]) for i, cell in enumerate(row)))
-            lines.append(separator)
+        return '```isbl\n' + '\n'.join(lines) + '```'
 
-            content = '```isbl\n' + '\n'.join(lines) + '```'
-            await interaction.response.edit_message(content=content, view=self, attachments=[])
 
+    async def render_page(self, page: int) -> CachedAttachment | str:
+        return await self.pages.get(page, self.output)
 
-    @discord.ui.button(emoji=UI_EMOJI_MAP["left_arrow"])
-    async def previous(self, interaction: discord.Interaction, button: discord.ui.Button):
+
+    def discard_page(self, page: int):
+        self.pages.discard(page, self.output)
+
+
+    def prefetch(self):
+        """
+        Start rendering the image pages next to the current one, so pagination clicks can be answered immediately.
         """
-        Handler for 'previous page' button.
+        if self.is_fancy:
+            self.pages.prefetch([p for p in (self.page + 1, self.page - 1) if 0 <= p < self.total_pages], "image")
+
 
-        Moves back one page if possible; otherwise defers without message.
+    async def send_to(self, interaction: discord.Interaction):
         """
-        if self.page > 0:
-            self.page -= 1
-            await self.update_message(interaction)
+        Send the first page as a followup to a deferred interaction.
+        """
+        content = await self.start()
+        if self.is_fancy:
+            self.message = await content.send(interaction.followup.send, view=self, wait=True)
         else:
-            await interaction.response.defer()
+            self.message = await interaction.followup.send(content=content, view=self, wait=True)
+        self.prefetch()
 
 
-    @discord.ui.button(emoji=UI_EMOJI_MAP["right_arrow"])
-    async def next(self, interaction: discord.Interaction, button: discord.ui.Button):
+    async def show_page(self, interaction: discord.Interaction, page: int, content: CachedAttachment | str):
         """
-        Handler for 'next page' button.
+        Updates the leaderboard message with a rendered page.
 
-        Moves forward one page if possible; otherwise defers without message.
+        Shows either an image-based warcount board or a formatted text table.
         """
-        if self.page < self.max_pages - 1:
-            self.page += 1
-            await self.update_message(interaction)
+        self._set_page(page)
+
+        if self.is_fancy:
+            # Reuses an earlier upload of the same page
+            await content.send(interaction.edit_original_response, edit=True, content="", view=self)
         else:
-            await interaction.response.defer()
+            await interaction.edit_original_response(content=content, view=self, attachments=[])
+        self.prefetch()
+
+
+    async def on_timeout(self):
+        await super().on_timeout()
+        self.pages.cancel()
 
 
 
-async def build_board(data: list[tuple[str, int]], page: int, is_guild_board: bool = False) -> discord.File:
+async def build_board_image(entries: list[tuple[str, int]], start: int = 0, is_guild_board: bool = False) -> bytes:
     """
     Builds a graphical leaderboard image with player/guild icons, ranks, names, and stat values.
 
+    Icons are fetched here, the image itself is rendered in the render pool by `render_board`.
+
     Args:
-        data (list of tuples): Leaderboard entries as (name, value).
-        page (int): Current page index for pagination.
+        entries (list of tuples): The page's leaderboard entries as (name, value).
+        start (int): Number of entries on the pages before this one, used to number the rows.
         is_guild_board (bool): If True, render guild icons instead of player busts.
 
     Returns:
-        discord.File: A Discord file object containing the generated PNG image.
+        bytes: The encoded image.
     """
-    # Prepare data with ranks enumerated starting from 1
-    data_list = []
-    for i in range(len(data)):
-        data_list.append([i + 1, data[i][0], data[i][1]])
+    # Prepare the rows of this page with ranks enumerated starting after the previous pages
+    rows = [(start + i + 1, name, value) for i, (name, value) in enumerate(entries)]
+
+    # Extract names from rows to fetch icons
+    names = [row[1] for row in rows]
 
+    # Fetch guild tags or player busts depending on board type
+    tags = None
+    if is_guild_board:
+        tags = (await guild_tags_from_names(names))[0]
+        await ensure_guild_icons(tags)
+    else:
+        await fetch_player_busts(names)
+
+    return await RenderPool.render("board", rows=rows, is_guild_board=is_guild_board, tags=tags)
+
+
+def render_board(rows: list[tuple[int, str, str]], is_guild_board: bool = False, tags: list[str] = None) -> bytes:
+    """
+    Renders one page of a leaderboard. Runs inside a render worker process.
+
+    Args:
+        rows (list of tuples): Up to 10 entries as (rank, name, value).
+        is_guild_board (bool): If True, render guild icons instead of player busts.
+        tags (list of str, optional): Guild tag of each row (guild boards only).
+
+    Returns:
+        bytes: The encoded board.
+    """
     # Margins / X-coordinates for drawing elements
     rank_margin = 45
     model_margin = 115
     name_margin = 205
     value_margin = 685
 
-    # Load Minecraft font at size 20
-    font = ImageFont.truetype("MinecraftRegular.ttf", 20)
+    # Minecraft font at size 20
+    font = get_font(20)
 
     # Create base image with grey background
     board = Image.new("RGBA", (730, 695), (110, 110, 110))
 
-    # Load alternating overlay images for row backgrounds
-    overlay = Image.open("assets/board_segment.png")
-    overlay2 = Image.open("assets/board_segment_dark.png")
+    # Alternating overlay images for row backgrounds
+    overlay = get_image("board_segment.png")
+    overlay2 = get_image("board_segment_dark.png")
     overlay_toggle = True
 
     draw = ImageDraw.Draw(board)
 
-    # Extract names from data to fetch icons
-    names = []
-    for i in data_list:
-        names.append(i[1])
-
-    # Fetch guild tags or player busts depending on board type
-    if is_guild_board:
-        tags = (await guild_tags_from_names(names))[0]
-    else:
-        await fetch_player_busts(names)
-
-    # Render 10 entries per page
-    for i in range(1, 11):
-        try:
-            stat = data_list[(i - 1) + (page * 10)]
-        except IndexError:
-            # No more entries on this page
-            continue
-
-        height = ((i - 1) * 69) + 5  # Y coordinate for this row
+    for i, stat in enumerate(rows):
+        height = (i * 69) + 5  # Y coordinate for this row
 
         # Paste alternating background segment
         board.paste(overlay if overlay_toggle else overlay2, (5, height), overlay)
         overlay_toggle = not overlay_toggle
 
-        # Load icon image based on guild or player
+        # Load 64x64 icon image based on guild or player
         if is_guild_board:
-            tag = tags[names.index(stat[1])]
-            try:
-                model_img = Image.open(f"assets/icons/guilds/{tag}.png", 'r').convert("RGBA")
-            except FileNotFoundError:
-                # Use blank placeholder if guild icon missing
-                model_img = Image.new("RGBA", (64, 64))
+            # Guilds without an icon are left blank
+            model_img = get_guild_icon(tags[i], 64)
         else:
             try:
                 # Player bust cached image
-                model_img = Image.open(f"/tmp/{stat[1]}_model.png", 'r').convert("RGBA")
+                model_img = Image.open(f"/tmp/{stat[1]}_model.png", 'r').convert("RGBA").resize((64, 64))
             except Exception as e:
                 # Fallback unknown image with error logged
-                model_img = Image.open(f"assets/unknown_model.png", 'r').convert("RGBA")
-                print(f"Error loading image: {e}")
+                model_img = get_image("unknown_model.png").resize((64, 64))
+                logging.warning(f"Failed to load the bust of {stat[1]}: {e}")
 
-        # Resize icon to 64x64 and paste
-        model_img = model_img.resize((64, 64))
-        board.paste(model_img, (model_margin, height), model_img.getchannel("A"))
+        if model_img:
+            board.paste(model_img, (model_margin, height), model_img.getchannel("A"))
 
         # Draw rank, name, and stat value text
         draw.text((rank_margin, height + 22), "#" + str(stat[0]), font=font)
         draw.text((name_margin, height + 22), str(stat[1]), font=font)
         draw.text((value_margin, height + 22), str(stat[2]), font=font, anchor="rt")
 
-    # Save image to bytes buffer and create Discord file
-    with io.BytesIO() as img_binary:
-        board.save(img_binary, 'PNG')
-        img_binary.seek(0)
-        file = discord.File(fp=img_binary, filename="board.png")
-
-    return file
+    # Save image to bytes buffer
+    return encode(board, "board")
 
 
-async def build_warcount_board(
-    data: list[tuple],
-    page: int,
+async def build_warcount_board_image(
+    rows: list[tuple],
     listed_classes: list[str],
     is_guild_board: bool = False,
-) -> discord.File:
+) -> bytes:
     """
     Builds a detailed warcount leaderboard image showing warcounts per class and totals.
 
+    Icons are fetched here, the image itself is rendered in the render pool by `render_warcount_board`.
+
     Args:
-        data (list of tuples): Warcount data rows.
-        page (int): Current page index.
+        rows (list of tuples): The page's warcount data rows.
         listed_classes (list of str): Classes to show (e.g. ARCHER, WARRIOR).
         is_guild_board (bool): Whether this is a guild leaderboard (affects icons).
 
     Returns:
-        discord.File: Discord file containing the rendered PNG leaderboard image.
+        bytes: The encoded image.
     """
-    # Extract only the 10 rows for current page
-    start = page * 10
-    end = start + 10
-    sliced = data[start:end]
-
-    # Load base template image for warcount leaderboard
-    img = Image.open("assets/warcount_template.png")
-    draw = ImageDraw.Draw(img)
-
-    # Font sizes for different elements
-    name_fontsize = 20
-    text_fontsize = 16
-    total_fontsize = 18
-
-    # Load Minecraft fonts
-    name_font = ImageFont.truetype("assets/MinecraftRegular.ttf", name_fontsize)
-    text_font = ImageFont.truetype("assets/MinecraftRegular.ttf", text_fontsize)
-    total_font = ImageFont.truetype("assets/MinecraftRegular.ttf", total_fontsize)
+    # Plain tuples so the rows pickle cheaply to the render worker
+    sliced = [tuple(row) for row in rows]
 
     # Collect names for icon fetching
-    names = []
-    for i in sliced:
-        names.append(i[1])
+    names = [row[1] for row in sliced]
 
     # Fetch guild tags or player busts as applicable
+    tags = None
     if is_guild_board:
         tags = (await guild_tags_from_names(names))[0]
+        await ensure_guild_icons(tags)
     else:
         await fetch_player_busts(names)
 
+    return await RenderPool.render(
+        "warcount_board", rows=sliced, listed_classes=listed_classes, is_guild_board=is_guild_board, tags=tags
+    )
+
+
+def render_warcount_board(
+    rows: list[tuple],
+    listed_classes: list[str],
+    is_guild_board: bool = False,
+    tags: list[str] = None,
+) -> bytes:
+    """
+    Renders one page of the warcount leaderboard. Runs inside a render worker process.
+
+    Args:
+        rows (list of tuples): Up to 10 warcount rows.
+        listed_classes (list of str): Classes to show (e.g. ARCHER, WARRIOR).
+        is_guild_board (bool): Whether this is a guild leaderboard (affects icons).
+        tags (list of str, optional): Guild tag of each row (guild boards only).
+
+    Returns:
+        bytes: The encoded board.
+    """
+    # Copy of the base template image for warcount leaderboard
+    img = get_canvas("warcount_template.png")
+    draw = ImageDraw.Draw(img)
+
+    # Minecraft fonts for different elements
+    name_font = get_font(20)
+    text_font = get_font(16)
+    total_font = get_font(18)
+
     i = 1
-    for row in sliced:
+    for row in rows:
         # Calculate y-position for this row (with spacing)
         y = ((57 * (i / 2)) + (59 * (i / 2))) + 27
 
@@ -388,24 +567,19 @@ async def build_warcount_board(
         # Draw player/guild name (left-middle aligned)
         draw.text((153, y), row[1], "white", name_font, anchor="lm")
 
-        # Load and paste guild or player icon for this row
+        # Load guild or player icon (54x54) for this row
         if is_guild_board:
-            tag = tags[names.index(row[1])]
-            try:
-                model_img = Image.open(f"assets/icons/guilds/{tag}.png", 'r').convert("RGBA")
-                model_img = model_img.crop(model_img.getbbox())
-            except FileNotFoundError:
-                model_img = Image.new("RGBA", (54, 54))
+            model_img = get_guild_icon(tags[i - 1], WARCOUNT_GUILD_ICON_SIZE, trim=True)
         else:
             try:
-                model_img = Image.open(f"/tmp/{row[1]}_model.png", 'r').convert("RGBA")
+                model_img = Image.open(f"/tmp/{row[1]}_model.png", 'r').convert("RGBA").resize((54, 54))
             except Exception as e:
-                model_img = Image.open(f"assets/unknown_model.png", 'r').convert("RGBA")
-                print(f"Error loading image: {e}")
+                model_img = get_image("unknown_model.png").resize((54, 54))
+                logging.warning(f"Failed to load the bust of {row[1]}: {e}")
 
-        # Resize and paste the icon (54x54) slightly above y
-        model_img = model_img.resize((54, 54))
-        img.paste(model_img, (84, int(y) - 29), model_img.getchannel("A"))
+        # Paste the icon slightly above y
+        if model_img:
+            img.paste(model_img, (84, int(y) - 29), model_img.getchannel("A"))
 
         # Draw total warcount (middle-middle aligned)
         draw.text((445, y), row[2], "white", total_font, anchor="mm")
@@ -434,9 +608,5 @@ async def build_warcount_board(
 
         i += 1
 
-    # Save rendered image to bytes buffer and wrap in Discord file
-    img_binary = io.BytesIO()
-    img.save(img_binary, 'PNG')
-    img_binary.seek(0)
-
-    return discord.File(fp=img_binary, filename="board.png")
+    # Save rendered image to bytes buffer
+    return encode(img, "warcount_board")
@@ -0,0 +1,128 @@
+import asyncio, time
+
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable
+
+from core import deadline
+
+
+# Sentinel used to tell "no cached value" apart from a cached None
+MISSING = object()
+
+
+
+class TTLCache:
+    """
+    Small in-memory cache with per-entry expiry and single-flight loading.
+
+    Concurrent `get_or_load` calls for the same key share one in-flight loader,
+    so a burst of identical lookups only ever costs one upstream request.
+
+    Usage:
+        cache = TTLCache(ttl=60)
+        value = await cache.get_or_load(key, lambda: request(url))
+
+    Args:
+        ttl (float): Default lifetime of an entry in seconds.
+        max_size (int, optional): Maximum number of entries kept, oldest evicted first.
+    """
+    def __init__(self, ttl: float, max_size: int | None = None):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._inflight: dict[Hashable, asyncio.Future] = {}
+
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Return the cached value for `key`, or `default` if it is missing or expired.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+
+        expires, value = entry
+        if expires < time.monotonic():
+            # Expired entries are dropped lazily on access
+            del self._entries[key]
+            return default
+        return value
+
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None):
+        """
+        Store `value` under `key` for `ttl` seconds (defaults to the cache TTL).
+        """
+        self._entries[key] = (time.monotonic() + (ttl if ttl is not None else self.ttl), value)
+        self._entries.move_to_end(key)
+
+        # Evict the oldest entries once the size cap is exceeded
+        if self.max_size is not None:
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+
+    def invalidate(self, key: Hashable):
+        """Remove a single entry from the cache if present."""
+        self._entries.pop(key, None)
+
+
+    def clear(self):
+        """Remove every entry from the cache."""
+        self._entries.clear()
+
+
+    async def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: float | None = None,
+    ) -> Any:
+        """
+        Return the cached value for `key`, loading it with `loader` on a miss.
+
+        None results are returned but not cached, so failed upstream requests are retried next time.
+
+        Args:
+            key (Hashable): Cache key.
+            loader (Callable): Zero-argument coroutine function producing the value.
+            ttl (float, optional): Lifetime override for the loaded value.
+
+        Returns:
+            Any: The cached or freshly loaded value.
+        """
+        value = self.get(key, MISSING)
+        if value is not MISSING:
+            return value
+        return await self.refresh(key, loader, ttl)
+
+
+    async def refresh(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: float | None = None,
+    ) -> Any:
+        """
+        Reload `key` with `loader` while keeping the current value readable until it finishes.
+
+        If a load for `key` is already running, its result is awaited instead of starting another one.
+        """
+        future = self._inflight.get(key)
+        if future is None:
+            # The load is shared, so it runs outside the deadline of the command that happened to start it
+            future = deadline.detached(self._load(key, loader, ttl))
+            self._inflight[key] = future
+
+        # Shield so one caller being cancelled doesn't cancel the load shared with others
+        return await asyncio.shield(future)
+
+
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable[Any]], ttl: float | None) -> Any:
+        try:
+            value = await loader()
+            if value is not None:
+                self.set(key, value, ttl)
+            return value
+        finally:
+            self._inflight.pop(key, None)
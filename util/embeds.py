@@ -1,6 +1,6 @@
 import discord
 
-from util.mappings import UI_EMOJI_MAP
+from util.pagination import ListPageSource, PageSource, Paginator, SectionedPageSource, table_widths
 
 
 
@@ -50,6 +50,17 @@ class InfoEmbed(discord.Embed):
 
 
 
+def format_table_row(row: list[str], widths: list[int]) -> str:
+    """Formats a single row with columns left-aligned, padded to column widths."""
+    return " ┃ ".join(f"{col:<{widths[i]}}" for i, col in enumerate(row))
+
+
+def table_separator(widths: list[int]) -> str:
+    """Separator line between the header and the rows, using heavy box drawing characters."""
+    return "━╋━".join("━" * width for width in widths)
+
+
+
 class TextTableEmbed(discord.Embed):
     """
     Embed displaying a text-based table with aligned columns.
@@ -80,17 +91,12 @@ class TextTableEmbed(discord.Embed):
             self.set_footer(text=footer)
 
         # Calculate max width per column by checking header + all rows
-        column_widths = [max(len(str(item)) for item in col) for col in zip(headers, *rows)]
-
-        def row_format(row: list[str]) -> str:
-            # Formats a single row with columns left-aligned, padded to column widths
-            return " ┃ ".join(f"{col:<{column_widths[i]}}" for i, col in enumerate(row))
+        column_widths = table_widths(headers, rows)
 
-        header_row = row_format(headers)
-        # Separator line uses heavy box drawing characters
-        separator = "━╋━".join("━" * column_widths[i] for i in range(len(headers)))
+        header_row = format_table_row(headers, column_widths)
+        separator = table_separator(column_widths)
 
-        data_rows = [row_format(row) for row in rows]
+        data_rows = [format_table_row(row, column_widths) for row in rows]
         table = [header_row, separator] + data_rows
 
         # Combine rows into a code block string
@@ -118,112 +124,56 @@ class TextTableEmbed(discord.Embed):
 
 
 
-class PaginatedTextTableEmbed(discord.ui.View):
+class PaginatedTextTableEmbed(Paginator):
     """
-    A Discord UI View that displays a paginated embed with a text table.
+    A paginated embed with a text table.
 
     Usage:
         await PaginatedTextTableEmbed.send(interaction, headers, rows, title, footer, color, rows_per_page)
 
     Args:
         headers (list[str]): List of column headers.
-        rows (list[list[str]]): List of rows (each row is a list of strings).
+        rows (list[list[str]] | PageSource): Every row, or a source loading the pages on demand.
         title (str, optional): Embed title.
         footer (str, optional): Footer text.
         color (discord.Colour, optional): Embed color.
-        rows_per_page (int, optional): Number of rows per page (default 10).
+        rows_per_page (int, optional): Number of rows per page (default 10), ignored for page sources.
         timeout (int, optional): Interaction timeout in seconds.
     """
     def __init__(
         self,
         headers: list[str],
-        rows: list[list[str]],
+        rows: list[list[str]] | PageSource,
         title: str = None,
         footer: str = None,
         color: discord.Colour = None,
         rows_per_page: int = 10,
         timeout: int = 60,
     ):
-        super().__init__(timeout=timeout)
+        super().__init__(rows if isinstance(rows, PageSource) else ListPageSource(rows, rows_per_page), timeout=timeout)
 
         self.headers = headers
-        self.rows = rows
         self.title = title
         self.footer = footer
         self.color = color or discord.Color.teal()
-        self.rows_per_page = rows_per_page
 
-        self.page = 0
-        self.total_pages = (len(rows) + rows_per_page - 1) // rows_per_page
-        self.message = None
 
-        # Create previous and next buttons with appropriate emoji and callback handlers
-        self.prev_button = discord.ui.Button(emoji=UI_EMOJI_MAP["left_arrow"], style=discord.ButtonStyle.gray)
-        self.prev_button.callback = self.go_previous
-        self.next_button = discord.ui.Button(emoji=UI_EMOJI_MAP["right_arrow"], style=discord.ButtonStyle.gray)
-        self.next_button.callback = self.go_next
+    def page_footer(self, page: int) -> str:
+        return f"{self.footer} | Page {page + 1}/{self.total_pages}" if self.footer else f"Page {page + 1}/{self.total_pages}"
 
-        self.add_item(self.prev_button)
-        self.add_item(self.next_button)
 
-
-    def format_page(self, page: int) -> discord.Embed:
+    async def format_page(self, page: int, rows: list[list[str]]) -> dict:
         """
         Creates an embed representing the table page requested.
-
-        Args:
-            page (int): Page index to format.
-
-        Returns:
-            discord.Embed: Embed containing formatted table page.
         """
-        start = page * self.rows_per_page
-        end = start + self.rows_per_page
-        page_rows = self.rows[start:end]
-
-        # Calculate max width per column for alignment
-        column_widths = [max(len(str(item)) for item in col) for col in zip(self.headers, *self.rows)]
-
-        def row_format(row: list[str]) -> str:
-            return " ┃ ".join(f"{col:<{column_widths[i]}}" for i, col in enumerate(row))
-
-        header_row = row_format(self.headers)
-        separator = "━╋━".join("━" * column_widths[i] for i in range(len(self.headers)))
-        data_rows = [row_format(row) for row in page_rows]
+        widths = await self.source.column_widths(self.headers, rows)
+        data_rows = [format_table_row(row, widths) for row in rows]
 
-        table = f"```isbl\n{header_row}\n{separator}\n" + "\n".join(data_rows) + "\n```"
+        table = f"```isbl\n{format_table_row(self.headers, widths)}\n{table_separator(widths)}\n" + "\n".join(data_rows) + "\n```"
 
         embed = discord.Embed(title=self.title, description=table, color=self.color)
-        footer_text = f"{self.footer} | Page {page + 1}/{self.total_pages}" if self.footer else f"Page {page + 1}/{self.total_pages}"
-        embed.set_footer(text=footer_text)
-
-        return embed
-
-
-    async def go_previous(self, interaction: discord.Interaction):
-        """
-        Handler for previous page button click.
-
-        Sends previous page if available; otherwise sends ephemeral warning.
-        """
-        if self.page > 0:
-            self.page -= 1
-            await interaction.response.edit_message(embed=self.format_page(self.page), view=self)
-        else:
-            await interaction.response.send_message("You are at the first page!", ephemeral=True)
-
-
-    async def go_next(self, interaction: discord.Interaction):
-        """
-        Handler for next page button click.
-
-        Sends next page if available; otherwise sends ephemeral warning.
-        """
-        if self.page < self.total_pages - 1:
-            self.page += 1
-            await interaction.response.edit_message(embed=self.format_page(self.page), view=self)
-        else:
-            await interaction.response.send_message("You are at the last page!", ephemeral=True)
+        embed.set_footer(text=self.page_footer(page))
+        return {"embed": embed}
 
 
     @classmethod
@@ -231,7 +181,7 @@ class PaginatedTextTableEmbed(discord.ui.View):
         cls,
         interaction: discord.Interaction,
         headers: list[str],
-        rows: list[list[str]],
+        rows: list[list[str]] | PageSource,
         title: str = None,
         footer: str = None,
         color: discord.Colour = None,
@@ -240,33 +190,16 @@ class PaginatedTextTableEmbed(discord.ui.View):
         """
         Convenience method to create and send the paginated embed to an interaction.
 
-        Args:
-            interaction (discord.Interaction): The interaction to respond to.
-            headers (list[str]): Table column headers.
-            rows (list[list[str]]): Table rows.
-            title (str, optional): Embed title.
-            footer (str, optional): Footer text.
-            color (discord.Colour, optional): Embed color.
-            rows_per_page (int, optional): Rows per page.
-
         Returns:
             PaginatedTextTableEmbed: The instantiated view for further manipulation.
         """
         view = cls(headers, rows, title, footer, color, rows_per_page)
-        embed = view.format_page(0)
-
-        # Check if interaction already responded to decide how to send message
-        if interaction.response.is_done():
-            view.message = await interaction.followup.send(embed=embed, view=view)
-        else:
-            await interaction.response.send_message(embed=embed, view=view)
-            view.message = await interaction.original_response()
-
+        await view.send_to(interaction)
         return view
 
 
 
-class PaginatedTextTable(discord.ui.View):
+class PaginatedTextTable(Paginator):
     """
     A paginated view that displays text tables using message content (not embeds).
 
@@ -275,66 +208,34 @@ class PaginatedTextTable(discord.ui.View):
 
     Args:
         headers (list[str]): Column headers.
-        rows (list[list[str]]): Table rows.
+        rows (list[list[str]] | PageSource): Every row, or a source loading the pages on demand.
         title (str, optional): Table title.
         footer (str, optional): Footer text.
-        rows_per_page (int, optional): Rows per page (default 10).
+        rows_per_page (int, optional): Rows per page (default 10), ignored for page sources.
     """
     def __init__(
         self,
         headers: list[str],
-        rows: list[list[str]],
+        rows: list[list[str]] | PageSource,
         title: str = None,
         footer: str = None,
         rows_per_page: int = 10,
     ):
-        super().__init__(timeout=60)
+        super().__init__(rows if isinstance(rows, PageSource) else ListPageSource(rows, rows_per_page), timeout=60)
         self.headers = headers
-        self.rows = rows
         self.title = title
         self.footer = footer
-        self.rows_per_page = rows_per_page
-
-        self.page = 0
-        self.total_pages = (len(rows) + rows_per_page - 1) // rows_per_page
-        self.message = None
-
-        # Setup previous and next buttons with callback handlers
-        self.prev_button = discord.ui.Button(emoji=UI_EMOJI_MAP["left_arrow"], style=discord.ButtonStyle.gray)
-        self.prev_button.callback = self.go_previous
-        self.next_button = discord.ui.Button(emoji=UI_EMOJI_MAP["right_arrow"], style=discord.ButtonStyle.gray)
-        self.next_button.callback = self.go_next
 
-        self.add_item(self.prev_button)
-        self.add_item(self.next_button)
 
-
-    def format_page(self, page: int) -> str:
+    async def format_page(self, page: int, rows: list[list[str]]) -> dict:
         """
         Formats the text table page as a code block string.
-
-        Args:
-            page (int): Page number to format.
-
-        Returns:
-            str: Formatted text table.
         """
-        start = page * self.rows_per_page
-        end = start + self.rows_per_page
-        page_rows = self.rows[start:end]
-
-        # Calculate max width per column for alignment
-        column_widths = [max(len(str(item)) for item in col) for col in zip(self.headers, *self.rows)]
-
-        def row_format(row: list[str]) -> str:
-            return " ┃ ".join(f"{col:<{column_widths[i]}}" for i, col in enumerate(row))
-
-        header_row = row_format(self.headers)
-        separator = "━╋━".join("━" * column_widths[i] for i in range(len(self.headers)))
-        data_rows = [row_format(row) for row in page_rows]
+        widths = await self.source.column_widths(self.headers, rows)
+        data_rows = [format_table_row(row, widths) for row in rows]
 
         # Build the table string with optional title and footer lines
-        table = f"```isbl\n{self.title}\n \n{header_row}\n{separator}\n" + "\n".join(data_rows)
+        table = f"```isbl\n{self.title}\n \n{format_table_row(self.headers, widths)}\n{table_separator(widths)}\n" + "\n".join(data_rows)
 
         if self.footer:
             table += f"\n \n{self.footer} | Page {page + 1}/{self.total_pages}"
@@ -342,34 +243,7 @@ class PaginatedTextTable(discord.ui.View):
             table += f"\n \nPage {page + 1}/{self.total_pages}"
 
         table += "\n```"
-
-        return table
-
-
-    async def go_previous(self, interaction: discord.Interaction):
-        """
-        Handler for previous page button click.
-
-        Edits message content to previous page or sends ephemeral message if at first page.
-        """
-        if self.page > 0:
-            self.page -= 1
-            await interaction.response.edit_message(content=self.format_page(self.page), view=self)
-        else:
-            await interaction.response.send_message("You are at the first page!", ephemeral=True)
-
-
-    async def go_next(self, interaction: discord.Interaction):
-        """
-        Handler for next page button click.
-
-        Edits message content to next page or sends ephemeral message if at last page.
-        """
-        if self.page < self.total_pages - 1:
-            self.page += 1
-            await interaction.response.edit_message(content=self.format_page(self.page), view=self)
-        else:
-            await interaction.response.send_message("You are at the last page!", ephemeral=True)
+        return {"content": table}
 
 
     @classmethod
@@ -377,7 +251,7 @@ class PaginatedTextTable(discord.ui.View):
         cls,
         interaction: discord.Interaction,
         headers: list[str],
-        rows: list[list[str]],
+        rows: list[list[str]] | PageSource,
         title: str = None,
         footer: str = None,
         rows_per_page: int = 10,
@@ -385,32 +259,16 @@ class PaginatedTextTable(discord.ui.View):
         """
         Convenience method to create and send the paginated text table to an interaction.
 
-        Args:
-            interaction (discord.Interaction): Interaction to respond to.
-            headers (list[str]): Column headers.
-            rows (list[list[str]]): Table rows.
-            title (str, optional): Table title.
-            footer (str, optional): Footer text.
-            rows_per_page (int, optional): Rows per page.
-
         Returns:
             PaginatedTextTable: The instantiated view.
         """
         view = cls(headers, rows, title, footer, rows_per_page)
-        table = view.format_page(0)
-
-        # Send or follow-up depending on response state
-        if interaction.response.is_done():
-            view.message = await interaction.followup.send(table, view=view)
-        else:
-            await interaction.response.send_message(table, view=view)
-            view.message = await interaction.original_response()
-
+        await view.send_to(interaction)
         return view
 
 
 
-class PaginatedFieldedTextTableEmbed(discord.ui.View):
+class PaginatedFieldedTextTableEmbed(PaginatedTextTableEmbed):
     """
     A paginated embed that displays multiple sectioned tables with aligned columns.
 
@@ -419,7 +277,8 @@ class PaginatedFieldedTextTableEmbed(discord.ui.View):
 
     Args:
         headers (list[str]): Column headers.
-        rows_by_section (dict[str, list[list[str]]]): Dictionary mapping section titles to their rows.
+        rows_by_section (dict[str, list[list[str]]] | PageSource): Section titles mapped to their rows,
+            or a source whose pages hold (section, row) pairs.
         title (str, optional): Embed title.
         footer (str, optional): Footer text.
         color (discord.Colour, optional): Embed color.
@@ -429,69 +288,29 @@ class PaginatedFieldedTextTableEmbed(discord.ui.View):
     def __init__(
         self,
         headers: list[str],
-        rows_by_section: dict[str, list[list[str]]],
+        rows_by_section: dict[str, list[list[str]]] | PageSource,
         title: str = None,
         footer: str = None,
         color: discord.Colour = None,
         rows_per_page: int = 10,
         timeout: int = 60,
     ):
-        super().__init__(timeout=timeout)
-
-        self.headers = headers
-        self.rows_by_section = rows_by_section
-        self.title = title
-        self.footer = footer
-        self.color = color or discord.Color.teal()
-        self.rows_per_page = rows_per_page
-        self.page = 0
-
-        # Flatten rows into a list of (section, row) tuples for easier pagination
-        self.sectioned_rows: list[tuple[str, list[str]]] = []
-        for section, rows in rows_by_section.items():
-            for row in rows:
-                self.sectioned_rows.append((section, row))
-
-        self.total_pages = (len(self.sectioned_rows) + rows_per_page - 1) // rows_per_page
-        self.message = None
-
-        # Previous and next page buttons with callbacks
-        self.prev_button = discord.ui.Button(emoji=UI_EMOJI_MAP["left_arrow"], style=discord.ButtonStyle.gray)
-        self.prev_button.callback = self.go_previous
-        self.next_button = discord.ui.Button(emoji=UI_EMOJI_MAP["right_arrow"], style=discord.ButtonStyle.gray)
-        self.next_button.callback = self.go_next
-
-        self.add_item(self.prev_button)
-        self.add_item(self.next_button)
+        source = rows_by_section if isinstance(rows_by_section, PageSource) else SectionedPageSource(rows_by_section, rows_per_page)
+        super().__init__(headers, source, title, footer, color, rows_per_page, timeout)
 
 
-    def format_page(self, page: int) -> discord.Embed:
+    async def format_page(self, page: int, rows: list[tuple[str, list[str]]]) -> dict:
         """
         Formats the embed content for the requested page, grouping rows by section.
-
-        Args:
-            page (int): Page number to format.
-
-        Returns:
-            discord.Embed: Embed containing formatted sectioned tables.
         """
-        start = page * self.rows_per_page
-        end = start + self.rows_per_page
-        sectioned_slice = self.sectioned_rows[start:end]
-
-        # Compute max width per column over all rows
-        column_widths = [max(len(str(item)) for item in col) for col in zip(self.headers, *(r for _, r in self.sectioned_rows))]
-
-        def row_format(row: list[str]) -> str:
-            return " ┃ ".join(f"{col:<{column_widths[i]}}" for i, col in enumerate(row))
-
-        header_row = row_format(self.headers)
-        separator = "━╋━".join("━" * column_widths[i] for i in range(len(self.headers)))
+        widths = await self.source.column_widths(self.headers, [row for _, row in rows])
+        header_row = format_table_row(self.headers, widths)
+        separator = table_separator(widths)
 
         # Group rows by their section for this page
         sections: dict[str, list[str]] = {}
-        for section, row in sectioned_slice:
-            sections.setdefault(section, []).append(row_format(row))
+        for section, row in rows:
+            sections.setdefault(section, []).append(format_table_row(row, widths))
 
         embed = discord.Embed(title=self.title, color=self.color)
 
@@ -500,72 +319,5 @@ class PaginatedFieldedTextTableEmbed(discord.ui.View):
             table = f"```isbl\n{header_row}\n{separator}\n" + "\n".join(formatted_rows) + "\n```"
             embed.add_field(name=section, value=table, inline=False)
 
-        footer_text = f"{self.footer} | Page {page + 1}/{self.total_pages}" if self.footer else f"Page {page + 1}/{self.total_pages}"
-        embed.set_footer(text=footer_text)
-
-        return embed
-
-
-    async def go_previous(self, interaction: discord.Interaction):
-        """
-        Handler for previous page button click.
-
-        Sends previous page or ephemeral warning if on first page.
-        """
-        if self.page > 0:
-            self.page -= 1
-            await interaction.response.edit_message(embed=self.format_page(self.page), view=self)
-        else:
-            await interaction.response.send_message("You are at the first page!", ephemeral=True)
-
-    async def go_next(self, interaction: discord.Interaction):
-        """
-        Handler for next page button click.
-
-        Sends next page or ephemeral warning if on last page.
-        """
-        if self.page < self.total_pages - 1:
-            self.page += 1
-            await interaction.response.edit_message(embed=self.format_page(self.page), view=self)
-        else:
-            await interaction.response.send_message("You are at the last page!", ephemeral=True)
-
-
-    @classmethod
-    async def send(
-        cls,
-        interaction: discord.Interaction,
-        headers: list[str],
-        rows_by_section: dict[str, list[list[str]]],
-        title: str = None,
-        footer: str = None,
-        color: discord.Colour = None,
-        rows_per_page: int = 10,
-    ):
-        """
-        Convenience method to create and send the paginated fielded embed.
-
-        Args:
-            interaction (discord.Interaction): The interaction to respond to.
-            headers (list[str]): Table headers.
-            rows_by_section (dict[str, list[list[str]]]): Section titles mapped to their rows.
-            title (str, optional): Embed title.
-            footer (str, optional): Footer text.
-            color (discord.Colour, optional): Embed color.
-            rows_per_page (int, optional): Rows per page.
-
-        Returns:
-            PaginatedFieldedTextTableEmbed: The instantiated view.
-        """
-        view = cls(headers, rows_by_section, title, footer, color, rows_per_page)
-        embed = view.format_page(0)
-
-        if interaction.response.is_done():
-            view.message = await interaction.followup.send(embed=embed, view=view)
-        else:
-            await interaction.response.send_message(embed=embed, view=view)
-            view.message = await interaction.original_response()
-
-        return view
-
-
+        embed.set_footer(text=self.page_footer(page))
+        return {"embed": embed}
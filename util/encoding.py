@@ -0,0 +1,127 @@
+import io, logging, time
+
+import discord
+from PIL import Image
+
+from core.config import config
+
+
+
+class EncoderProfile:
+    """
+    How a rendered image is turned into bytes for upload.
+
+    Args:
+        format (str): Pillow format name ("PNG" or "WEBP").
+        extension (str): File extension used for the Discord attachment.
+        quantize (int, optional): Reduce the image to this many palette colours before encoding.
+        **options: Extra keyword arguments for `Image.save` (compress_level, quality, lossless, method...).
+    """
+    def __init__(self, format: str, extension: str, quantize: int | None = None, **options):
+        self.format = format
+        self.extension = extension
+        self.quantize = quantize
+        self.options = options
+
+
+# Every available output profile
+PROFILES = {
+    "png": EncoderProfile("PNG", "png", compress_level=6),
+    "png_fast": EncoderProfile("PNG", "png", compress_level=1),
+    "png_quantized": EncoderProfile("PNG", "png", quantize=256, compress_level=6),
+    "webp_lossless": EncoderProfile("WEBP", "webp", lossless=True, quality=80, method=2),
+    "webp": EncoderProfile("WEBP", "webp", quality=85, method=4),
+}
+
+# Profile used for each kind of image, overridable per kind with the IMAGE_ENCODING setting.
+# The map is large and photographic, so lossy WebP cuts it from ~2 MB to well under 1 MB.
+# Boards and cards are flat colours and text, which lossless WebP shrinks the most.
+# Uniform skins are Minecraft skin files and must stay exact PNGs.
+KIND_PROFILES = {
+    "map": "webp",
+    "board": "webp_lossless",
+    "warcount_board": "webp_lossless",
+    "profile": "webp_lossless",
+    "uniform": "png",
+    "bust": "png_fast",
+    "guild_banner": "png",
+    **config.IMAGE_ENCODING,
+}
+
+# Per-process totals: kind -> [images, bytes, seconds]
+_metrics = {}
+
+
+
+def get_profile(kind: str) -> EncoderProfile:
+    """
+    Get the encoder profile used for a kind of image (falls back to plain PNG).
+    """
+    return PROFILES.get(KIND_PROFILES.get(kind, "png"), PROFILES["png"])
+
+
+def encode(image: Image.Image, kind: str) -> bytes:
+    """
+    Encode a rendered image with the profile configured for its kind, recording size and time taken.
+
+    Args:
+        image (Image.Image): The rendered image.
+        kind (str): Kind of image, see `KIND_PROFILES`.
+
+    Returns:
+        bytes: The encoded image.
+    """
+    profile = get_profile(kind)
+    start = time.perf_counter()
+
+    if profile.quantize:
+        # Fast octree is the only quantizer Pillow supports for RGBA images
+        image = image.quantize(profile.quantize, method=Image.Quantize.FASTOCTREE)
+
+    with io.BytesIO() as img_binary:
+        image.save(img_binary, profile.format, **profile.options)
+        data = img_binary.getvalue()
+
+    elapsed = time.perf_counter() - start
+    totals = _metrics.setdefault(kind, [0, 0, 0.0])
+    totals[0] += 1
+    totals[1] += len(data)
+    totals[2] += elapsed
+    logging.debug(f"Encoded {kind} as {profile.format}: {len(data) // 1024} KB in {elapsed * 1000:.0f} ms")
+
+    return data
+
+
+def encoding_stats() -> dict:
+    """
+    Average encoded size and encode time per kind of image, for the current process.
+
+    Returns:
+        dict: kind -> {"images", "avg_kb", "avg_ms"}.
+    """
+    return {
+        kind: {"images": count, "avg_kb": size / count / 1024, "avg_ms": seconds / count * 1000}
+        for kind, (count, size, seconds) in _metrics.items()
+    }
+
+
+def file_name(name: str, kind: str) -> str:
+    """
+    Attachment file name for an image of a kind, e.g. file_name("map", "map") -> "map.webp".
+    """
+    return f"{name}.{get_profile(kind).extension}"
+
+
+def to_file(data: bytes, name: str, kind: str) -> discord.File:
+    """
+    Wrap encoded bytes in a Discord attachment with the right extension for its kind.
+
+    Args:
+        data (bytes): Output of `encode`.
+        name (str): File name without extension, e.g. "map".
+        kind (str): Kind of image the bytes were encoded as.
+
+    Returns:
+        discord.File: The attachment (the BytesIO shares the bytes' buffer rather than copying it).
+    """
+    return discord.File(fp=io.BytesIO(data), filename=file_name(name, kind))
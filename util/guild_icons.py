@@ -0,0 +1,272 @@
+import asyncio, logging, os
+
+from PIL import Image
+
+from core import deadline
+from core.render_pool import RenderPool, RenderError
+from util.assets import GUILD_BANNERS_DIR, has_guild_icon, register_guild_banner
+from util.cache import TTLCache
+from util.encoding import encode
+from util.guilds import get_guild_data
+
+
+# Seconds before a guild without a banner is looked at again
+GUILD_BANNER_RETRY = 3600
+# Seconds before a guild that couldn't be looked up is tried again. Shorter, as an unknown guild
+# can't be told apart from an API error and guilds can be created in the meantime.
+GUILD_LOOKUP_RETRY = 300
+
+# Size of the rendered icons, the banner fills their height and is centered
+GUILD_BANNER_ICON_SIZE = 64
+
+# Minecraft banners are 20x40 pixels
+BANNER_WIDTH = 20
+BANNER_HEIGHT = 40
+
+# Minecraft dye colours used by banner bases and layers
+DYE_COLOURS = {
+    "WHITE": (249, 255, 254),
+    "ORANGE": (249, 128, 29),
+    "MAGENTA": (199, 78, 189),
+    "LIGHT_BLUE": (58, 179, 218),
+    "YELLOW": (254, 216, 61),
+    "LIME": (128, 199, 31),
+    "PINK": (243, 139, 170),
+    "GRAY": (71, 79, 82),
+    "LIGHT_GRAY": (157, 157, 151),
+    "SILVER": (157, 157, 151),  # Legacy name of light gray
+    "CYAN": (22, 156, 156),
+    "PURPLE": (137, 50, 184),
+    "BLUE": (60, 68, 170),
+    "BROWN": (131, 84, 50),
+    "GREEN": (94, 124, 22),
+    "RED": (176, 46, 38),
+    "BLACK": (29, 29, 33),
+}
+
+# The creeper face of the CREEPER pattern, 1 = coloured, drawn at (6, 14)
+CREEPER_FACE = (
+    "11000011",
+    "11000011",
+    "00011000",
+    "00111100",
+    "00111100",
+    "00100100",
+)
+
+# Tag -> True for guilds known to have no banner to render. Render pool errors are never cached here.
+_failed = TTLCache(ttl=GUILD_BANNER_RETRY, max_size=4096)
+# Renders in flight by tag, tags rendered by the same job share its task
+_renders: dict[str, asyncio.Task] = {}
+
+
+
+def _bend(u: float, v: float) -> bool:
+    return abs(u - v) < 0.15
+
+
+def _bend_sinister(u: float, v: float) -> bool:
+    return abs(u - (1 - v)) < 0.15
+
+
+def _emblem(x: int, y: int) -> bool:
+    # Stand-in for the figure patterns (skull, flower, globe...) that have no geometric shape
+    return (x - 9.5) ** 2 + (y - 17.5) ** 2 < 16
+
+
+def _creeper(x: int, y: int) -> bool:
+    row, col = y - 14, x - 6
+    return 0 <= row < len(CREEPER_FACE) and 0 <= col < 8 and CREEPER_FACE[row][col] == "1"
+
+
+# Pattern name -> coverage of a banner pixel (x, y), True/False or an opacity between 0 and 1.
+# Geometric patterns follow the game's shapes; figures without a simple shape are drawn as a centered emblem.
+PATTERNS = {
+    "BASE": lambda x, y: True,
+    "SQUARE_BOTTOM_LEFT": lambda x, y: x < 10 and y >= 27,
+    "SQUARE_BOTTOM_RIGHT": lambda x, y: x >= 10 and y >= 27,
+    "SQUARE_TOP_LEFT": lambda x, y: x < 10 and y < 13,
+    "SQUARE_TOP_RIGHT": lambda x, y: x >= 10 and y < 13,
+    "STRIPE_BOTTOM": lambda x, y: y >= 27,
+    "STRIPE_TOP": lambda x, y: y < 13,
+    "STRIPE_LEFT": lambda x, y: x < 7,
+    "STRIPE_RIGHT": lambda x, y: x >= 13,
+    "STRIPE_CENTER": lambda x, y: 7 <= x < 13,
+    "STRIPE_MIDDLE": lambda x, y: 16 <= y < 24,
+    "STRIPE_DOWNRIGHT": lambda x, y: _bend(x / BANNER_WIDTH, y / BANNER_HEIGHT),
+    "STRIPE_DOWNLEFT": lambda x, y: _bend_sinister(x / BANNER_WIDTH, y / BANNER_HEIGHT),
+    "STRIPE_SMALL": lambda x, y: x % 5 < 2,
+    "CROSS": lambda x, y: _bend(x / BANNER_WIDTH, y / BANNER_HEIGHT) or _bend_sinister(x / BANNER_WIDTH, y / BANNER_HEIGHT),
+    "STRAIGHT_CROSS": lambda x, y: 8 <= x < 12 or 18 <= y < 22,
+    "TRIANGLE_BOTTOM": lambda x, y: (BANNER_HEIGHT - y) <= (10 - abs(x - 9.5)) * 1.2,
+    "TRIANGLE_TOP": lambda x, y: y < (10 - abs(x - 9.5)) * 1.2,
+    "TRIANGLES_BOTTOM": lambda x, y: (BANNER_HEIGHT - y) <= 2 + (2.5 - abs(x % 5 - 2)),
+    "TRIANGLES_TOP": lambda x, y: y < 2 + (2.5 - abs(x % 5 - 2)),
+    "DIAGONAL_LEFT": lambda x, y: x / BANNER_WIDTH + y / BANNER_HEIGHT < 1,
+    "DIAGONAL_RIGHT": lambda x, y: x / BANNER_WIDTH > y / BANNER_HEIGHT,
+    "DIAGONAL_LEFT_MIRROR": lambda x, y: x / BANNER_WIDTH < y / BANNER_HEIGHT,
+    "DIAGONAL_RIGHT_MIRROR": lambda x, y: x / BANNER_WIDTH + y / BANNER_HEIGHT >= 1,
+    "CIRCLE_MIDDLE": lambda x, y: (x - 9.5) ** 2 + (y - 19.5) ** 2 < 25,
+    "RHOMBUS_MIDDLE": lambda x, y: abs(x - 9.5) / 7 + abs(y - 19.5) / 12 <= 1,
+    "HALF_VERTICAL": lambda x, y: x < 10,
+    "HALF_VERTICAL_MIRROR": lambda x, y: x >= 10,
+    "HALF_HORIZONTAL": lambda x, y: y < 20,
+    "HALF_HORIZONTAL_MIRROR": lambda x, y: y >= 20,
+    "BORDER": lambda x, y: x < 2 or x >= 18 or y < 2 or y >= 38,
+    "CURLY_BORDER": lambda x, y: x < 1 or x >= 19 or y < 1 or y >= 39
+        or ((x < 3 or x >= 17 or y < 3 or y >= 37) and (x + y) % 2 == 0),
+    "GRADIENT": lambda x, y: 1 - y / BANNER_HEIGHT,
+    "GRADIENT_UP": lambda x, y: y / BANNER_HEIGHT,
+    "BRICKS": lambda x, y: y % 4 == 0 or (x + (4 if (y // 4) % 2 else 0)) % 8 == 0,
+    "CREEPER": lambda x, y: _creeper(x, y),
+    "SKULL": lambda x, y: _emblem(x, y),
+    "FLOWER": lambda x, y: _emblem(x, y),
+    "MOJANG": lambda x, y: _emblem(x, y),
+    "GLOBE": lambda x, y: _emblem(x, y),
+    "PIGLIN": lambda x, y: _emblem(x, y),
+    "FLOW": lambda x, y: _emblem(x, y),
+    "GUSTER": lambda x, y: _emblem(x, y),
+}
+
+# Newer names of patterns, as used by the Wynncraft API after Minecraft renamed them
+PATTERN_ALIASES = {
+    "DIAGONAL_UP_LEFT": "DIAGONAL_LEFT_MIRROR",
+    "DIAGONAL_UP_RIGHT": "DIAGONAL_RIGHT_MIRROR",
+    "HALF_VERTICAL_RIGHT": "HALF_VERTICAL_MIRROR",
+    "HALF_HORIZONTAL_BOTTOM": "HALF_HORIZONTAL_MIRROR",
+    "CIRCLE": "CIRCLE_MIDDLE",
+    "RHOMBUS": "RHOMBUS_MIDDLE",
+    "SMALL_STRIPES": "STRIPE_SMALL",
+}
+
+
+
+def _pattern_mask(pattern: str) -> Image.Image | None:
+    coverage = PATTERNS.get(PATTERN_ALIASES.get(pattern, pattern))
+    if coverage is None:
+        return None
+
+    mask = Image.new("L", (BANNER_WIDTH, BANNER_HEIGHT))
+    mask.putdata([
+        round(float(coverage(x, y)) * 255)
+        for y in range(BANNER_HEIGHT)
+        for x in range(BANNER_WIDTH)
+    ])
+    return mask
+
+
+def render_guild_banner(banner: dict) -> bytes:
+    """
+    Renders a guild banner into a square icon. Runs inside a render worker process.
+
+    Args:
+        banner (dict): The "banner" object of a Wynncraft guild payload,
+            e.g. {"base": "WHITE", "layers": [{"colour": "RED", "pattern": "BORDER"}]}.
+
+    Returns:
+        bytes: The encoded icon.
+    """
+    flag = Image.new("RGBA", (BANNER_WIDTH, BANNER_HEIGHT), DYE_COLOURS.get(banner.get("base"), DYE_COLOURS["WHITE"]))
+
+    for layer in banner.get("layers") or []:
+        mask = _pattern_mask(layer.get("pattern", ""))
+        colour = DYE_COLOURS.get(layer.get("colour"))
+        if mask is None or colour is None:
+            logging.debug(f"Skipping unknown banner layer {layer}")
+            continue
+        flag.paste(colour, (0, 0), mask)
+
+    # Scale without smoothing so the pattern stays crisp, then center in the square icon
+    width, height = GUILD_BANNER_ICON_SIZE // 2, GUILD_BANNER_ICON_SIZE
+    flag = flag.resize((width, height), Image.Resampling.NEAREST)
+
+    icon = Image.new("RGBA", (GUILD_BANNER_ICON_SIZE, GUILD_BANNER_ICON_SIZE), (0, 0, 0, 0))
+    icon.paste(flag, ((GUILD_BANNER_ICON_SIZE - width) // 2, (GUILD_BANNER_ICON_SIZE - height) // 2))
+    return encode(icon, "guild_banner")
+
+
+def render_guild_banners(banners: list[dict]) -> list[bytes]:
+    """
+    Renders several guild banners in one job, see `render_guild_banner`. Runs inside a render worker process.
+
+    Returns:
+        list[bytes]: The encoded icons in the same order.
+    """
+    return [render_guild_banner(banner) for banner in banners]
+
+
+async def _get_banner(tag: str) -> dict | None:
+    data = await get_guild_data(tag)
+    if data is None:
+        _failed.set(tag, True, GUILD_LOOKUP_RETRY)
+        return None
+
+    # Name lookups can resolve to another guild, only a payload with this exact prefix is used
+    banner = data.get("banner") if data.get("prefix") == tag else None
+    if not banner:
+        _failed.set(tag, True)
+    return banner
+
+
+async def _render(tags: list[str]):
+    banners = await asyncio.gather(*(_get_banner(tag) for tag in tags))
+    jobs = [(tag, banner) for tag, banner in zip(tags, banners) if banner]
+    if not jobs:
+        return
+
+    # A single job for all of them, so a board page takes one slot of the pool's queue.
+    # Pool errors (busy, timeout) propagate without marking anything, the next call retries.
+    icons = await RenderPool.render("guild_banners", banners=[banner for _, banner in jobs])
+
+    os.makedirs(GUILD_BANNERS_DIR, exist_ok=True)
+    for (tag, _), icon in zip(jobs, icons):
+        # Write next to the target and swap it in, so a worker never reads a partial file
+        path = os.path.join(GUILD_BANNERS_DIR, f"{tag}.png")
+        with open(f"{path}.tmp", "wb") as f:
+            f.write(icon)
+        os.replace(f"{path}.tmp", path)
+        register_guild_banner(tag)
+
+
+async def ensure_guild_icons(tags: list[str | None]):
+    """
+    Render banners for the given guilds that have neither a bundled icon nor a rendered banner yet.
+
+    Call before rendering anything that shows guild icons. Tags that already have an icon are
+    answered from the in-memory index, and guilds without a banner aren't looked at again before
+    `GUILD_BANNER_RETRY` has passed. The missing banners are rendered in a single render pool job,
+    banners already being rendered for another command are waited for instead.
+
+    Args:
+        tags (list[str | None]): Guild tags, None entries are ignored.
+
+    Raises:
+        RenderQueueFull, RenderTimeout: If the render pool couldn't take the banners right now.
+    """
+    missing = {
+        tag for tag in tags
+        # Tags end up in file names, so anything but plain alphanumerics is left alone
+        if tag and tag.isalnum() and not has_guild_icon(tag) and not _failed.get(tag)
+    }
+
+    tasks = {_renders[tag] for tag in missing if tag in _renders}
+    new = [tag for tag in missing if tag not in _renders]
+    if new:
+        task = deadline.detached(_render(new))
+
+        def done(_):
+            for tag in new:
+                if _renders.get(tag) is task:
+                    del _renders[tag]
+
+        task.add_done_callback(done)
+        _renders.update((tag, task) for tag in new)
+        tasks.add(task)
+
+    for task in tasks:
+        try:
+            await asyncio.shield(task)
+        except RenderError:
+            raise
+        except Exception as e:
+            logging.warning(f"Failed to render guild banners: {e}")
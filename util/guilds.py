@@ -1,9 +1,27 @@
 import asyncio
 from database import Database
 from typing import List, Tuple, MutableSet
+from util.cache import TTLCache, MISSING
 from util.requests import request
 
 
+# Guild API payloads are only cached briefly, member online states change quickly
+GUILD_DATA_TTL = 90
+# Name/prefix aliases rarely change, so they are remembered for much longer
+GUILD_ALIAS_TTL = 3600
+
+# Maps lowercase canonical guild name -> latest /v3/guild payload
+_guild_data_cache = TTLCache(ttl=GUILD_DATA_TTL, max_size=512)
+# Maps lowercase user input (name or prefix) -> canonical guild name
+_guild_alias_cache = TTLCache(ttl=GUILD_ALIAS_TTL, max_size=2048)
+
+# Guild changes show up in the join log within minutes, so current guilds are cached for that long
+PLAYER_GUILD_TTL = 300
+
+# Maps player UUID -> latest joined guild name (None if the player has no join log rows)
+_player_guild_cache = TTLCache(ttl=PLAYER_GUILD_TTL, max_size=10000)
+
+
 async def guild_name_from_tag(tag: str) -> str:
     """
     Retrieve the guild name corresponding to a given guild tag.
@@ -215,6 +233,9 @@ async def guild_tags_from_names(names: List[str]) -> Tuple[MutableSet[str], List
 async def player_guild_from_uuid(uuid: str) -> str:
     """
     Get the latest guild a player has joined using their UUID.
+
+    Served from the same cache as `player_guilds_from_uuids`, misses read a single row
+    through the `guild_join_log (uuid, date)` index (see database/migrations).
     
     Args:
         uuid (str): The player's UUID.
@@ -222,16 +243,29 @@ async def player_guild_from_uuid(uuid: str) -> str:
     Returns:
         str | None: The guild name, or None if the player has no recorded guild.
     """
+    guild = _player_guild_cache.get(uuid, MISSING)
+    if guild is not MISSING:
+        return guild
+
     result = await Database.fetch(
-        "SELECT joined FROM guild_join_log WHERE uuid=%s ORDER BY date DESC LIMIT 1", (uuid)
+        "SELECT joined FROM guild_join_log WHERE uuid=%s ORDER BY date DESC LIMIT 1", (uuid,)
     )
-    guild = None if not result else result[0]["joined"]
+    if result is None:
+        # The query failed, don't remember the player as having no guild
+        return None
+
+    guild = result[0]["joined"] if result else None
+    _player_guild_cache.set(uuid, guild)
     return guild
 
 
 async def player_guilds_from_uuids(uuids: list[str]) -> dict[str, str]:
     """
     Get the latest guilds for multiple players.
+
+    Results are cached in memory for a few minutes. Cache misses are resolved with a single query
+    reading the newest join log row of each player through the `guild_join_log (uuid, date)` index
+    (see database/migrations).
     
     Args:
         uuids (list[str]): List of player UUIDs.
@@ -242,19 +276,109 @@ async def player_guilds_from_uuids(uuids: list[str]) -> dict[str, str]:
     if not uuids:
         return {}
 
-    placeholders = ",".join(["%s"] * len(uuids))
+    player_guilds = {}
+    missing = []
+    for uuid in dict.fromkeys(uuids):
+        guild = _player_guild_cache.get(uuid, MISSING)
+        if guild is MISSING:
+            missing.append(uuid)
+        elif guild is not None:
+            player_guilds[uuid] = guild
+
+    if not missing:
+        return player_guilds
+
+    placeholders = ",".join(["%s"] * len(missing))
+    # The newest date of each player comes straight from the index, then one row is read per player
     query = f"""
-        SELECT uuid, joined
-        FROM guild_join_log
-        WHERE uuid IN ({placeholders})
-        ORDER BY date DESC
+        SELECT log.uuid, log.joined
+        FROM guild_join_log log
+        JOIN (
+            SELECT uuid, MAX(date) AS date
+            FROM guild_join_log
+            WHERE uuid IN ({placeholders})
+            GROUP BY uuid
+        ) latest ON latest.uuid = log.uuid AND latest.date = log.date
     """
-    rows = await Database.fetch(query, tuple(uuids))
+    rows = await Database.fetch(query, tuple(missing))
+    if rows is None:
+        # The query failed, don't remember the misses as players without a guild
+        return player_guilds
 
-    player_guilds = {}
-    for row in rows:
-        if row["uuid"] not in player_guilds:  # Keep first occurrence (latest due to ORDER BY)
-            player_guilds[row["uuid"]] = row["joined"]
+    fetched = {row["uuid"]: row["joined"] for row in rows}
+    for uuid in missing:
+        # Players without any join log rows are cached as None so they aren't queried again
+        _player_guild_cache.set(uuid, fetched.get(uuid))
+    player_guilds.update(fetched)
 
     return player_guilds
 
+
+def _remember_guild(data: dict) -> str:
+    """
+    Store a freshly fetched guild payload under its canonical name and memoize its aliases.
+
+    Returns:
+        str: The canonical guild name.
+    """
+    name = data["name"]
+    _guild_data_cache.set(name.lower(), data)
+    _guild_alias_cache.set(name.lower(), name)
+    if data.get("prefix"):
+        _guild_alias_cache.set(data["prefix"].lower(), name)
+    return name
+
+
+async def _fetch_guild_by_name(name: str) -> dict | None:
+    """Fetch a guild payload by its exact name from the Wynncraft API."""
+    data = await request(f"https://api.wynncraft.com/v3/guild/{name}")
+    return data if isinstance(data, dict) and "name" in data else None
+
+
+async def _resolve_guild_name(guild: str) -> str | None:
+    """
+    Resolve a guild name or prefix into the canonical guild name.
+
+    Tries the tag table first, then the API by name and finally the API by prefix.
+    Any payload fetched along the way is cached so the caller doesn't request it again.
+    """
+    name = await guild_name_from_tag(guild) or guild
+    data = await _fetch_guild_by_name(name)
+    if not data:
+        # Try querying by prefix if guild name lookup failed
+        data = await request(f"https://api.wynncraft.com/v3/guild/prefix/{guild}")
+        if not (isinstance(data, dict) and "name" in data):
+            return None
+    return _remember_guild(data)
+
+
+async def get_guild_data(guild: str, refresh: bool = False) -> dict | None:
+    """
+    Get the Wynncraft guild payload for a guild name or prefix, served from a short-lived cache.
+
+    Concurrent lookups for the same guild share a single request, and resolved
+    prefixes are memoized so later lookups go straight to the name endpoint.
+
+    Args:
+        guild (str): Guild name or prefix.
+        refresh (bool): Fetch a new payload even if a cached one is still fresh.
+            The cached payload stays readable until the refresh completes.
+
+    Returns:
+        dict | None: The guild payload, or None if the guild couldn't be found.
+    """
+    name = _guild_alias_cache.get(guild.lower())
+    if name is None:
+        name = await _guild_alias_cache.get_or_load(guild.lower(), lambda: _resolve_guild_name(guild))
+        if not name:
+            return None
+
+    async def load():
+        data = await _fetch_guild_by_name(name)
+        if data:
+            _remember_guild(data)
+        return data
+
+    if refresh:
+        return await _guild_data_cache.refresh(name.lower(), load)
+    return await _guild_data_cache.get_or_load(name.lower(), load)
@@ -0,0 +1,728 @@
+import asyncio, json, logging, math, time
+
+from functools import lru_cache
+from multiprocessing.shared_memory import SharedMemory
+from PIL import Image, ImageDraw
+
+from core.render_pool import RenderPool
+from util.assets import get_font, get_image
+from util.encoding import encode
+from util.requests import request
+from util.territory_geometry import (
+    TerritoryGeometry, boxes_intersect, geometry_key, get_geometry, to_full_map_coord
+)
+
+
+with open("assets/map_regions.json") as f:
+    map_regions = json.load(f)
+
+ATHENA_TERRITORIES_URL = "https://athena.wynntils.com/cache/get/territoryList"
+ATHENA_GUILDS_URL = "https://athena.wynntils.com/cache/get/guildList"
+
+# Seconds between territory refreshes of the live map frame
+MAP_REFRESH_INTERVAL = 60
+
+# Seconds between refreshes of the guild colour table (guild colours rarely change)
+GUILD_COLOR_REFRESH_INTERVAL = 30 * 60
+
+# Colour of territories whose owner has no known colour, and of unowned territories
+DEFAULT_COLOR = (136, 136, 136)
+UNOWNED_COLOR = (255, 255, 255)
+
+# Outline width of territory tags, in pixels
+LABEL_STROKE = 1
+
+# Tags are drawn this far above their centered position
+LABEL_Y_PAD = -2
+
+# Side length of the square tiles the live frame is redrawn in
+TILE_SIZE = 128
+
+# Shared memory blocks attached by this (worker) process, kept open so images can wrap them
+_attached_layers = {}
+
+
+
+class MapDataError(Exception):
+    """Raised when Athena territory data can't be fetched or understood. The message is safe to show to users."""
+    def __init__(self, message: str):
+        super().__init__(message)
+        self.message = message
+
+
+
+@lru_cache(maxsize=1024)
+def hex_to_rgb(hex_color, fallback=DEFAULT_COLOR):
+    try:
+        hex_color = hex_color.lstrip('#')
+        if len(hex_color) == 6:
+            return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
+        elif len(hex_color) == 3:
+            return tuple(int(hex_color[i]*2, 16) for i in range(3))
+        elif len(hex_color) < 6:
+            # Pad short hex with zeros for safety
+            padded = (hex_color + "0"*6)[:6]
+            return tuple(int(padded[i:i+2], 16) for i in (0, 2, 4))
+    except Exception:
+        logging.warning(f"Invalid color code: #{hex_color}")
+    return fallback
+
+
+def extract_prefix(data: dict):
+    if "guildPrefix" in data and data.get("guildPrefix"):
+        return data.get("guildPrefix")
+    g = data.get("guild")
+    if isinstance(g, dict):
+        return g.get("prefix") or g.get("name")
+    return None
+
+
+def extract_color(data: dict, prefix: str, guild_colors: dict) -> tuple:
+    """
+    Find the RGB colour of a territory's owner, falling back to grey.
+    """
+    if data.get("guildColor"):
+        return hex_to_rgb(data.get("guildColor"))
+    elif isinstance(data.get("guild"), dict) and data["guild"].get("color"):
+        return hex_to_rgb(data["guild"]["color"])
+
+    guild_id = None
+    g = data.get("guild")
+    if isinstance(g, dict):
+        guild_id = g.get("uuid") or g.get("_id")
+    elif isinstance(g, str):
+        guild_id = g
+    if guild_id and guild_id in guild_colors:
+        return guild_colors[guild_id]
+    if prefix and prefix.lower() in guild_colors:
+        return guild_colors[prefix.lower()]
+    return DEFAULT_COLOR
+
+
+def territory_owners(territories: dict, guild_colors: dict) -> dict:
+    """
+    Map every territory to the (prefix, RGB colour) it is drawn with.
+
+    Args:
+        territories (dict): Territory name -> Athena territory data.
+        guild_colors (dict): Guild id or lowercase prefix -> RGB colour, from `fetch_guild_colors`.
+    """
+    owners = {}
+    for name, data in territories.items():
+        prefix = extract_prefix(data) or ""
+        owners[name] = (prefix, extract_color(data, prefix, guild_colors) if prefix else UNOWNED_COLOR)
+    return owners
+
+
+async def fetch_territories() -> dict:
+    """
+    Fetch the current territory list from Athena.
+
+    Returns:
+        dict: Territory name -> territory data.
+
+    Raises:
+        MapDataError: If Athena is down or returned data in an unknown format.
+    """
+    try:
+        terr_res = await request(ATHENA_TERRITORIES_URL)
+    except Exception:
+        raise MapDataError("Athena is down.")
+
+    territories = None
+    if isinstance(terr_res, dict):
+        if "territories" in terr_res and isinstance(terr_res["territories"], dict):
+            territories = terr_res["territories"]
+        elif "data" in terr_res and isinstance(terr_res["data"], dict) and "territories" in terr_res["data"]:
+            territories = terr_res["data"]["territories"]
+        else:
+            if all(isinstance(v, dict) and ("location" in v or "acquired" in v) for v in terr_res.values()):
+                territories = terr_res
+    elif isinstance(terr_res, list):
+        for item in terr_res:
+            if isinstance(item, dict) and "territories" in item:
+                territories = item["territories"]
+                break
+
+    if not territories or not isinstance(territories, dict):
+        logging.error("Unexpected territory response from Athena: %s", terr_res)
+        raise MapDataError("Athena returned unexpected territory data.")
+
+    return territories
+
+
+async def fetch_guild_colors() -> dict:
+    """
+    Fetch every guild's colour from Athena.
+
+    Returns:
+        dict: Guild id and lowercase prefix -> RGB colour (guilds without a colour are left out).
+    """
+    try:
+        guilds_res = await request(ATHENA_GUILDS_URL)
+    except Exception:
+        raise MapDataError("Athena is down.")
+
+    guild_colors = {}
+    if isinstance(guilds_res, list):
+        for entry in guilds_res:
+            try:
+                color = entry.get("color")
+                if not color:
+                    continue
+                rgb = hex_to_rgb(color)
+                gid = entry.get("_id") or entry.get("id")
+                prefix = entry.get("prefix")
+                if gid:
+                    guild_colors[gid] = rgb
+                if prefix:
+                    guild_colors[prefix.lower()] = rgb
+            except Exception:
+                continue
+    return guild_colors
+
+
+def draw_routes(draw: ImageDraw.ImageDraw, geometry: TerritoryGeometry, include: set[int] = None, offset: tuple = (0, 0)):
+    """
+    Draw the trade routes between territories, optionally only those between the given territory indices.
+    """
+    centers = geometry.centers
+    for start, target in geometry.segments():
+        if include is not None and (start not in include or target not in include):
+            continue
+
+        x1, y1, x2, y2 = centers[start*2], centers[start*2 + 1], centers[target*2], centers[target*2 + 1]
+        # Snap to whole pixels before translating, so a region draws exactly the pixels the full canvas would
+        draw.line([(int(x1) + offset[0], int(y1) + offset[1]), (int(x2) + offset[0], int(y2) + offset[1])], fill=(20, 20, 20), width=2)
+
+
+@lru_cache(maxsize=512)
+def label_bbox(label: str, font) -> tuple:
+    # Tags repeat across hundreds of territories, so measure each one once
+    return font.getbbox(label)
+
+
+@lru_cache(maxsize=2048)
+def label_sprite(label: str, rgb: tuple, font) -> tuple[Image.Image, tuple]:
+    """
+    Rasterize an outlined territory tag once, with Pillow's native 1px black stroke.
+
+    Returns:
+        tuple[Image.Image, tuple]: The shared RGBA sprite, and its (x, y) offset from the text origin.
+    """
+    left, top, right, bottom = font.getbbox(label, stroke_width=LABEL_STROKE)
+    sprite = Image.new("RGBA", (right - left, bottom - top))
+    ImageDraw.Draw(sprite).text(
+        (-left, -top), label, font=font, fill=rgb + (255,), stroke_width=LABEL_STROKE, stroke_fill=(0, 0, 0)
+    )
+    return sprite, (left, top)
+
+
+def paste_label(layer: Image.Image, label: str, rgb: tuple, position: tuple, font):
+    """
+    Composite a cached label sprite onto a layer, clipping it at the layer edges.
+
+    Args:
+        position (tuple): Layer-space text origin, snapped to whole pixels.
+    """
+    sprite, (dx, dy) = label_sprite(label, rgb, font)
+    x, y = int(math.floor(position[0])) + dx, int(math.floor(position[1])) + dy
+
+    # alpha_composite only takes non-negative destinations, so crop off what falls outside instead
+    src_x, src_y = max(0, -x), max(0, -y)
+    if src_x >= sprite.width or src_y >= sprite.height or x >= layer.width or y >= layer.height:
+        return
+    layer.alpha_composite(sprite, (max(0, x), max(0, y)), (src_x, src_y))
+
+
+def label_origin(rect: tuple, label: str, font) -> tuple:
+    """
+    Canvas-space position a territory's tag is drawn at, centered on the territory.
+    """
+    bbox = label_bbox(label, font)
+    tw, th = bbox[2] - bbox[0], bbox[3] - bbox[1]
+    return (rect[0] + rect[2]) / 2 - tw/2, (rect[1] + rect[3]) / 2 - th/2
+
+
+def label_reach(labels, font) -> float:
+    """
+    How far past its territory's rectangle any of the given tags may be drawn.
+    """
+    return max((max(b[2] - b[0], b[3] - b[1]) / 2 + 6 for b in (label_bbox(label or "None", font) for label in labels)), default=6)
+
+
+def draw_territory(draw_fill: ImageDraw.ImageDraw, label_layer: Image.Image, rect: tuple, prefix: str, rgb: tuple, font, offset: tuple = (0, 0)):
+    """
+    Draw one territory: translucent fill on the territory layer, border and outlined tag on the label layer.
+
+    Args:
+        label_layer (Image.Image): The label layer (tags are composited onto it as sprites).
+        rect (tuple): Canvas-space (left, top, right, bottom).
+        prefix (str): Owner guild tag, empty for unowned territories.
+        rgb (tuple): Owner colour.
+        offset (tuple): Translation applied to every coordinate, used when drawing a single tile.
+    """
+    fill = rgb + (90,)
+    border = rgb + (255,)
+
+    # Snap to whole pixels before translating, so a tile draws exactly the pixels the full canvas would
+    left, top, right, bottom = (int(v) + o for v, o in zip(rect, offset * 2))
+
+    draw_fill.rectangle([left, top, right, bottom], fill=fill)
+    draw_label = ImageDraw.Draw(label_layer)
+    draw_label.rectangle([left-1, top-1, right+1, bottom+1], outline=(0, 0, 0), width=3)
+    draw_label.rectangle([left, top, right, bottom], outline=border, width=2)
+
+    # Snap the tag to whole pixels too, so its cached sprite lands on the same pixels in every tile
+    x, y = label_origin(rect, prefix or "None", font)
+    paste_label(label_layer, prefix or "None", rgb, (math.floor(x) + offset[0], math.floor(y + LABEL_Y_PAD) + offset[1]), font)
+
+
+def territory_extent(rect: tuple, labels: list[str], font) -> tuple:
+    """
+    Bounding box of every pixel `draw_territory` may touch for a territory, for each of the given tags.
+    """
+    left, top, right, bottom = rect[0] - 2, rect[1] - 2, rect[2] + 2, rect[3] + 2
+
+    for label in labels:
+        x, y = label_origin(rect, label or "None", font)
+        bbox = label_bbox(label or "None", font)
+        text_box = (x + bbox[0], y + LABEL_Y_PAD + bbox[1], x + bbox[2], y + LABEL_Y_PAD + bbox[3])
+        # The outline plus one pixel of rounding slack on every side
+        left, top = min(left, text_box[0] - 2), min(top, text_box[1] - 2)
+        right, bottom = max(right, text_box[2] + 2), max(bottom, text_box[3] + 2)
+    return left, top, right, bottom
+
+
+def zone_crop_box(zones: list[str], map_width: int, map_height: int) -> tuple:
+    """
+    Canvas-space box covering the given zones from `map_regions.json`, with a 50px margin.
+    """
+    crop_min_x, crop_min_y = float("inf"), float("inf")
+    crop_max_x, crop_max_y = float("-inf"), float("-inf")
+
+    for zone_name in zones:
+        reg = map_regions[zone_name]["pos"]
+        x1, y1 = to_full_map_coord(reg[0], reg[1], map_width, map_height)
+        x2, y2 = to_full_map_coord(reg[2], reg[3], map_width, map_height)
+
+        crop_min_x = min(crop_min_x, x1, x2)
+        crop_min_y = min(crop_min_y, y1, y2)
+        crop_max_x = max(crop_max_x, x1, x2)
+        crop_max_y = max(crop_max_y, y1, y2)
+
+    return crop_min_x - 50, crop_min_y - 50, crop_max_x + 50, crop_max_y + 50
+
+
+def pixel_box(box: tuple) -> tuple:
+    # Round a float box the same way Image.crop does
+    return tuple(int(round(v)) for v in box)
+
+
+
+class SharedMapLayers:
+    """
+    Owner of the decoded map layers kept in shared memory.
+
+    The bot process decodes `main_map.png` once and copies it into a shared memory block, plus blocks
+    holding the map with every trade route already drawn. Render workers wrap the blocks zero-copy
+    with `Image.frombuffer`, so memory stays flat no matter how many workers are running.
+
+    The route layer and the live frame (routes plus every territory) are both double-buffered: workers
+    read the front block while a redraw writes the back one, then the two are flipped.
+    """
+    _base = None        # Plain base map
+    _routes = None      # [front, back] base map with the trade route network drawn on it
+    _frames = None      # [front, back] live frames
+    _size = None
+    _routes_key = None  # `geometry_key` of the territories the route layer was drawn for
+    _frame_ready = False
+    _lock = None
+
+
+    @classmethod
+    def init(cls):
+        """
+        Create the shared memory blocks. This should be called once when the bot starts, before the render pool.
+        """
+        main_map = get_image("main_map.png")
+        cls._size = main_map.size
+        data = main_map.tobytes()
+
+        cls._base = SharedMemory(create=True, size=len(data))
+        cls._base.buf[:len(data)] = data
+        # Until territory data is known the route layer is just the base map
+        cls._routes = [SharedMemory(create=True, size=len(data)) for _ in range(2)]
+        cls._routes[0].buf[:len(data)] = data
+        # Frames are only read once a refresh has drawn them
+        cls._frames = [SharedMemory(create=True, size=len(data)) for _ in range(2)]
+
+        cls._lock = asyncio.Lock()
+        logging.info(f"Shared map layers ready ({len(data) // 1024 // 1024} MB each).")
+
+
+    @classmethod
+    def close(cls):
+        """
+        Release and remove the shared memory blocks. This should be called when the bot is shutting down.
+        """
+        for shm in (cls._base, *(cls._routes or ()), *(cls._frames or ())):
+            if shm:
+                shm.close()
+                shm.unlink()
+        cls._base = cls._routes = cls._frames = None
+
+
+    @classmethod
+    def layers(cls) -> dict | None:
+        """
+        Describe the shared layers for a render job, or None if they were never created (falls back to disk assets).
+        """
+        if cls._base is None:
+            return None
+        layers = {"base": cls._base.name, "routes": cls._routes[0].name, "size": cls._size}
+        if cls._frame_ready:
+            layers["frame"] = cls._frames[0].name
+        return layers
+
+
+    @classmethod
+    def back_frame(cls) -> str:
+        """Name of the frame block a refresh may write to."""
+        return cls._frames[1].name
+
+
+    @classmethod
+    def flip(cls):
+        """Make the back frame the one render jobs read."""
+        cls._frames.reverse()
+        cls._frame_ready = True
+
+
+    @classmethod
+    async def ensure_routes(cls, territories: dict) -> bool:
+        """
+        Redraw the shared trade route layer if the territory geometry changed since it was last drawn.
+
+        Args:
+            territories (dict): Territory name -> Athena territory data.
+
+        Returns:
+            bool: Whether the route layer was redrawn.
+        """
+        if cls._base is None:
+            return False
+
+        key = geometry_key(territories)
+        if key == cls._routes_key:
+            return False
+
+        async with cls._lock:
+            # Another request may have redrawn it while we were waiting
+            if key == cls._routes_key:
+                return False
+            # Drawn into the back block, renders in flight keep reading the current one
+            await RenderPool.render("map_routes", territories=territories, layers=cls.layers(), target=cls._routes[1].name)
+            cls._routes.reverse()
+            cls._routes_key = key
+            return True
+
+
+
+class MapEngine:
+    """
+    Keeps the live territory map ready to send.
+
+    Territory data is refreshed every `MAP_REFRESH_INTERVAL` seconds (guild colours every
+    `GUILD_COLOR_REFRESH_INTERVAL`). Each refresh only redraws the tiles of the live frame touched by
+    ownership changes, and keeps the encoded frame so an unfiltered `/map` is just a send.
+    """
+    territories = None          # Latest Athena territory data
+    owners = None               # Territory -> (prefix, RGB colour) for the latest data
+    guild_colors = {}           # Guild id/lowercase prefix -> RGB colour
+    updated_at = 0.0            # time.monotonic() of the last successful territory fetch
+    colors_updated_at = None    # time.monotonic() of the last guild colour fetch
+    _drawn_owners = None        # Territory -> (prefix, RGB colour) drawn into the front frame
+    _frame_data = None           # Encoded front frame
+    _lock = asyncio.Lock()
+
+
+    @classmethod
+    async def get_data(cls) -> tuple[dict, dict]:
+        """
+        Get the latest territory data and owners, refreshing them first if they are stale.
+
+        Returns:
+            tuple[dict, dict]: Territory name -> territory data, and territory name -> (prefix, RGB colour).
+
+        Raises:
+            MapDataError: If the data is stale and Athena can't be reached.
+        """
+        if cls._is_stale():
+            async with cls._lock:
+                # Another request may have refreshed it while we were waiting
+                if cls._is_stale():
+                    await cls._refresh()
+        return cls.territories, cls.owners
+
+
+    @classmethod
+    async def refresh(cls):
+        """
+        Fetch fresh territory data and bring the live frame up to date.
+
+        Raises:
+            MapDataError: If Athena can't be reached.
+        """
+        async with cls._lock:
+            await cls._refresh()
+
+
+    @classmethod
+    def frame(cls) -> bytes | None:
+        """The encoded unfiltered map for the latest data, or None if it isn't available."""
+        return cls._frame_data
+
+
+    @classmethod
+    def _is_stale(cls) -> bool:
+        return cls.territories is None or time.monotonic() - cls.updated_at > MAP_REFRESH_INTERVAL * 2
+
+
+    @classmethod
+    async def _refresh(cls):
+        if cls.colors_updated_at is None or time.monotonic() - cls.colors_updated_at > GUILD_COLOR_REFRESH_INTERVAL:
+            try:
+                cls.guild_colors = await fetch_guild_colors()
+                cls.colors_updated_at = time.monotonic()
+            except MapDataError:
+                # Keep drawing with the colours we already have
+                logging.warning("Map: failed to refresh guild colours")
+
+        territories = await fetch_territories()
+        owners = territory_owners(territories, cls.guild_colors)
+        cls.territories, cls.owners = territories, owners
+        cls.updated_at = time.monotonic()
+
+        if SharedMapLayers.layers() is None:
+            return
+
+        routes_changed = await SharedMapLayers.ensure_routes(territories)
+        # Taken after the redraw, so the frame is drawn over the new route layer
+        layers = SharedMapLayers.layers()
+
+        if cls._frame_data is None or routes_changed:
+            dirty = None  # Redraw everything
+        else:
+            # Territory -> tag it was previously drawn with, so the old label gets cleared too
+            dirty = {name: cls._drawn_owners.get(name, ("", None))[0] for name, owner in owners.items() if cls._drawn_owners.get(name) != owner}
+            if not dirty:
+                return
+
+        try:
+            cls._frame_data = await RenderPool.render(
+                "map_frame",
+                territories=territories,
+                owners=owners,
+                layers=layers,
+                front=layers.get("frame"),
+                target=SharedMapLayers.back_frame(),
+                dirty=dirty
+            )
+        except Exception:
+            # The back frame may be half written, force a full redraw next time
+            cls._frame_data = None
+            SharedMapLayers._frame_ready = False
+            raise
+
+        SharedMapLayers.flip()
+        cls._drawn_owners = owners
+
+
+
+def _shared_block(name: str) -> SharedMemory:
+    # Attach to a shared memory block once per worker process
+    shm = _attached_layers.get(name)
+    if shm is None:
+        shm = _attached_layers[name] = SharedMemory(name=name)
+    return shm
+
+
+def _attach_layer(name: str, size: tuple[int, int]) -> Image.Image:
+    """
+    Wrap a shared map layer as a read-only RGBA image without copying it.
+    """
+    return Image.frombuffer("RGBA", tuple(size), _shared_block(name).buf, "raw", "RGBA", 0, 1)
+
+
+def _write_layer(name: str, image: Image.Image):
+    # Copy an image's pixels into a shared map layer
+    data = image.tobytes()
+    _shared_block(name).buf[:len(data)] = data
+
+
+def _compose_region(source: Image.Image, box: tuple, items: list, font, geometry: TerritoryGeometry = None, route_filter: set[int] = None) -> Image.Image:
+    """
+    Draw the given territories over one region of a map layer.
+
+    Args:
+        source (Image.Image): The layer to draw over (usually the route layer).
+        box (tuple): Integer (left, top, right, bottom) of the region, may reach past the canvas edges.
+        items (list): (rect, prefix, RGB colour) of every territory touching the region, in drawing order.
+        geometry (TerritoryGeometry, optional): Geometry to also draw trade routes from (for layers without them).
+        route_filter (set[int], optional): Territory indices whose routes between each other are drawn (all if None).
+    """
+    # Only draw on the part of the box that is on the canvas, the rest stays transparent
+    inner = (max(box[0], 0), max(box[1], 0), min(box[2], source.width), min(box[3], source.height))
+
+    region = source.crop(inner)
+    if geometry is not None:
+        draw_routes(ImageDraw.Draw(region), geometry, route_filter, offset=(-inner[0], -inner[1]))
+
+    terr_layer = Image.new("RGBA", region.size)
+    label_layer = Image.new("RGBA", region.size)
+    draw_fill = ImageDraw.Draw(terr_layer)
+
+    for rect, prefix, rgb in items:
+        draw_territory(draw_fill, label_layer, rect, prefix, rgb, font, offset=(-inner[0], -inner[1]))
+
+    composed = Image.alpha_composite(region, terr_layer)
+    composed = Image.alpha_composite(composed, label_layer)
+    if inner == box:
+        return composed
+
+    padded = Image.new("RGBA", (box[2] - box[0], box[3] - box[1]))
+    padded.paste(composed, (inner[0] - box[0], inner[1] - box[1]))
+    return padded
+
+
+def _touching(geometry: TerritoryGeometry, owners: dict, box: tuple, font, include=None) -> list:
+    """
+    (rect, prefix, RGB colour) of every territory that draws at least one pixel inside the box, in drawing order.
+    """
+    labels = {owners[name][0] for name in geometry.names}
+    items = []
+    for i in geometry.query(box, margin=label_reach(labels, font)):
+        if include is not None and i not in include:
+            continue
+        rect = geometry.rect(i)
+        prefix, rgb = owners[geometry.names[i]]
+        if boxes_intersect(territory_extent(rect, [prefix], font), box):
+            items.append((rect, prefix, tuple(rgb)))
+    return items
+
+
+def render_map_routes(territories: dict, layers: dict, target: str) -> None:
+    """
+    Draws the trade route network onto the base map and stores it in the back route layer block.
+    Runs inside a render worker process.
+
+    Args:
+        territories (dict): Territory name -> Athena territory data.
+        layers (dict): Shared layer description from `SharedMapLayers.layers`.
+        target (str): Name of the back route block to write.
+    """
+    routes = _attach_layer(layers["base"], layers["size"]).copy()
+    draw_routes(ImageDraw.Draw(routes), get_geometry(territories, *routes.size))
+    _write_layer(target, routes)
+
+
+def render_map_frame(territories: dict, owners: dict, layers: dict, front: str | None, target: str, dirty: dict | None) -> bytes:
+    """
+    Brings the live frame up to date in the back frame block. Runs inside a render worker process.
+
+    Only the tiles touched by the dirty territories are redrawn (from the route layer up), every
+    other pixel is copied from the front frame.
+
+    Args:
+        territories (dict): Territory name -> Athena territory data.
+        owners (dict): Territory name -> (prefix, RGB colour), from `territory_owners`.
+        layers (dict): Shared layer description from `SharedMapLayers.layers`.
+        front (str | None): Name of the current front frame block, None if no frame was drawn yet.
+        target (str): Name of the back frame block to write.
+        dirty (dict | None): Changed territory -> tag it had before, or None to redraw the whole frame.
+
+    Returns:
+        bytes: The encoded frame.
+    """
+    size = tuple(layers["size"])
+    routes = _attach_layer(layers["routes"], size)
+    geometry = get_geometry(territories, *size)
+    font = get_font(16)
+
+    if dirty is None or front is None:
+        frame = _compose_region(routes, (0, 0, *size), _touching(geometry, owners, (0, 0, *size), font), font)
+    else:
+        frame = _attach_layer(front, size).copy()
+
+        # Tiles covering both the old and the new look of every changed territory
+        tiles = set()
+        for name, old_prefix in dirty.items():
+            if name not in geometry.index:
+                continue
+            rect = geometry.rect(geometry.index[name])
+            left, top, right, bottom = territory_extent(rect, [owners[name][0], old_prefix], font)
+            for tx in range(max(0, int(left)) // TILE_SIZE, min(size[0] - 1, int(right)) // TILE_SIZE + 1):
+                for ty in range(max(0, int(top)) // TILE_SIZE, min(size[1] - 1, int(bottom)) // TILE_SIZE + 1):
+                    tiles.add((tx, ty))
+
+        for tx, ty in tiles:
+            box = (tx * TILE_SIZE, ty * TILE_SIZE, min(size[0], (tx + 1) * TILE_SIZE), min(size[1], (ty + 1) * TILE_SIZE))
+            frame.paste(_compose_region(routes, box, _touching(geometry, owners, box, font), font), box[:2])
+
+    _write_layer(target, frame)
+
+    return encode(frame, "map")
+
+
+def render_map(territories: dict, owners: dict, guild_tags: list[str], zones: list[str], layers: dict = None) -> bytes:
+    """
+    Renders a filtered view of the territory map. Runs inside a render worker process.
+
+    The crop box is worked out first (from the zones, or the guild's territory bounds) and only that
+    region is composed, so the cost follows the area shown rather than the whole map.
+
+    Args:
+        territories (dict): Territory name -> Athena territory data.
+        owners (dict): Territory name -> (prefix, RGB colour), from `territory_owners`.
+        guild_tags (list[str]): Lowercase guild tags to filter by (empty for all guilds).
+        zones (list[str]): Normalized zone keys to crop to (empty for the full map).
+        layers (dict, optional): Shared layer description from `SharedMapLayers.layers`.
+
+    Returns:
+        bytes: The encoded map.
+    """
+    size = tuple(layers["size"]) if layers else get_image("main_map.png").size
+    geometry = get_geometry(territories, *size)
+    font = get_font(16)
+
+    shown = None
+    if guild_tags:
+        shown = {i for i, name in enumerate(geometry.names) if owners[name][0].lower() in guild_tags}
+
+    if zones:
+        box = zone_crop_box(zones, *size)
+    elif shown:
+        rects = [geometry.rect(i) for i in shown]
+        box = (
+            min(rect[0] for rect in rects) - 50,
+            min(rect[1] for rect in rects) - 50,
+            max(rect[2] for rect in rects) + 50,
+            max(rect[3] for rect in rects) + 50
+        )
+    else:
+        box = (0, 0, *size)
+    box = pixel_box(box)
+
+    if not guild_tags and layers and "frame" in layers:
+        # Every territory is shown, which is exactly the live frame
+        final = _attach_layer(layers["frame"], size).crop(box)
+    elif not guild_tags:
+        source = _attach_layer(layers["routes"], size) if layers else get_image("main_map.png")
+        final = _compose_region(source, box, _touching(geometry, owners, box, font), font, None if layers else geometry)
+    else:
+        # Guild views only show the routes between their own territories
+        source = _attach_layer(layers["base"], size) if layers else get_image("main_map.png")
+        final = _compose_region(source, box, _touching(geometry, owners, box, font, shown), font, geometry, shown)
+
+    return encode(final, "map")
@@ -0,0 +1,525 @@
+import asyncio, discord, inspect, logging, math
+
+from typing import Any, Awaitable, Callable
+
+from database import Database
+from util.mappings import UI_EMOJI_MAP
+
+
+# How long to wait after a pagination click for more clicks before rendering and editing the message
+PAGINATION_DEBOUNCE = 0.3
+
+
+
+class PageController:
+    """
+    Coalesces pagination clicks into a single message edit.
+
+    Every click is acknowledged right away (deferred, which costs no message edit) and only moves the target page.
+    Once clicks stop for `debounce` seconds the target page is rendered and shown with one edit through the
+    latest interaction. If the target moves while a page is rendering, that render is cancelled and its result
+    is never shown, so skipped pages cost neither a full render nor an edit.
+
+    Usage:
+        self.controller = PageController(self.render_page, self.show_page, page_count=lambda: self.total_pages)
+        ...
+        if not await self.controller.move(interaction, 1):
+            await interaction.response.send_message("You are at the last page!", ephemeral=True)
+
+    Args:
+        render (Callable): Coroutine function rendering a page, `render(page) -> content`.
+        show (Callable): Coroutine function showing rendered content, `show(interaction, page, content)`.
+        page_count (Callable): Returns the current number of pages.
+        page (int, optional): The page currently shown.
+        discard (Callable, optional): Called with a page whose render was cancelled, to drop any work kept for it.
+        debounce (float, optional): Seconds to wait for further clicks before rendering.
+    """
+    def __init__(
+        self,
+        render: Callable[[int], Awaitable[Any]],
+        show: Callable[[discord.Interaction, int, Any], Awaitable[None]],
+        page_count: Callable[[], int],
+        page: int = 0,
+        discard: Callable[[int], None] = None,
+        debounce: float = PAGINATION_DEBOUNCE,
+    ):
+        self.render = render
+        self.show = show
+        self.page_count = page_count
+        self.discard = discard
+        self.debounce = debounce
+
+        self.page = page      # Page currently shown
+        self.target = page    # Page the latest click asked for
+        self._interaction = None
+        self._runner: asyncio.Task | None = None
+        self._render: asyncio.Task | None = None
+        self._rendering: int | None = None
+
+
+    async def move(self, interaction: discord.Interaction, step: int) -> bool:
+        """
+        Move the target page by `step` pages.
+
+        Returns:
+            bool: False without responding to the interaction if the move would leave the page range.
+        """
+        return await self.go_to(interaction, self.target + step)
+
+
+    async def go_to(self, interaction: discord.Interaction, page: int) -> bool:
+        """
+        Set the target page and schedule the edit that shows it.
+
+        Returns:
+            bool: False without responding to the interaction if the page is out of range.
+        """
+        if not 0 <= page < self.page_count():
+            return False
+
+        await interaction.response.defer()
+        self._interaction = interaction
+        self.target = page
+
+        # The page being rendered was skipped, stop working on it
+        if self._rendering is not None and self._rendering != page and self._render and not self._render.done():
+            self._render.cancel()
+
+        if self._runner is None or self._runner.done():
+            self._runner = asyncio.create_task(self._run())
+        return True
+
+
+    async def _run(self):
+        try:
+            await self._settle()
+        except Exception:
+            # Nobody awaits this task, so report failures here instead of losing them
+            logging.exception(f"Failed to show page {self.target + 1}")
+
+
+    async def _settle(self):
+        while True:
+            # Wait for the clicks to settle
+            await asyncio.sleep(self.debounce)
+            page = self.target
+            if page == self.page:
+                return
+
+            self._rendering = page
+            self._render = asyncio.ensure_future(self.render(page))
+            try:
+                content = await self._render
+            except asyncio.CancelledError:
+                # Only the render was cancelled (the target moved), go render the new target
+                if asyncio.current_task().cancelling():
+                    raise
+                if self.discard:
+                    self.discard(page)
+                continue
+            finally:
+                self._rendering = None
+
+            # Another click came in while rendering, the next pass shows the newer target instead
+            if page != self.target:
+                continue
+
+            await self.show(self._interaction, page, content)
+            self.page = page
+            if self.target == page:
+                return
+
+
+    def cancel(self):
+        """Stop any pending render and edit, e.g. when the view times out."""
+        for task in (self._runner, self._render):
+            if task and not task.done():
+                task.cancel()
+
+
+
+def table_widths(headers: list[str], rows: list) -> list[int]:
+    """Width of each column, the longest of the header and every cell in it."""
+    return [max(len(str(item)) for item in col) for col in zip(headers, *rows)]
+
+
+
+class PageSource:
+    """
+    Async source of table pages, fetched on demand and kept once fetched.
+
+    Subclasses implement `count` and `fetch_page`, and may override `column_widths`.
+
+    Args:
+        rows_per_page (int): Number of rows on a page.
+        max_pages (int, optional): Never show more than this many pages.
+    """
+    def __init__(self, rows_per_page: int = 10, max_pages: int | None = None):
+        self.rows_per_page = rows_per_page
+        self.max_pages = max_pages
+        self._pages: dict[int, asyncio.Task] = {}
+
+
+    async def count(self) -> int:
+        """Total number of rows."""
+        raise NotImplementedError
+
+
+    async def fetch_page(self, page: int) -> list:
+        """Load the rows of a page."""
+        raise NotImplementedError
+
+
+    async def page_count(self) -> int:
+        pages = max(1, math.ceil(await self.count() / self.rows_per_page))
+        return min(pages, self.max_pages) if self.max_pages else pages
+
+
+    async def get_page(self, page: int) -> list:
+        """
+        Get the rows of a page, loading it only once even if several callers ask at the same time.
+        """
+        task = self._pages.get(page)
+        if task is None:
+            task = self._pages[page] = asyncio.ensure_future(self.fetch_page(page))
+            task.add_done_callback(lambda done: self._drop_failed(page, done))
+        return await asyncio.shield(task)
+
+
+    def _drop_failed(self, page: int, task: asyncio.Task):
+        if (task.cancelled() or task.exception()) and self._pages.get(page) is task:
+            del self._pages[page]
+
+
+    def prefetch(self, page: int):
+        """Start loading a page in the background."""
+        if page not in self._pages:
+            self._pages[page] = asyncio.ensure_future(self.fetch_page(page))
+            self._pages[page].add_done_callback(lambda done: self._drop_failed(page, done))
+
+
+    async def column_widths(self, headers: list[str], rows: list) -> list[int]:
+        """
+        Width of each table column on the page showing `rows`.
+
+        Sources that can't see every row size the columns from the headers and the page itself,
+        as a later page may hold longer values than the first. Sources holding every row size
+        them once for all pages, so columns don't shift between pages.
+        """
+        return table_widths(headers, rows)
+
+
+
+class ListPageSource(PageSource):
+    """
+    Pages of rows already in memory.
+
+    Args:
+        rows (list): Every row.
+        rows_per_page (int): Number of rows on a page.
+        max_pages (int, optional): Never show more than this many pages.
+    """
+    def __init__(self, rows: list, rows_per_page: int = 10, max_pages: int | None = None):
+        super().__init__(rows_per_page, max_pages)
+        self.rows = rows
+        self._widths = None
+
+
+    async def count(self) -> int:
+        return len(self.rows)
+
+
+    async def fetch_page(self, page: int) -> list:
+        start = page * self.rows_per_page
+        return self.rows[start:start + self.rows_per_page]
+
+
+    async def get_page(self, page: int) -> list:
+        # Slicing is cheap enough that caching pages would only duplicate the list
+        return await self.fetch_page(page)
+
+
+    def prefetch(self, page: int):
+        pass
+
+
+    async def column_widths(self, headers: list[str], rows: list) -> list[int]:
+        if self._widths is None:
+            self._widths = table_widths(headers, self.rows)
+        return self._widths
+
+
+
+class SectionedPageSource(ListPageSource):
+    """
+    Pages of rows grouped in titled sections. Each page holds (section, row) pairs.
+
+    Args:
+        rows_by_section (dict[str, list]): Section titles mapped to their rows, in display order.
+        rows_per_page (int): Number of rows on a page.
+    """
+    def __init__(self, rows_by_section: dict[str, list], rows_per_page: int = 10):
+        super().__init__([(section, row) for section, rows in rows_by_section.items() for row in rows], rows_per_page)
+
+
+    async def column_widths(self, headers: list[str], rows: list) -> list[int]:
+        if self._widths is None:
+            self._widths = table_widths(headers, [row for _, row in self.rows])
+        return self._widths
+
+
+
+class KeysetPageSource(PageSource):
+    """
+    Pages of an SQL query loaded on demand with keyset pagination, so only the pages shown are ever fetched.
+
+    Rows are ordered descending by `keys` and every page continues after the last key of the page before it.
+    Jumping ahead reads only the key columns of the skipped rows, in one query.
+
+    Usage:
+        KeysetPageSource(
+            "uuid_name.name, player_stats.uuid, player_stats.wars AS total",
+            "player_stats LEFT JOIN uuid_name ON uuid_name.uuid=player_stats.uuid WHERE player_stats.wars IS NOT NULL",
+            keys=[("player_stats.wars", "total"), ("player_stats.uuid", "uuid")],
+            format_rows=lambda records: [(r["name"], r["total"]) for r in records],
+        )
+
+    Args:
+        columns (str): Select list of the page query.
+        source (str): FROM clause up to and including a WHERE clause (use WHERE 1 if there is no condition).
+        keys (list[tuple[str, str]]): (SQL expression, result column) pairs forming a unique descending sort key.
+        args (tuple, optional): Parameters used in `source`.
+        format_rows (Callable, optional): Function or coroutine function turning fetched records into table rows.
+        rows_per_page (int): Number of rows on a page.
+        max_pages (int, optional): Never show more than this many pages.
+    """
+    def __init__(
+        self,
+        columns: str,
+        source: str,
+        keys: list[tuple[str, str]],
+        args: tuple = (),
+        format_rows: Callable[[list[dict]], Any] = None,
+        rows_per_page: int = 10,
+        max_pages: int | None = None,
+    ):
+        super().__init__(rows_per_page, max_pages)
+        self.columns = columns
+        self.source = source
+        self.keys = keys
+        self.args = tuple(args)
+        self.format_rows = format_rows
+        self._count = None
+        self._starts = {0: None}  # Page -> sort key of the last row before it (None for the first page)
+
+
+    async def count(self) -> int:
+        if self._count is None:
+            query = f"SELECT COUNT(*) AS count FROM {self.source}"
+            if self.max_pages:
+                # Rows past the last page can't be shown, stop counting there
+                query = f"SELECT COUNT(*) AS count FROM (SELECT 1 FROM {self.source} LIMIT {self.max_pages * self.rows_per_page}) shown"
+            res = await Database.fetch(query, self.args)
+            self._count = int(res[0]["count"]) if res else 0
+        return self._count
+
+
+    def _query(self, columns: str, after: tuple | None, limit: int) -> tuple[str, tuple]:
+        query, args = f"SELECT {columns} FROM {self.source}", self.args
+        if after is not None:
+            # Row comparison matches the descending order on every key column
+            query += f" AND ({', '.join(expr for expr, _ in self.keys)}) < ({', '.join(['%s'] * len(after))})"
+            args += after
+        order = ", ".join(f"{expr} DESC" for expr, _ in self.keys)
+        return f"{query} ORDER BY {order} LIMIT %s", args + (limit,)
+
+
+    def _last_key(self, records: list[dict]) -> tuple:
+        return tuple(records[-1][column] for _, column in self.keys)
+
+
+    async def _start_of(self, page: int) -> tuple | None:
+        known = max(p for p in self._starts if p <= page)
+        if known < page:
+            # Skip to the page reading only the keys of the rows in between
+            columns = ", ".join(f"{expr} AS {column}" for expr, column in self.keys)
+            records = await Database.fetch(*self._query(columns, self._starts[known], (page - known) * self.rows_per_page))
+            if records:
+                self._starts[page] = self._last_key(records)
+            else:
+                return self._starts[known]
+        return self._starts[page]
+
+
+    async def fetch_page(self, page: int) -> list:
+        records = await Database.fetch(*self._query(self.columns, await self._start_of(page), self.rows_per_page)) or []
+        if records:
+            self._starts.setdefault(page + 1, self._last_key(records))
+
+        rows = self.format_rows(records) if self.format_rows else records
+        return await rows if inspect.isawaitable(rows) else rows
+
+
+
+class JumpToPageModal(discord.ui.Modal, title="Go to page"):
+    """
+    Modal asking for a page number to jump to.
+    """
+    def __init__(self, paginator: "Paginator"):
+        super().__init__()
+        self.paginator = paginator
+        self.input = discord.ui.TextInput(
+            label=f"Page (1-{paginator.total_pages})",
+            placeholder=str(paginator.page + 1),
+            max_length=len(str(paginator.total_pages)),
+        )
+        self.add_item(self.input)
+
+
+    async def on_submit(self, interaction: discord.Interaction):
+        page = int(self.input.value) - 1 if self.input.value.strip().isdigit() else -1
+        if not await self.paginator.controller.go_to(interaction, page):
+            await interaction.response.send_message(
+                f"Page must be between 1 and {self.paginator.total_pages}.", ephemeral=True
+            )
+
+
+
+class Paginator(discord.ui.View):
+    """
+    Paginated message over a `PageSource`, with previous/next buttons and a jump-to-page button.
+
+    Pages are loaded when they are shown and the pages next to the shown one are prefetched.
+    Clicks go through a `PageController`, so rapid clicks end in one edit.
+
+    Subclasses implement `format_page`, returning the message arguments (content, embed...) of a page.
+
+    Usage:
+        view = SomePaginator(ListPageSource(rows, 20))
+        await view.send_to(interaction)
+
+    Args:
+        source (PageSource): Where the pages come from.
+        timeout (int, optional): Interaction timeout in seconds.
+        warn_at_edges (bool, optional): Tell the user when they try to move past the first or last page.
+    """
+    def __init__(self, source: PageSource, timeout: int = 60, warn_at_edges: bool = True):
+        super().__init__(timeout=timeout)
+        self.source = source
+        self.warn_at_edges = warn_at_edges
+
+        self.page = 0
+        self.total_pages = 1
+        self.message = None
+
+        # Previous, jump-to-page (labelled with the current page) and next buttons
+        self.prev_button = discord.ui.Button(emoji=UI_EMOJI_MAP["left_arrow"], style=discord.ButtonStyle.gray)
+        self.prev_button.callback = self.go_previous
+        self.jump_button = discord.ui.Button(label="1/1", style=discord.ButtonStyle.gray)
+        self.jump_button.callback = self.jump
+        self.next_button = discord.ui.Button(emoji=UI_EMOJI_MAP["right_arrow"], style=discord.ButtonStyle.gray)
+        self.next_button.callback = self.go_next
+
+        self.add_item(self.prev_button)
+        self.add_item(self.jump_button)
+        self.add_item(self.next_button)
+
+        # Rapid clicks are coalesced into one edit showing the last page clicked to
+        self.controller = PageController(self.render_page, self.show_page, lambda: self.total_pages, discard=self.discard_page)
+
+
+    async def format_page(self, page: int, rows: list) -> dict:
+        """
+        Build the message arguments showing a page.
+
+        Args:
+            page (int): Page index.
+            rows (list): The page's rows from the source.
+
+        Returns:
+            dict: Keyword arguments for sending or editing the message, e.g. {"embed": embed}.
+        """
+        raise NotImplementedError
+
+
+    async def render_page(self, page: int) -> Any:
+        return await self.format_page(page, await self.source.get_page(page))
+
+
+    def discard_page(self, page: int):
+        """Drop work kept for a page that was skipped while rendering."""
+
+
+    def prefetch(self):
+        """Start loading the pages next to the current one."""
+        for page in (self.page + 1, self.page - 1):
+            if 0 <= page < self.total_pages:
+                self.source.prefetch(page)
+
+
+    def _set_page(self, page: int):
+        self.page = page
+        self.jump_button.label = f"{page + 1}/{self.total_pages}"
+        self.jump_button.disabled = self.total_pages < 2
+
+
+    async def show_page(self, interaction: discord.Interaction, page: int, content: dict):
+        self._set_page(page)
+        await interaction.edit_original_response(view=self, **content)
+        self.prefetch()
+
+
+    async def start(self) -> Any:
+        """
+        Count the pages and render the current one, before the first send.
+        """
+        self.total_pages = await self.source.page_count()
+        self._set_page(min(self.page, self.total_pages - 1))
+        return await self.render_page(self.page)
+
+
+    async def send_to(self, interaction: discord.Interaction):
+        """
+        Send the paginated message in response to an interaction (or as a followup if it was deferred).
+        """
+        content = await self.start()
+        if interaction.response.is_done():
+            self.message = await interaction.followup.send(view=self, wait=True, **content)
+        else:
+            await interaction.response.send_message(view=self, **content)
+            self.message = await interaction.original_response()
+        self.prefetch()
+
+
+    async def go_previous(self, interaction: discord.Interaction):
+        """
+        Handler for previous page button click.
+        """
+        if not await self.controller.move(interaction, -1):
+            await self._at_edge(interaction, "You are at the first page!")
+
+
+    async def go_next(self, interaction: discord.Interaction):
+        """
+        Handler for next page button click.
+        """
+        if not await self.controller.move(interaction, 1):
+            await self._at_edge(interaction, "You are at the last page!")
+
+
+    async def jump(self, interaction: discord.Interaction):
+        """
+        Handler for the jump-to-page button, asks for the page number in a modal.
+        """
+        await interaction.response.send_modal(JumpToPageModal(self))
+
+
+    async def _at_edge(self, interaction: discord.Interaction, message: str):
+        if self.warn_at_edges:
+            await interaction.response.send_message(message, ephemeral=True)
+        else:
+            await interaction.response.defer()
+
+
+    async def on_timeout(self):
+        self.controller.cancel()
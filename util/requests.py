@@ -1,16 +1,19 @@
-import requests, logging, aiohttp, asyncio, os, time
+import requests, logging, asyncio
 
 from io import BytesIO
 from requests.exceptions import RequestException
 
+from core import deadline
 from core.config import config
+from core.deadline import DeadlineExceeded
 
 
 DEFAULT_HEADERS = {
     'User-Agent': 'ano_valor/0.0.0',
 }
 
-BUST_API_URL = "https://visage.surgeplay.com/bust/"
+# Seconds a request may take, shortened to the deadline of the command making it
+REQUEST_TIMEOUT = 30
 
 async def request(url: str, headers: dict = None, return_type: str = "json", use_wynn_auth: bool = False):
     all_headers = {**DEFAULT_HEADERS, **(headers or {})}
@@ -19,7 +22,12 @@ async def request(url: str, headers: dict = None, return_type: str = "json", use
         all_headers['Authorization'] = f"Bearer {config.WYNN_API_KEY}"
 
     try:
-        res = requests.get(url, headers=all_headers)
+        # requests is blocking, run it off the event loop so concurrent requests overlap.
+        # The command stops waiting at its deadline, the thread itself at the socket timeout.
+        res = await deadline.bounded(
+            asyncio.to_thread(requests.get, url, headers=all_headers, timeout=deadline.timeout(REQUEST_TIMEOUT)),
+            REQUEST_TIMEOUT,
+        )
         res.raise_for_status()
 
         if return_type == "json":
@@ -84,6 +92,8 @@ async def request(url: str, headers: dict = None, return_type: str = "json", use
         else:
             logging.warning(f"Unsupported return_type: {return_type}")
 
+    except DeadlineExceeded:
+        raise
     except RequestException as e:
         logging.warning(f"Request error while accessing {url}: {e}")
     except Exception as e:
@@ -94,11 +104,9 @@ async def request(url: str, headers: dict = None, return_type: str = "json", use
 
 
 
-async def request_with_csrf(csrf_url: str, url: str, return_type: str = "json"):
-    session = requests.Session()
-
-    try:
-        csrf_res = session.get(csrf_url, headers=DEFAULT_HEADERS)
+def _get_with_csrf(csrf_url: str, url: str, timeout: float) -> requests.Response:
+    with requests.Session() as session:
+        csrf_res = session.get(csrf_url, headers=DEFAULT_HEADERS, timeout=timeout)
         csrf_res.raise_for_status()
 
         csrf_token = session.cookies.get("csrf_token")
@@ -111,8 +119,18 @@ async def request_with_csrf(csrf_url: str, url: str, return_type: str = "json"):
             "Content-Type": "application/json"
         }
 
-        res = session.get(url, headers=headers)
+        res = session.get(url, headers=headers, timeout=timeout)
         res.raise_for_status()
+        return res
+
+
+async def request_with_csrf(csrf_url: str, url: str, return_type: str = "json"):
+    try:
+        # Both requests block, keep them off the event loop like `request` (each gets the full timeout)
+        res = await deadline.bounded(
+            asyncio.to_thread(_get_with_csrf, csrf_url, url, deadline.timeout(REQUEST_TIMEOUT)),
+            REQUEST_TIMEOUT * 2,
+        )
 
         if return_type == "json":
             try:
@@ -126,6 +144,8 @@ async def request_with_csrf(csrf_url: str, url: str, return_type: str = "json"):
         else:
             logging.warning(f"Unsupported return_type: {return_type}")
 
+    except DeadlineExceeded:
+        raise
     except RequestException as e:
         logging.warning(f"Request error while accessing {url}: {e}")
     except Exception as e:
@@ -135,49 +155,21 @@ async def request_with_csrf(csrf_url: str, url: str, return_type: str = "json"):
 
 
 
-async def download_player_bust(session: aiohttp.ClientSession, name: str, filename: str, retry: bool = True):
-    from util.uuid import get_uuid_from_name
-
-    try:
-        uuid = await get_uuid_from_name(name)
-    except Exception as e:
-        logging.error(f"Failed to resolve UUID for {name}: {e}")
-        return None
+async def resource_exists(url: str, timeout: float = REQUEST_TIMEOUT) -> bool:
+    """
+    Check with a HEAD request whether a URL still serves something.
 
+    Returns:
+        bool: True if it answered with a success status, False if it didn't or couldn't be reached.
+    """
     try:
-        url = f"{BUST_API_URL}{uuid if uuid else name}.png"
-
-        async with session.get(url, headers=DEFAULT_HEADERS, timeout=2) as response:
-            if response.status == 200:
-                content = await response.read()
-                with open(filename, "wb") as f:
-                    f.write(content)
-                return True
-            elif response.status == 404:
-                return False
-            else:
-                if retry:
-                    return await download_player_bust(session, name, filename, retry=False)
-                else:
-                    logging.warning(f"Failed to fetch {name} ({uuid}): HTTP {response.status}")
-    except Exception as e:
-        logging.error(f"Error fetching {name} ({uuid}): {e}")
-
-    return None
-
-
-
-async def fetch_player_busts(names: list[str]):
-    tasks = []
-    now = time.time()
-
-    async with aiohttp.ClientSession() as session:
-        for name in names:
-            filename = f"/tmp/{name}_model.png"
-
-            if os.path.exists(filename) and now - os.path.getmtime(filename) < 24 * 3600:
-                continue
-
-            tasks.append(download_player_bust(session, name, filename))
-
-        await asyncio.gather(*tasks)
+        res = await deadline.bounded(
+            asyncio.to_thread(requests.head, url, headers=DEFAULT_HEADERS, timeout=deadline.timeout(timeout)),
+            timeout,
+        )
+        return res.ok
+    except DeadlineExceeded:
+        raise
+    except (RequestException, asyncio.TimeoutError) as e:
+        logging.warning(f"Request error while checking {url}: {e}")
+        return False
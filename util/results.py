@@ -0,0 +1,67 @@
+import discord
+
+from typing import Any, Awaitable, Callable, Hashable
+
+from util.cache import TTLCache
+
+
+# Seconds a command result is shared with identical invocations. Short, so boards stay close to live data
+# and relative ranges ("7" days) drift by at most this much.
+RESULT_TTL = 60
+# Maximum number of shared results kept
+RESULT_CACHE_SIZE = 256
+
+# (command, options) -> result computed by the first of the identical invocations
+_results = TTLCache(ttl=RESULT_TTL, max_size=RESULT_CACHE_SIZE)
+
+
+
+def normalize_option(value: Any) -> Hashable:
+    """
+    Normalize a command option so spelling variants of the same input share a result.
+
+    Strings are compared case-insensitively with surrounding whitespace and spaces around
+    commas removed, e.g. " ANO , Lxa" and "ano,lxa" are the same option.
+    """
+    if isinstance(value, str):
+        return ",".join(part.strip() for part in value.strip().lower().split(","))
+    return value
+
+
+def result_key(interaction: discord.Interaction, **options) -> tuple:
+    """
+    Key of a command result shared between invocations.
+
+    Results should hold data rather than per-user output. Anything depending on a user's settings
+    (like the leaderboard output type) is either passed as an option or keyed where the output is
+    rendered, as board pages are (see `util.board.PageCache`).
+
+    Args:
+        interaction (discord.Interaction): The invoking interaction, gives the command name.
+        **options: The options the result depends on. None values are left out, so an omitted
+            option and an explicit None share a result.
+
+    Returns:
+        tuple: (qualified command name, normalized options).
+    """
+    command = interaction.command.qualified_name if interaction.command else ""
+    normalized = tuple(sorted((name, normalize_option(value)) for name, value in options.items() if value is not None))
+    return command, normalized
+
+
+async def shared_result(key: Hashable, loader: Callable[[], Awaitable[Any]], ttl: float | None = None) -> Any:
+    """
+    Get a command result, computing it only once for identical invocations within `RESULT_TTL`.
+
+    Concurrent invocations with the same key wait for the first one's computation instead of
+    starting their own. None results are not shared, so failures are retried by the next invocation.
+
+    Usage:
+        source = await shared_result(result_key(interaction, range=range), lambda: load_rows(range))
+
+    Args:
+        key (Hashable): Key from `result_key`.
+        loader (Callable): Zero-argument coroutine function computing the result.
+        ttl (float, optional): Lifetime override for this result.
+    """
+    return await _results.get_or_load(key, loader, ttl)
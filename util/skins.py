@@ -0,0 +1,286 @@
+import asyncio, base64, io, json, logging, os, time
+
+from PIL import Image
+
+from core.render_pool import RenderPool
+from util.cache import TTLCache
+from util.encoding import encode
+from util.requests import request
+from util.uuid import get_uuid_from_name
+
+
+SESSION_PROFILE_URL = "https://sessionserver.mojang.com/session/minecraft/profile/{}"
+
+# Players change skins rarely and the session server is rate limited, so textures are remembered for a while
+TEXTURES_TTL = 600
+# Texture URLs are content addressed (the last path segment is the hash of the image), so skins never go stale
+SKIN_TTL = 24 * 3600
+
+# Busts are rendered from the skin, so they are as content addressed as the skin itself
+BUST_TTL = 24 * 3600
+# Bust files older than this are rebuilt, so skin changes show up within a day
+BUST_FILE_MAX_AGE = 24 * 3600
+
+# Pixels per skin pixel of a rendered bust (16x16 skin pixels -> 256x256)
+BUST_SCALE = 16
+
+# Maps undashed UUID -> "textures" object of the player's session profile
+_textures_cache = TTLCache(ttl=TEXTURES_TTL, max_size=2048)
+# Maps texture hash -> raw skin PNG
+_skin_cache = TTLCache(ttl=SKIN_TTL, max_size=256)
+# Maps (texture hash, slim) -> encoded bust
+_bust_cache = TTLCache(ttl=BUST_TTL, max_size=1024)
+
+
+
+def texture_hash(url: str) -> str:
+    """Get the content hash of a Mojang texture URL (http://textures.minecraft.net/texture/<hash>)."""
+    return url.rstrip("/").rsplit("/", 1)[-1]
+
+
+async def _fetch_textures(uuid: str) -> dict | None:
+    data = await request(SESSION_PROFILE_URL.format(uuid))
+    if not data:
+        return None
+
+    for prop in data.get("properties", []):
+        if prop.get("name") == "textures":
+            try:
+                return json.loads(base64.b64decode(prop["value"])).get("textures", {})
+            except (ValueError, KeyError) as e:
+                logging.warning(f"Invalid textures property for {uuid}: {e}")
+                return None
+    # Players without a custom skin have no textures
+    return {}
+
+
+async def get_textures(uuid: str) -> dict | None:
+    """
+    Get the decoded "textures" object of a player's session profile, served from a cache.
+
+    Args:
+        uuid (str): Player UUID, with or without dashes.
+
+    Returns:
+        dict | None: e.g. {"SKIN": {"url": ..., "metadata": {"model": "slim"}}}, empty if the player
+            uses a default skin, or None if the profile couldn't be fetched.
+    """
+    uuid = uuid.replace("-", "")
+    return await _textures_cache.get_or_load(uuid, lambda: _fetch_textures(uuid))
+
+
+async def get_skin(uuid: str) -> bytes | None:
+    """
+    Get a player's raw skin PNG.
+
+    Skins are cached by texture hash, so players sharing a skin and repeat lookups after the
+    textures cache expired don't download the image again.
+
+    Args:
+        uuid (str): Player UUID, with or without dashes.
+
+    Returns:
+        bytes | None: The skin, or None if the player has no custom skin or it couldn't be downloaded.
+    """
+    textures = await get_textures(uuid)
+    skin = (textures or {}).get("SKIN")
+    if not skin:
+        return None
+
+    url = skin["url"]
+    return await _skin_cache.get_or_load(texture_hash(url), lambda: request(url, return_type="image"))
+
+
+
+def render_bust(skin: bytes, slim: bool = False) -> bytes:
+    """
+    Renders a front facing head and shoulders bust from a skin texture. Runs inside a render worker process.
+
+    The bust is 16x16 skin pixels (8 for the head, the upper 8 of the torso and arms)
+    scaled up by `BUST_SCALE` without smoothing.
+
+    Args:
+        skin (bytes): The raw skin PNG, 64x64 or legacy 64x32.
+        slim (bool): Whether the skin uses the 3 pixel wide "slim" arms.
+
+    Returns:
+        bytes: The encoded bust.
+    """
+    texture = Image.open(io.BytesIO(skin)).convert("RGBA")
+    legacy = texture.height == 32
+    arm = 3 if slim else 4
+
+    def part(x: int, y: int, w: int, h: int) -> Image.Image:
+        return texture.crop((x, y, x + w, y + h))
+
+    bust = Image.new("RGBA", (16, 16), (0, 0, 0, 0))
+
+    # Upper torso and arms (the player's right arm is on the viewer's left)
+    body = part(20, 20, 8, 8)
+    right_arm = part(44, 20, arm, 8)
+    # Legacy skins have no left arm, the game mirrors the right one
+    left_arm = right_arm.transpose(Image.Transpose.FLIP_LEFT_RIGHT) if legacy else part(36, 52, arm, 8)
+
+    if not legacy:
+        # Second skin layer: jacket and sleeves
+        body.alpha_composite(part(20, 36, 8, 8))
+        right_arm.alpha_composite(part(44, 36, arm, 8))
+        left_arm.alpha_composite(part(52, 52, arm, 8))
+
+    bust.paste(right_arm, (4 - arm, 8))
+    bust.paste(body, (4, 8))
+    bust.paste(left_arm, (12, 8))
+
+    head = part(8, 8, 8, 8)
+    hat = part(40, 8, 8, 8)
+    # Legacy skins often fill the hat layer with an opaque color, the game ignores it then
+    if not (legacy and hat.getextrema()[3][0] == 255):
+        head.alpha_composite(hat)
+    bust.paste(head, (4, 0))
+
+    bust = bust.resize((16 * BUST_SCALE, 16 * BUST_SCALE), Image.Resampling.NEAREST)
+    return encode(bust, "bust")
+
+
+def render_busts(skins: list[tuple[bytes, bool]]) -> list[bytes | None]:
+    """
+    Renders several busts in one job, see `render_bust`. Runs inside a render worker process.
+
+    Args:
+        skins (list of tuples): (raw skin PNG, slim) of each bust.
+
+    Returns:
+        list[bytes | None]: The encoded busts in the same order, None for skins that couldn't be decoded.
+    """
+    busts = []
+    for skin, slim in skins:
+        try:
+            busts.append(render_bust(skin, slim))
+        except (OSError, ValueError) as e:
+            logging.warning(f"Failed to render bust: {e}")
+            busts.append(None)
+    return busts
+
+
+async def get_busts(uuids: list[str]) -> list[bytes | None]:
+    """
+    Get the busts of several players, rendering the missing ones locally from their skins in a single render pool job.
+
+    Busts are cached by texture hash and arm model, so a player's bust is rendered once per skin.
+
+    Args:
+        uuids (list[str]): Player UUIDs, with or without dashes.
+
+    Returns:
+        list[bytes | None]: The encoded busts in the same order, None for players without a custom skin
+            or whose skin couldn't be fetched or decoded.
+
+    Raises:
+        RenderQueueFull: If the render pool is too busy to take the job, nothing is cached so the next call retries.
+        RenderTimeout: If the job didn't finish in time.
+    """
+    uuids = [uuid.replace("-", "") for uuid in uuids]
+    textures = await asyncio.gather(*(get_textures(uuid) for uuid in uuids))
+
+    # (texture hash, slim) of each player, None without a custom skin
+    keys = []
+    for player_textures in textures:
+        skin = (player_textures or {}).get("SKIN")
+        if not skin:
+            keys.append(None)
+            continue
+        slim = (skin.get("metadata") or {}).get("model") == "slim"
+        keys.append((texture_hash(skin["url"]), slim))
+
+    busts = {key: _bust_cache.get(key) for key in keys if key}
+    # One player per missing skin, players sharing a skin share the render
+    missing = {key: uuid for uuid, key in zip(uuids, keys) if key and busts[key] is None}
+    if missing:
+        skins = await asyncio.gather(*(get_skin(uuid) for uuid in missing.values()))
+        jobs = [(key, skin) for key, skin in zip(missing, skins) if skin]
+        if jobs:
+            rendered = await RenderPool.render("busts", skins=[(skin, key[1]) for key, skin in jobs])
+            for (key, _), bust in zip(jobs, rendered):
+                if bust:
+                    _bust_cache.set(key, bust)
+                    busts[key] = bust
+
+    return [busts[key] if key else None for key in keys]
+
+
+async def get_bust(uuid: str) -> bytes | None:
+    """
+    Get a player's bust, see `get_busts`.
+
+    Returns:
+        bytes | None: The encoded bust, or None if the player has no custom skin or it couldn't be fetched.
+    """
+    return (await get_busts([uuid]))[0]
+
+
+def _is_fresh(path: str) -> bool:
+    return os.path.exists(path) and time.time() - os.path.getmtime(path) < BUST_FILE_MAX_AGE
+
+
+async def save_busts(paths: dict[str, str]) -> dict[str, bool]:
+    """
+    Make sure bust files younger than `BUST_FILE_MAX_AGE` exist for several players.
+    Missing busts are rendered in a single render pool job, see `get_busts`.
+
+    Args:
+        paths (dict): Maps player UUID -> path of their bust file.
+
+    Returns:
+        dict: Maps player UUID -> whether their file is available.
+
+    Raises:
+        RenderQueueFull, RenderTimeout: If the render pool couldn't take the busts right now. These are not
+            "no bust" answers, so they are left to the caller (and reach the user like any other busy render).
+    """
+    available = {uuid: _is_fresh(path) for uuid, path in paths.items()}
+    stale = [uuid for uuid, fresh in available.items() if not fresh]
+    if not stale:
+        return available
+
+    for uuid, bust in zip(stale, await get_busts(stale)):
+        if not bust:
+            continue
+        # Write next to the target and swap it in, so a render never reads a partial file
+        path = paths[uuid]
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(bust)
+        os.replace(tmp_path, path)
+        available[uuid] = True
+    return available
+
+
+async def save_bust(uuid: str, path: str) -> bool:
+    """
+    Make sure a bust file younger than `BUST_FILE_MAX_AGE` exists at `path`, see `save_busts`.
+
+    Returns:
+        bool: Whether the file is available.
+    """
+    return (await save_busts({uuid: path}))[uuid]
+
+
+async def fetch_player_busts(names: list[str]):
+    """
+    Make sure `/tmp/<name>_model.png` busts exist for the given players, as read by the board renderers.
+
+    All missing busts of the players are rendered in one render pool job, so a board page
+    takes a single slot of the pool's queue however many of its busts are missing.
+
+    Raises:
+        RenderQueueFull, RenderTimeout: See `save_busts`.
+    """
+    async def resolve(name: str) -> str | None:
+        try:
+            return await get_uuid_from_name(name)
+        except Exception as e:
+            logging.error(f"Failed to resolve UUID for {name}: {e}")
+            return None
+
+    uuids = await asyncio.gather(*(resolve(name) for name in names))
+    await save_busts({uuid: f"/tmp/{name}_model.png" for name, uuid in zip(names, uuids) if uuid})
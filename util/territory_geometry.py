@@ -0,0 +1,190 @@
+import hashlib, json
+
+from array import array
+from collections import OrderedDict
+
+
+# Trade route graph between territories, loaded once per process
+with open("assets/terr_conns.json") as f:
+    TERRITORY_CONNECTIONS = json.load(f)
+
+# Side length of the cells of the spatial index, in canvas pixels
+GRID_CELL_SIZE = 64
+
+# How many geometries (one per distinct set of territory locations and canvas size) are kept per process
+GEOMETRY_CACHE_SIZE = 2
+
+_geometry_cache = OrderedDict()
+
+
+
+def to_full_map_coord(x_ingame, y_ingame, map_width, map_height):
+    # This is from the linear mapping crossing the two extreme points on the map.
+    # Ex: x: -2480 to 1650 (x_neg_ingame to x_pos_ingame)
+    # x_canvas = 0 + ((map_width - 1) - 0) / (x_pos_ingame - x_neg_ingame)) * (x_ingame - x_neg_ingame)
+    x_canvas = (x_ingame + 2480) * (map_width - 1) / 4130
+    y_canvas = (y_ingame + 6578) * (map_height - 1) / 6419
+    return x_canvas, y_canvas
+
+
+def extract_coords(loc: dict):
+    if not isinstance(loc, dict):
+        raise ValueError("Invalid location")
+    if "startX" in loc or "startZ" in loc:
+        sx = loc.get("startX")
+        sz = loc.get("startZ")
+        ex = loc.get("endX")
+        ez = loc.get("endZ")
+        return sx, sz, ex, ez
+    if "start" in loc and isinstance(loc["start"], (list, tuple)):
+        sx, sz = loc["start"][0], loc["start"][1]
+        ex, ez = loc["end"][0], loc["end"][1]
+        return sx, sz, ex, ez
+    raise ValueError("Unsupported location format")
+
+
+def territory_rect(data: dict, map_width: int, map_height: int) -> tuple | None:
+    """
+    Compute the canvas-space rectangle (left, top, right, bottom) of a territory, or None if it has no usable location.
+    """
+    loc = data.get("location") or data
+    try:
+        sx, sz, ex, ez = extract_coords(loc)
+        x1, y1 = to_full_map_coord(sx, sz, map_width, map_height)
+        x2, y2 = to_full_map_coord(ex, ez, map_width, map_height)
+    except Exception:
+        return None
+    left, right = sorted([x1, x2])
+    top, bottom = sorted([y1, y2])
+    return left, top, right, bottom
+
+
+def geometry_key(territories: dict) -> str:
+    """
+    Hash the territory names and locations. Geometry (and the trade route layer) only changes when this does.
+    """
+    locations = sorted((name, json.dumps(data.get("location") or {}, sort_keys=True)) for name, data in territories.items())
+    return hashlib.sha1(json.dumps(locations).encode()).hexdigest()
+
+
+def boxes_intersect(a: tuple, b: tuple) -> bool:
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+
+
+class SpatialGrid:
+    """
+    Uniform grid index over boxes, for finding everything that touches a region without scanning every box.
+    """
+    def __init__(self, cell_size: int = GRID_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}  # (column, row) -> list of item indices
+
+
+    def _cells(self, box: tuple):
+        size = self.cell_size
+        for cx in range(int(box[0] // size), int(box[2] // size) + 1):
+            for cy in range(int(box[1] // size), int(box[3] // size) + 1):
+                yield cx, cy
+
+
+    def insert(self, index: int, box: tuple):
+        for cell in self._cells(box):
+            self.cells.setdefault(cell, []).append(index)
+
+
+    def query(self, box: tuple) -> set[int]:
+        """Indices of every item in a cell touched by the box (a superset of the items intersecting it)."""
+        found = set()
+        for cell in self._cells(box):
+            found.update(self.cells.get(cell, ()))
+        return found
+
+
+
+class TerritoryGeometry:
+    """
+    Canvas-space geometry of every territory for one set of territory locations.
+
+    Rectangles, centers and trade route segments are kept in flat arrays indexed by territory position,
+    in the same order as the territory data (which is also the drawing order).
+    """
+    def __init__(self, territories: dict, map_width: int, map_height: int):
+        self.names = []            # Territory index -> name
+        self.index = {}            # Territory name -> index
+        self.rects = array("d")    # left, top, right, bottom per territory
+        self.centers = array("d")  # x, y per territory
+        self.routes = array("H")   # start, target index per trade route segment
+        self.grid = SpatialGrid()
+
+        for name, data in territories.items():
+            rect = territory_rect(data, map_width, map_height)
+            if not rect:
+                continue
+            i = len(self.names)
+            self.names.append(name)
+            self.index[name] = i
+            self.rects.extend(rect)
+            self.centers.extend(((rect[0] + rect[2]) / 2, (rect[1] + rect[3]) / 2))
+            self.grid.insert(i, rect)
+
+        # Every listed direction is kept so routes are drawn exactly as the connection file lists them
+        for start, targets in TERRITORY_CONNECTIONS.items():
+            if start not in self.index:
+                continue
+            for target in targets.get("Trading Routes", []):
+                if target in self.index:
+                    self.routes.extend((self.index[start], self.index[target]))
+
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+    def rect(self, i: int) -> tuple:
+        return tuple(self.rects[i*4:i*4 + 4])
+
+
+    def center(self, i: int) -> tuple:
+        return self.centers[i*2], self.centers[i*2 + 1]
+
+
+    def segments(self):
+        """Yield the (start, target) territory indices of every trade route segment."""
+        for k in range(0, len(self.routes), 2):
+            yield self.routes[k], self.routes[k + 1]
+
+
+    def query(self, box: tuple, margin: float = 0) -> list[int]:
+        """
+        Find the territories whose rectangle, grown by `margin` on every side, intersects the box.
+
+        Returns:
+            list[int]: Territory indices in drawing order.
+        """
+        grown = (box[0] - margin, box[1] - margin, box[2] + margin, box[3] + margin)
+        return sorted(i for i in self.grid.query(grown) if boxes_intersect(self.rect(i), grown))
+
+
+
+def get_geometry(territories: dict, map_width: int, map_height: int) -> TerritoryGeometry:
+    """
+    Get the geometry for a territory list, building it only when the territory locations changed.
+
+    Args:
+        territories (dict): Territory name -> Athena territory data.
+        map_width (int): Canvas width.
+        map_height (int): Canvas height.
+
+    Returns:
+        TerritoryGeometry: The (shared, read-only) geometry.
+    """
+    key = (geometry_key(territories), map_width, map_height)
+    geometry = _geometry_cache.get(key)
+    if geometry is None:
+        geometry = _geometry_cache[key] = TerritoryGeometry(territories, map_width, map_height)
+        while len(_geometry_cache) > GEOMETRY_CACHE_SIZE:
+            _geometry_cache.popitem(last=False)
+    else:
+        _geometry_cache.move_to_end(key)
+    return geometry